@@ -1,6 +1,21 @@
 """Benchmark suite for LLM-based markdown editing algorithms."""
 
-from md_edit_bench.runner import run_benchmark, run_single
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from md_edit_bench.runner import run_benchmark, run_single
+
+
+def __getattr__(name: str) -> object:
+    """Import the runner on first access, so importing a submodule stays cheap."""
+    if name in __all__:
+        from md_edit_bench import runner
+
+        return getattr(runner, name)  # pyright: ignore[reportAny]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "run_benchmark",
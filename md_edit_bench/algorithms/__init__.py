@@ -1,67 +1,136 @@
-"""Algorithm registry for diff benchmarks."""
-
-from md_edit_bench.algorithms.aider_diff_fenced import AiderDiffFencedAlgorithm
-from md_edit_bench.algorithms.aider_editblock import AiderEditBlockAlgorithm
-from md_edit_bench.algorithms.aider_patch import AiderPatchAlgorithm
-from md_edit_bench.algorithms.aider_udiff import AiderUdiffAlgorithm
-from md_edit_bench.algorithms.base import Algorithm
-from md_edit_bench.algorithms.codex_patch import CodexPatchAlgorithm
-from md_edit_bench.algorithms.full_rewrite import FullRewriteAlgorithm
-from md_edit_bench.algorithms.git_diff import GitDiffAlgorithm
-from md_edit_bench.algorithms.json_ops import JsonOpsAlgorithm
-from md_edit_bench.algorithms.morph import MorphAlgorithm
-from md_edit_bench.algorithms.partial_rewrite import PartialRewriteAlgorithm
-from md_edit_bench.algorithms.search_replace import SearchReplaceAlgorithm
-from md_edit_bench.algorithms.section_rewrite import SectionRewriteAlgorithm
-from md_edit_bench.algorithms.str_replace_editor import StrReplaceEditorAlgorithm
-from md_edit_bench.algorithms.udiff_tagged import UdiffTaggedAlgorithm
-
-ALGORITHMS: list[type[Algorithm]] = [
-    AiderDiffFencedAlgorithm,
-    AiderEditBlockAlgorithm,
-    AiderPatchAlgorithm,
-    AiderUdiffAlgorithm,
-    CodexPatchAlgorithm,
-    FullRewriteAlgorithm,
-    GitDiffAlgorithm,
-    JsonOpsAlgorithm,
-    MorphAlgorithm,
-    PartialRewriteAlgorithm,
-    SearchReplaceAlgorithm,
-    SectionRewriteAlgorithm,
-    StrReplaceEditorAlgorithm,
-    UdiffTaggedAlgorithm,
-]
+"""Algorithm registry for diff benchmarks.
+
+Algorithms are registered by name with the module that defines them, and a module is
+imported only when its algorithm is first requested, so listing algorithms or
+running one of them does not pay for importing all the others.
+
+Other packages add algorithms through the `md_edit_bench.algorithms` entry point
+group, naming each entry point after its algorithm:
+
+    [project.entry-points."md_edit_bench.algorithms"]
+    my_format = "my_package.my_format:MyFormatAlgorithm"
+
+Built-in algorithms take precedence over plugins with the same name.
+"""
+
+from __future__ import annotations
+
+import importlib
+from functools import lru_cache
+from importlib.metadata import EntryPoint, entry_points
+from typing import TYPE_CHECKING
+
+from md_edit_bench.algorithms.base import Algorithm, AlgorithmCapabilities
+
+if TYPE_CHECKING:
+    from md_edit_bench.algorithms.aider_diff_fenced import AiderDiffFencedAlgorithm
+    from md_edit_bench.algorithms.aider_editblock import AiderEditBlockAlgorithm
+    from md_edit_bench.algorithms.aider_patch import AiderPatchAlgorithm
+    from md_edit_bench.algorithms.aider_udiff import AiderUdiffAlgorithm
+    from md_edit_bench.algorithms.chunked_rewrite import ChunkedRewriteAlgorithm
+    from md_edit_bench.algorithms.codex_patch import CodexPatchAlgorithm
+    from md_edit_bench.algorithms.full_rewrite import FullRewriteAlgorithm
+    from md_edit_bench.algorithms.git_diff import GitDiffAlgorithm
+    from md_edit_bench.algorithms.json_ops import JsonOpsAlgorithm
+    from md_edit_bench.algorithms.morph import MorphAlgorithm
+    from md_edit_bench.algorithms.partial_rewrite import PartialRewriteAlgorithm
+    from md_edit_bench.algorithms.search_replace import SearchReplaceAlgorithm
+    from md_edit_bench.algorithms.section_rewrite import SectionRewriteAlgorithm
+    from md_edit_bench.algorithms.str_replace_editor import StrReplaceEditorAlgorithm
+    from md_edit_bench.algorithms.udiff_tagged import UdiffTaggedAlgorithm
+
+    ALGORITHMS: list[type[Algorithm]]
 
-_algorithms_by_name: dict[str, type[Algorithm]] = {cls.name: cls for cls in ALGORITHMS}
+ENTRY_POINT_GROUP = "md_edit_bench.algorithms"
+
+# Built-in algorithm name -> "module:class" (each name must match the class's `name`)
+REGISTRY: dict[str, str] = {
+    "aider_diff_fenced": f"{__name__}.aider_diff_fenced:AiderDiffFencedAlgorithm",
+    "aider_editblock": f"{__name__}.aider_editblock:AiderEditBlockAlgorithm",
+    "aider_patch": f"{__name__}.aider_patch:AiderPatchAlgorithm",
+    "aider_udiff": f"{__name__}.aider_udiff:AiderUdiffAlgorithm",
+    "chunked_rewrite": f"{__name__}.chunked_rewrite:ChunkedRewriteAlgorithm",
+    "codex_patch": f"{__name__}.codex_patch:CodexPatchAlgorithm",
+    "full_rewrite": f"{__name__}.full_rewrite:FullRewriteAlgorithm",
+    "git_diff": f"{__name__}.git_diff:GitDiffAlgorithm",
+    "json_ops": f"{__name__}.json_ops:JsonOpsAlgorithm",
+    "morph": f"{__name__}.morph:MorphAlgorithm",
+    "partial_rewrite": f"{__name__}.partial_rewrite:PartialRewriteAlgorithm",
+    "search_replace": f"{__name__}.search_replace:SearchReplaceAlgorithm",
+    "section_rewrite": f"{__name__}.section_rewrite:SectionRewriteAlgorithm",
+    "str_replace_editor": f"{__name__}.str_replace_editor:StrReplaceEditorAlgorithm",
+    "udiff_tagged": f"{__name__}.udiff_tagged:UdiffTaggedAlgorithm",
+}
+
+_CLASS_NAMES: dict[str, str] = {
+    target.rpartition(":")[2]: name for name, target in REGISTRY.items()
+}
+
+
+@lru_cache
+def plugin_entry_points() -> dict[str, EntryPoint]:
+    """Entry points of installed plugin algorithms, by name (read once per process)."""
+    return {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP) if ep.name not in REGISTRY}
+
+
+@lru_cache
+def get_algorithm_class(name: str) -> type[Algorithm]:
+    """Import and return a built-in or plugin algorithm's class.
+
+    Raises:
+        ValueError: No algorithm has this name, or its class has a different `name`
+        TypeError: The registered object is not an Algorithm subclass
+    """
+    if name in REGISTRY:
+        module_name, _, cls_name = REGISTRY[name].partition(":")
+        loaded: object = getattr(importlib.import_module(module_name), cls_name)  # pyright: ignore[reportAny]
+    elif name in plugin_entry_points():
+        loaded = plugin_entry_points()[name].load()  # pyright: ignore[reportAny]
+    else:
+        raise ValueError(f"Unknown algorithm: {name}. Available: {list_algorithm_names()}")
+
+    if not (isinstance(loaded, type) and issubclass(loaded, Algorithm)):
+        raise TypeError(f"Algorithm {name} is not an Algorithm subclass: {loaded!r}")
+    if loaded.name != name:
+        raise ValueError(f"Algorithm {name} is registered for a class named {loaded.name}")
+    return loaded
 
 
 def get_algorithm(name: str) -> Algorithm:
     """Get an algorithm instance by name."""
-    if name not in _algorithms_by_name:
-        raise ValueError(
-            f"Unknown algorithm: {name}. Available: {list(_algorithms_by_name.keys())}"
-        )
-    return _algorithms_by_name[name]()
+    return get_algorithm_class(name)()
 
 
 def get_all_algorithms() -> list[Algorithm]:
-    """Get instances of all registered algorithms."""
-    return [cls() for cls in ALGORITHMS]
+    """Get instances of all built-in and plugin algorithms (imports every algorithm)."""
+    return [get_algorithm(name) for name in list_algorithm_names()]
 
 
 def list_algorithm_names() -> list[str]:
-    """Get names of all registered algorithms."""
-    return list(_algorithms_by_name.keys())
+    """Get names of all built-in and plugin algorithms (without importing them)."""
+    return [*REGISTRY, *sorted(plugin_entry_points())]
+
+
+def __getattr__(name: str) -> object:
+    """Import `ALGORITHMS` and the algorithm classes on first access."""
+    if name == "ALGORITHMS":
+        return [get_algorithm_class(algorithm) for algorithm in list_algorithm_names()]
+    if name in _CLASS_NAMES:
+        return get_algorithm_class(_CLASS_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
     "ALGORITHMS",
+    "ENTRY_POINT_GROUP",
+    "REGISTRY",
     "AiderDiffFencedAlgorithm",
     "AiderEditBlockAlgorithm",
     "AiderPatchAlgorithm",
     "AiderUdiffAlgorithm",
     "Algorithm",
+    "AlgorithmCapabilities",
+    "ChunkedRewriteAlgorithm",
     "CodexPatchAlgorithm",
     "FullRewriteAlgorithm",
     "GitDiffAlgorithm",
@@ -73,6 +142,8 @@ __all__ = [
     "StrReplaceEditorAlgorithm",
     "UdiffTaggedAlgorithm",
     "get_algorithm",
+    "get_algorithm_class",
     "get_all_algorithms",
     "list_algorithm_names",
+    "plugin_entry_points",
 ]
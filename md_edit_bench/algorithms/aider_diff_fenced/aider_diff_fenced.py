@@ -4,13 +4,12 @@ from __future__ import annotations
 
 import re
 
-from md_edit_bench.algorithms.aider_utils import (
-    clean_search_replace_block,
-    replace_most_similar_chunk,
-)
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, clean_search_replace_block
 from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -20,6 +19,7 @@ class DiffFencedError(Exception):
     """Raised when diff-fenced blocks cannot be parsed or applied."""
 
 
+@span("parse")
 def parse_diff_fenced_blocks(content: str) -> list[tuple[str, str]]:
     """Parse diff-fenced blocks from LLM output.
 
@@ -92,6 +92,7 @@ def parse_diff_fenced_blocks(content: str) -> list[tuple[str, str]]:
     return blocks
 
 
+@span("apply")
 def apply_diff_fenced_blocks(original: str, blocks: list[tuple[str, str]]) -> tuple[str, list[str]]:
     """Apply parsed diff-fenced blocks to original content.
 
@@ -101,17 +102,14 @@ def apply_diff_fenced_blocks(original: str, blocks: list[tuple[str, str]]) -> tu
     if not blocks:
         raise DiffFencedError("No valid SEARCH/REPLACE blocks found")
 
-    result = original
+    document = IndexedDocument(original)
     warnings: list[str] = []
 
     for i, (search, replace) in enumerate(blocks, 1):
-        new_result = replace_most_similar_chunk(result, search, replace)
-        if new_result is None:
+        if not document.replace(search, replace):
             warnings.append(f"Block {i}: SEARCH text not found")
-        else:
-            result = new_result
 
-    return result, warnings
+    return document.text, warnings
 
 
 def format_failed_blocks(failed: list[tuple[int, str, str]]) -> str:
@@ -148,31 +146,30 @@ class AiderDiffFencedAlgorithm(Algorithm):
             )
 
         # Apply blocks, collect failures
-        result = initial
+        document = IndexedDocument(initial)
         failed_blocks: list[tuple[int, str, str]] = []
 
         for i, (search, replace) in enumerate(blocks, 1):
-            new_result = replace_most_similar_chunk(result, search, replace)
-            if new_result is None:
+            if not document.replace(search, replace):
                 failed_blocks.append((i, search, replace))
-            else:
-                result = new_result
 
         if not failed_blocks:
             return AlgorithmResult(
-                output=result,
+                output=document.text,
                 success=True,
                 error=None,
                 usage=usage,
             )
 
         # Pass 2: Retry failed blocks with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=result,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, llm_output),
+            document.text,
+            [(f"Block {block_num}", search) for block_num, search, _replace in failed_blocks],
             failed_blocks=format_failed_blocks(failed_blocks),
         )
-        retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         retry_blocks = parse_diff_fenced_blocks(retry_output)
@@ -188,11 +185,8 @@ class AiderDiffFencedAlgorithm(Algorithm):
             # Apply retry blocks, track failures
             retry_failed_count = 0
             for _i, (search, replace) in enumerate(retry_blocks, 1):
-                new_result = replace_most_similar_chunk(result, search, replace)
-                if new_result is None:
+                if not document.replace(search, replace):
                     retry_failed_count += 1
-                else:
-                    result = new_result
 
             # If retry returned fewer blocks than failures, or some retry blocks failed,
             # report the unrecovered count as warnings
@@ -204,7 +198,7 @@ class AiderDiffFencedAlgorithm(Algorithm):
                 )
 
         return AlgorithmResult(
-            output=result,
+            output=document.text,
             success=True,
             error=None,
             usage=usage,
@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
-from md_edit_bench.algorithms.aider_utils import (
-    clean_search_replace_block,
-    replace_most_similar_chunk,
-)
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, clean_search_replace_block
 from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -22,6 +21,7 @@ class PatchError(Exception):
 PATCH_MARKERS = {"*** Begin Patch", "*** End Patch", "*** End of File"}
 
 
+@span("parse")
 def parse_sections(patch_text: str) -> list[tuple[str, str]]:
     """Parse patch into (before_text, after_text) sections for fuzzy matching."""
     lines = patch_text.split("\n")
@@ -106,6 +106,7 @@ def parse_sections(patch_text: str) -> list[tuple[str, str]]:
     return sections
 
 
+@span("apply")
 def apply_patch(
     original: str, patch_text: str
 ) -> tuple[str, list[str], list[tuple[int, str, str]]]:
@@ -120,24 +121,21 @@ def apply_patch(
     if not sections:
         raise PatchError("No valid patch sections found")
 
-    result = original
+    document = IndexedDocument(original)
     warnings: list[str] = []
     failed_sections: list[tuple[int, str, str]] = []
 
     for idx, (before_text, after_text) in enumerate(sections, 1):
         if not before_text.strip():
             # Pure addition - append to end
-            result = result.rstrip("\n") + "\n" + after_text
+            document.append(after_text, strip_newlines=True)
             continue
 
-        new_result = replace_most_similar_chunk(result, before_text, after_text)
-        if new_result is None:
+        if not document.replace(before_text, after_text):
             warnings.append(f"Section {idx}: could not locate context in document")
             failed_sections.append((idx, before_text, after_text))
-        else:
-            result = new_result
 
-    return result, warnings, failed_sections
+    return document.text, warnings, failed_sections
 
 
 def format_failed_sections(failed: list[tuple[int, str, str]]) -> str:
@@ -185,12 +183,14 @@ class AiderPatchAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed sections with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=result,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, patch_text),
+            result,
+            [(f"Section {num}", before) for num, before, _after in failed_sections],
             failed_sections=format_failed_sections(failed_sections),
         )
-        retry_patch_text, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_patch_text, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         try:
@@ -7,13 +7,16 @@ from md_edit_bench.algorithms.aider_utils import (
     replace_most_similar_chunk,
 )
 from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
 
 
+@span("parse")
 def find_diffs(content: str) -> list[tuple[str | None, list[str]]]:
     """Parse unified diffs from LLM output, extracting hunks from fenced blocks."""
     if not content.endswith("\n"):
@@ -226,6 +229,7 @@ def apply_hunk(content: str, hunk: list[str]) -> str | None:
     return None
 
 
+@span("apply")
 def do_replace(content: str, hunk: list[str]) -> str | None:
     """Apply a single hunk to content, with all fallback strategies."""
     before_text, after_text = hunk_to_before_after(hunk)
@@ -243,6 +247,25 @@ def do_replace(content: str, hunk: list[str]) -> str | None:
     return replace_most_similar_chunk(content, before_text, after_text)
 
 
+@span("apply")
+def apply_edits(
+    content: str, edits: list[tuple[str | None, list[str]]]
+) -> tuple[str, list[tuple[int, list[str]]]]:
+    """Apply parsed hunks in order.
+
+    Returns (result, failed_hunks) tuple where failed_hunks contains
+    (hunk_num, hunk) for hunks that couldn't be applied.
+    """
+    failed_hunks: list[tuple[int, list[str]]] = []
+    for i, (_path, hunk) in enumerate(edits, 1):
+        result = do_replace(content, hunk)
+        if result is None:
+            failed_hunks.append((i, hunk))
+        else:
+            content = result
+    return content, failed_hunks
+
+
 def format_failed_hunks(failed: list[tuple[int, list[str]]]) -> str:
     """Format failed hunks for the retry prompt."""
     parts: list[str] = []
@@ -280,14 +303,7 @@ class AiderUdiffAlgorithm(Algorithm):
             )
 
         # Apply all hunks, collect failures
-        content = initial
-        failed_hunks: list[tuple[int, list[str]]] = []
-        for i, (_path, hunk) in enumerate(edits, 1):
-            result = do_replace(content, hunk)
-            if result is None:
-                failed_hunks.append((i, hunk))
-            else:
-                content = result
+        content, failed_hunks = apply_edits(initial, edits)
 
         if not failed_hunks:
             return AlgorithmResult(
@@ -298,12 +314,14 @@ class AiderUdiffAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed hunks with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=content,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, diff_content),
+            content,
+            [(f"Hunk {num}", hunk_to_before_after(hunk)[0]) for num, hunk in failed_hunks],
             failed_hunks=format_failed_hunks(failed_hunks),
         )
-        retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         retry_edits = find_diffs(retry_output)
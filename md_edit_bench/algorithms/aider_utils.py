@@ -12,6 +12,8 @@ from __future__ import annotations
 
 import re
 
+from md_edit_bench.timing import span
+
 
 def prep(content: str) -> tuple[str, list[str]]:
     """Prepare content for matching by normalizing newlines and splitting to lines.
@@ -235,6 +237,312 @@ def try_substring_match(whole: str, part: str, replace: str) -> str | None:
     return None
 
 
+class LineIndex:
+    """Line lists of a document plus a hash index of line occurrence counts.
+
+    Finding a block no longer means comparing a window at every offset: the
+    counts pick the block's rarest line, and only offsets where that line
+    occurs are verified. The index holds counts rather than positions, so
+    `splice` updates it in O(lines changed) without renumbering the rest of
+    the document. Exact and lstripped variants are built on first use.
+    """
+
+    def __init__(self, lines: list[str], counted: bool = True):
+        """Initialize the index.
+
+        Args:
+            lines: Document lines (spliced in place by `splice`)
+            counted: Keep occurrence counts to pick the rarest line. Without
+                them the first line is used, which is cheaper for one-off searches.
+        """
+        self.lines = lines
+        self.counted = counted
+        self._stripped: list[str] | None = None
+        self._counts: dict[bool, dict[str, int]] = {}
+
+    def _haystack(self, stripped: bool) -> list[str]:
+        if not stripped:
+            return self.lines
+        if self._stripped is None:
+            self._stripped = [line.lstrip() for line in self.lines]
+        return self._stripped
+
+    def _table(self, stripped: bool) -> dict[str, int]:
+        if stripped in self._counts:
+            return self._counts[stripped]
+        table: dict[str, int] = {}
+        for line in self._haystack(stripped):
+            table[line] = table.get(line, 0) + 1
+        self._counts[stripped] = table
+        return table
+
+    def candidates(self, part_lines: list[str], stripped: bool = False) -> list[int]:
+        """Offsets (ascending) where part_lines could start, based on its rarest line.
+
+        Args:
+            part_lines: Non-empty block of lines to locate
+            stripped: Match on lstripped lines instead of exact lines
+        """
+        keys = [line.lstrip() for line in part_lines] if stripped else part_lines
+        best_offset = 0
+        if self.counted:
+            table = self._table(stripped)
+            best_count = 0
+            for offset, key in enumerate(keys):
+                count = table.get(key, 0)
+                if not count:
+                    return []
+                if offset == 0 or count < best_count:
+                    best_offset, best_count = offset, count
+                    if count == 1:
+                        break
+
+        haystack = self._haystack(stripped)
+        rarest = keys[best_offset]
+        last = len(haystack) - len(part_lines) + best_offset
+        offsets: list[int] = []
+        pos = best_offset
+        while pos <= last:
+            try:
+                pos = haystack.index(rarest, pos, last + 1)
+            except ValueError:
+                break
+            offsets.append(pos - best_offset)
+            pos += 1
+        return offsets
+
+    def splice(self, start: int, length: int, new_lines: list[str]) -> None:
+        """Apply lines[start:start + length] = new_lines, updating the index."""
+        for stripped, table in self._counts.items():
+            for line in self._haystack(stripped)[start : start + length]:
+                table[line] -= 1
+                if not table[line]:
+                    del table[line]
+            for line in new_lines:
+                key = line.lstrip() if stripped else line
+                table[key] = table.get(key, 0) + 1
+
+        self.lines[start : start + length] = new_lines
+        if self._stripped is not None:
+            self._stripped[start : start + length] = [line.lstrip() for line in new_lines]
+
+
+class IndexedDocument:
+    """A mutable document that edits are applied to one after another.
+
+    The document is held as its `prep()` lines plus a LineIndex, and every edit
+    (search/replace blocks, appends, line-range rewrites) splices those lines in
+    place. The full string is only built when `text` is read, instead of
+    re-splitting and re-joining the whole document for every block.
+
+    `replace` gives exactly the result of `replace_most_similar_chunk(doc, part,
+    replace)`, and the other edits mirror the string operations the appliers
+    used to perform, so results are identical to editing a plain string.
+    """
+
+    def __init__(self, text: str, counted: bool = True):
+        """Initialize the document.
+
+        Args:
+            text: Initial content
+            counted: Passed to LineIndex (disable when applying a single block)
+        """
+        self.counted = counted
+        self._text: str | None = text
+        self._index: LineIndex | None = None
+        # Whether the text lacks the final "\n" that prep() added to the lines
+        self._unterminated = False
+
+    @property
+    def text(self) -> str:
+        """Current document content."""
+        if self._text is None:
+            self._text = self.line_text(0, len(self.lines))
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text = value
+        self._index = None
+
+    @property
+    def lines(self) -> list[str]:
+        """The document's lines as split by `prep()` (do not modify)."""
+        return self._prepared().lines
+
+    def _prepared(self) -> LineIndex:
+        if self._index is None:
+            text = self.text
+            _, lines = prep(text)
+            self._index = LineIndex(lines, self.counted)
+            self._unterminated = bool(text) and not text.endswith("\n")
+        return self._index
+
+    def line_text(self, start: int, end: int) -> str:
+        """Content of lines[start:end], as it appears in `text`."""
+        lines = self.lines
+        chunk = "".join(lines[start:end])
+        if self._unterminated and end >= len(lines) and chunk:
+            return chunk[:-1]
+        return chunk
+
+    def replace_lines(self, start: int, end: int, text: str) -> None:
+        """Replace the content of lines[start:end] with `text`.
+
+        Equivalent to `doc[:pos(start)] + text + doc[pos(end):]` on the string.
+        """
+        if start == len(self.lines) and self._unterminated:
+            # The document's unterminated last line runs on into `text`
+            start -= 1
+            text = self.line_text(start, end) + text
+        # An unterminated last line of `text` runs on into the next line
+        end_ext = min(end + 1, len(self.lines))
+        text += self.line_text(end, end_ext)
+        self._splice(start, end_ext - start, text.splitlines(keepends=True))
+
+    def append(
+        self, text: str, *, ensure_newline: bool = False, strip_newlines: bool = False
+    ) -> None:
+        """Append text at the end of the document.
+
+        Args:
+            text: Content to append
+            ensure_newline: Start `text` on a new line (`doc + "\\n"` unless doc ends with one)
+            strip_newlines: Collapse trailing newlines into one first
+                (`doc.rstrip("\\n") + "\\n"`)
+        """
+        lines = self.lines
+        start = len(lines) - 1
+        if strip_newlines:
+            while start > 0 and lines[start] == "\n":
+                start -= 1
+        start = max(0, start)
+        tail = self.line_text(start, len(lines))
+        if strip_newlines:
+            tail = tail.rstrip("\n") + "\n"
+        elif ensure_newline and not tail.endswith("\n"):
+            tail += "\n"
+        self.replace_lines(start, len(lines), tail + text)
+
+    def _splice(self, start: int, length: int, new_lines: list[str]) -> None:
+        """Replace lines in place, keeping them equal to prep() of the new text."""
+        index = self._prepared()
+        at_end = start + length == len(index.lines)
+        index.splice(start, length, new_lines)
+        lines = index.lines
+        # A "\r" ending the line before the splice pairs up with a leading "\n" after it
+        if 0 < start < len(lines) and lines[start - 1].endswith("\r") and lines[start][0] == "\n":
+            index.splice(start - 1, 2, (lines[start - 1] + lines[start]).splitlines(keepends=True))
+        if at_end:
+            # prep() terminates the last line; remember the text itself doesn't
+            self._unterminated = bool(lines) and not lines[-1].endswith("\n")
+            if self._unterminated:
+                index.splice(len(lines) - 1, 1, prep(lines[-1])[1])
+        self._text = None
+
+    def _apply_match(self, start: int, length: int, new_lines: list[str]) -> bool:
+        """Splice in a match; like the `if res:` checks, an empty result counts as no match."""
+        if len(self.lines) - length + len(new_lines) == 0:
+            return False
+        # The strategies join prep()'d lines, so the result keeps the added "\n"
+        self._unterminated = False
+        self._splice(start, length, new_lines)
+        return True
+
+    def _candidates(self, part_lines: list[str], stripped: bool = False) -> list[int]:
+        return self._prepared().candidates(part_lines, stripped)
+
+    def _perfect(self, part_lines: list[str], replace_lines: list[str]) -> bool:
+        """Indexed equivalent of perfect_replace."""
+        if not part_lines:
+            return self._apply_match(0, 0, replace_lines)
+
+        lines = self._prepared().lines
+        num = len(part_lines)
+        for i in self._candidates(part_lines):
+            if lines[i : i + num] == part_lines:
+                return self._apply_match(i, num, replace_lines)
+        return False
+
+    def _missing_leading_whitespace(self, part_lines: list[str], replace_lines: list[str]) -> bool:
+        """Indexed equivalent of replace_part_with_missing_leading_whitespace."""
+        leading = [len(p) - len(p.lstrip()) for p in part_lines if p.strip()] + [
+            len(p) - len(p.lstrip()) for p in replace_lines if p.strip()
+        ]
+
+        if leading and min(leading):
+            num_leading = min(leading)
+            part_lines = [p[num_leading:] if p.strip() else p for p in part_lines]
+            replace_lines = [p[num_leading:] if p.strip() else p for p in replace_lines]
+
+        if not part_lines:
+            return False
+
+        lines = self._prepared().lines
+        num = len(part_lines)
+        for i in self._candidates(part_lines, stripped=True):
+            add_leading = match_but_for_leading_whitespace(lines[i : i + num], part_lines)
+            if add_leading is None:
+                continue
+
+            replace_lines = [
+                add_leading + rline if rline.strip() else rline for rline in replace_lines
+            ]
+            return self._apply_match(i, num, replace_lines)
+        return False
+
+    def _perfect_or_whitespace(self, part_lines: list[str], replace_lines: list[str]) -> bool:
+        return self._perfect(part_lines, replace_lines) or self._missing_leading_whitespace(
+            part_lines, replace_lines
+        )
+
+    @span("apply")
+    def replace(self, part: str, replace: str, *, substring_match: bool = True) -> bool:
+        """Apply one search/replace block using the replace_most_similar_chunk strategies.
+
+        Args:
+            part: Text to search for
+            replace: Text to replace with
+            substring_match: Fall back to try_substring_match as the last strategy
+
+        Returns:
+            True if a strategy matched and the document was changed, False otherwise
+        """
+        part, part_lines = prep(part)
+        replace, replace_lines = prep(replace)
+
+        if self._perfect_or_whitespace(part_lines, replace_lines):
+            return True
+
+        # Skip a spurious leading blank line
+        if (
+            len(part_lines) > 2
+            and not part_lines[0].strip()
+            and self._perfect_or_whitespace(part_lines[1:], replace_lines)
+        ):
+            return True
+
+        whole, _ = prep(self.text)
+        try:
+            res = try_dotdotdots(whole, part, replace)
+            if res:
+                self.text = res
+                return True
+        except ValueError:
+            pass
+
+        if not substring_match:
+            return False
+
+        # Try substring matching for cases where LLM provides partial lines
+        res = try_substring_match(whole, part, replace)
+        if res:
+            self.text = res
+            return True
+
+        return False
+
+
 def replace_most_similar_chunk(whole: str, part: str, replace: str) -> str | None:
     """Main entry point for search/replace with fallback strategies.
 
@@ -245,6 +553,9 @@ def replace_most_similar_chunk(whole: str, part: str, replace: str) -> str | Non
     4. Handle ellipsis (...) markers
     5. Substring matching (for partial line matches)
 
+    Line-based strategies only verify offsets where the block's first line
+    occurs; use IndexedDocument to apply several blocks to the same document.
+
     Args:
         whole: Full document content
         part: Text to search for
@@ -253,32 +564,9 @@ def replace_most_similar_chunk(whole: str, part: str, replace: str) -> str | Non
     Returns:
         Modified content if any strategy succeeds, None if all fail
     """
-    whole, whole_lines = prep(whole)
-    part, part_lines = prep(part)
-    replace, replace_lines = prep(replace)
-
-    res = perfect_or_whitespace(whole_lines, part_lines, replace_lines)
-    if res:
-        return res
-
-    if len(part_lines) > 2 and not part_lines[0].strip():
-        skip_blank_line_part_lines = part_lines[1:]
-        res = perfect_or_whitespace(whole_lines, skip_blank_line_part_lines, replace_lines)
-        if res:
-            return res
-
-    try:
-        res = try_dotdotdots(whole, part, replace)
-        if res:
-            return res
-    except ValueError:
-        pass
-
-    # Try substring matching for cases where LLM provides partial lines
-    res = try_substring_match(whole, part, replace)
-    if res:
-        return res
-
+    document = IndexedDocument(whole, counted=False)
+    if document.replace(part, replace):
+        return document.text
     return None
 
 
@@ -1,15 +1,37 @@
 """Base class for diff algorithms."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import ClassVar
 
 from md_edit_bench.models import AlgorithmResult
 
 
+@dataclass(frozen=True)
+class AlgorithmCapabilities:
+    """What an algorithm needs from the model and the runner."""
+
+    structured_output: bool = False  # Requests a JSON schema response (response_format)
+    llm_passes: int = 1  # Sequential LLM calls per test, not counting retries of failed edits
+    supports_streaming: bool = True  # Its completions can be streamed (--stream)
+    max_document_chars: int | None = None  # Largest initial document it can edit
+
+
 class Algorithm(ABC):
-    """Base class for diff algorithms."""
+    """Base class for diff algorithms.
+
+    Prompt rendering and call_llm are timed automatically. Subclasses mark their
+    own parsing and edit application with `md_edit_bench.timing.span("parse")` and
+    `span("apply")` (as decorators or context managers) so results can tell model
+    time apart from local work.
+
+    Subclasses override `capabilities` when they differ from a single plain-text
+    LLM call; the runner schedules and skips tests based on it.
+    """
 
     name: str
     description: str
+    capabilities: ClassVar[AlgorithmCapabilities] = AlgorithmCapabilities()
 
     @abstractmethod
     async def apply(self, initial: str, changes: str, model: str) -> AlgorithmResult:
@@ -0,0 +1,5 @@
+"""Chunked rewrite algorithm family."""
+
+from md_edit_bench.algorithms.chunked_rewrite.chunked_rewrite import ChunkedRewriteAlgorithm
+
+__all__ = ["ChunkedRewriteAlgorithm"]
@@ -0,0 +1,168 @@
+"""Chunked rewrite algorithm - rewrite only the parts of a long document a change touches."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+
+from md_edit_bench.algorithms.base import Algorithm, AlgorithmCapabilities
+from md_edit_bench.algorithms.full_rewrite.full_rewrite import clean_rewrite_output
+from md_edit_bench.algorithms.section_rewrite.section_rewrite import split_sections
+from md_edit_bench.llm import call_llm
+from md_edit_bench.models import AlgorithmResult, LLMUsage
+from md_edit_bench.timing import span
+from md_edit_bench.utils import PromptManager
+
+pm = PromptManager(__file__)
+
+# Largest part (in characters) that whole sections are packed into
+MAX_PART_CHARS = 8000
+
+
+def split_parts(text: str, max_chars: int = MAX_PART_CHARS) -> list[str]:
+    """Split a document at headings into consecutive parts of about `max_chars` or less.
+
+    Each part after the first starts at a heading, and sections are packed into a part
+    greedily; a single section longer than `max_chars` is a part on its own. Headings
+    inside fenced code blocks are not split at. Joining the parts with newlines gives
+    back the document.
+    """
+    lines = text.split("\n")
+    fenced = _fenced_lines(lines)
+    starts = sorted({0} | {start for _, _, start, _ in split_sections(text) if start not in fenced})
+
+    parts: list[str] = []
+    part_start = 0
+    part_chars = 0
+    for start, end in zip(starts, [*starts[1:], len(lines)], strict=True):
+        chars = sum(len(line) + 1 for line in lines[start:end])
+        if part_chars and part_chars + chars > max_chars:
+            parts.append("\n".join(lines[part_start:start]))
+            part_start, part_chars = start, 0
+        part_chars += chars
+    parts.append("\n".join(lines[part_start:]))
+    return parts
+
+
+def _fenced_lines(lines: list[str]) -> set[int]:
+    """Indices of the lines inside fenced code blocks (including the fences)."""
+    fenced: set[int] = set()
+    fence: str | None = None
+    for i, line in enumerate(lines):
+        marker = re.match(r"\s*(`{3,}|~{3,})", line)
+        if fence is not None:
+            fenced.add(i)
+            if marker and marker.group(1).startswith(fence):
+                fence = None
+        elif marker:
+            fenced.add(i)
+            fence = marker.group(1)
+    return fenced
+
+
+def outline(parts: list[str]) -> str:
+    """The headings of each part, prefixed with the part number."""
+    headings: list[str] = []
+    for number, part in enumerate(parts, 1):
+        lines = part.split("\n")
+        fenced = _fenced_lines(lines)
+        headings.extend(
+            f"Part {number}: {line}"
+            for i, line in enumerate(lines)
+            if i not in fenced and re.match(r"^#+\s+\S", line)
+        )
+    return "\n".join(headings)
+
+
+@span("parse")
+def parse_part_numbers(output: str, count: int) -> list[int]:
+    """Part numbers (1-based, sorted, within 1..count) listed in the routing response.
+
+    Only numbers inside the `<parts>` tag count; a response without it gives an empty
+    list rather than numbers picked out of the model's prose.
+    """
+    listed = re.search(r"<parts>(.*?)</parts>", output, re.DOTALL)
+    if not listed:
+        return []
+    digits: list[str] = re.findall(r"\d+", listed.group(1))
+    numbers = {int(n) for n in digits}
+    return sorted(n for n in numbers if 1 <= n <= count)
+
+
+def stitch(original: str, rewritten: str) -> str:
+    """A rewritten part, keeping the original part's leading and trailing whitespace.
+
+    Parts meet at blank lines, which models tend to drop from the ends of their output.
+    """
+    if not original.strip():
+        return original
+    lead = original[: len(original) - len(original.lstrip())]
+    trail = original[len(original.rstrip()) :]
+    return lead + rewritten.strip() + trail
+
+
+class ChunkedRewriteAlgorithm(Algorithm):
+    """Splits the document at headings and rewrites only the parts the changes touch.
+
+    A routing call first picks the parts the change request concerns, then those parts
+    are rewritten concurrently and stitched back between the untouched ones, so output
+    latency scales with the largest touched part rather than the whole document.
+    Documents that fit in one part are rewritten in a single call.
+    """
+
+    name = "chunked_rewrite"
+    description = "Route changes to heading-delimited parts and rewrite them concurrently"
+    capabilities = AlgorithmCapabilities(llm_passes=2)  # Routing, then the part rewrites
+
+    async def apply(self, initial: str, changes: str, model: str) -> AlgorithmResult:
+        parts = split_parts(initial)
+        usage = LLMUsage()
+        warnings: list[str] = []
+
+        # Pass 1: Route the changes to parts
+        touched = [1]
+        if len(parts) > 1:
+            route_prompt = pm.get("route.jinja2", parts=parts, changes=changes)
+            route_output, usage = await call_llm(model, route_prompt, pm.get("route_system.jinja2"))
+            touched = parse_part_numbers(route_output, len(parts))
+            if not touched:
+                warnings.append(f"Routing listed no parts; rewrote all {len(parts)}")
+                touched = list(range(1, len(parts) + 1))
+
+        # Pass 2: Rewrite the touched parts concurrently
+        system_prompt = pm.get("system.jinja2")
+        document_outline = outline(parts)
+        rewrites = await asyncio.gather(
+            *[
+                call_llm(
+                    model,
+                    pm.get(
+                        "user.jinja2",
+                        part=parts[number - 1],
+                        number=number,
+                        total=len(parts),
+                        outline=document_outline,
+                        changes=changes,
+                    ),
+                    system_prompt,
+                )
+                for number in touched
+            ]
+        )
+
+        result = list(parts)
+        for number, (output, part_usage) in zip(touched, rewrites, strict=True):
+            usage = usage + part_usage
+            rewritten = clean_rewrite_output(output)
+            if not rewritten.strip() and parts[number - 1].strip():
+                warnings.append(f"Part {number}: empty rewrite, kept the original")
+                continue
+            result[number - 1] = stitch(parts[number - 1], rewritten)
+
+        return AlgorithmResult(
+            output="\n".join(result),
+            success=True,
+            error=None,
+            usage=usage,
+            warnings=warnings,
+        )
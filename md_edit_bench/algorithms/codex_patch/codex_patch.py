@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from md_edit_bench.algorithms.aider_utils import (
-    clean_search_replace_block,
-    replace_most_similar_chunk,
-)
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, clean_search_replace_block
 from md_edit_bench.algorithms.base import Algorithm
-from md_edit_bench.llm import call_llm
+from md_edit_bench.algorithms.followup import retry_request
+from md_edit_bench.algorithms.stream_parser import IncrementalParser
+from md_edit_bench.llm import StreamAborted, call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -21,6 +21,7 @@ class PatchError(Exception):
 PATCH_MARKERS = {"*** Begin Patch", "*** End Patch", "*** End of File"}
 
 
+@span("parse")
 def parse_codex_patch(patch_text: str) -> list[tuple[str, str]]:
     """Parse Codex patch into (before_text, after_text) sections for fuzzy matching.
 
@@ -151,6 +152,7 @@ def parse_codex_patch(patch_text: str) -> list[tuple[str, str]]:
     return sections
 
 
+@span("apply")
 def apply_codex_patch(
     original: str, patch_text: str
 ) -> tuple[str, list[tuple[int, str, str]], list[str]]:
@@ -166,24 +168,115 @@ def apply_codex_patch(
     if not sections:
         raise PatchError("No valid patch sections found")
 
-    result = original
+    document = IndexedDocument(original)
     failed_sections: list[tuple[int, str, str]] = []
     warnings: list[str] = []
     for idx, (before_text, after_text) in enumerate(sections, 1):
-        # Skip fuzzy matching for insufficient context (empty or single newline)
-        # These sections are appended to the end
-        if not before_text or before_text in ("\n", "\n\n"):
-            result = result.rstrip("\n") + "\n" + after_text
-            continue
+        _apply_section(
+            document,
+            idx,
+            before_text,
+            after_text,
+            failed_sections=failed_sections,
+            warnings=warnings,
+        )
 
-        new_result = replace_most_similar_chunk(result, before_text, after_text)
-        if new_result is None:
-            failed_sections.append((idx, before_text, after_text))
-            warnings.append(f"Section {idx}: could not locate context in document")
-        else:
-            result = new_result
+    return document.text, failed_sections, warnings
+
+
+@span("apply")
+def _apply_section(
+    document: IndexedDocument,
+    idx: int,
+    before_text: str,
+    after_text: str,
+    *,
+    failed_sections: list[tuple[int, str, str]],
+    warnings: list[str],
+) -> None:
+    """Apply one (before, after) section, recording a failure if it can't be located."""
+    # Skip fuzzy matching for insufficient context (empty or single newline)
+    # These sections are appended to the end
+    if not before_text or before_text in ("\n", "\n\n"):
+        document.append(after_text, strip_newlines=True)
+        return
+
+    if not document.replace(before_text, after_text):
+        failed_sections.append((idx, before_text, after_text))
+        warnings.append(f"Section {idx}: could not locate context in document")
+
+
+class CodexPatchStream(IncrementalParser):
+    """Applies each @@ hunk while the patch streams in.
+
+    A hunk closes at the next `@@` line or patch marker; it is parsed with
+    parse_codex_patch on its own, which yields the same sections as parsing the
+    whole patch.
+    """
 
-    return result, failed_sections, warnings
+    marker = "*** Begin Patch"
+
+    def __init__(self, original: str):
+        super().__init__()
+        self.original = original
+        self._reset()
+
+    def _reset(self) -> None:
+        self.document = IndexedDocument(self.original)
+        self.sections: list[tuple[str, str]] = []
+        self.failed_sections: list[tuple[int, str, str]] = []
+        self.warnings: list[str] = []
+        self._hunk: list[str] | None = None
+        self._done = False
+
+    def _feed_line(self, line: str) -> None:
+        if self._done:
+            return
+        stripped = line.strip()
+        if stripped.startswith("*** Begin Patch"):
+            self.mark_started()
+            self._close_hunk()
+        elif stripped == "*** End Patch":
+            self._close_hunk()
+            self._done = True
+        elif stripped.startswith("@@"):
+            self.mark_started()
+            self._close_hunk()
+            self._hunk = [line]
+        elif stripped in PATCH_MARKERS:
+            self._close_hunk()
+        elif self._hunk is not None:
+            self._hunk.append(line)
+
+    def _finish(self) -> None:
+        self._close_hunk()
+
+    def _close_hunk(self) -> None:
+        if self._hunk is None:
+            return
+        hunk, self._hunk = self._hunk, None
+        for before_text, after_text in parse_codex_patch("\n".join(hunk)):
+            self.sections.append((before_text, after_text))
+            _apply_section(
+                self.document,
+                len(self.sections),
+                before_text,
+                after_text,
+                failed_sections=self.failed_sections,
+                warnings=self.warnings,
+            )
+
+    def resolve(self, patch_text: str) -> tuple[str, list[tuple[int, str, str]], list[str]]:
+        """Return the streamed result if it matches a full parse of the final text.
+
+        Raises PatchError exactly like apply_codex_patch. Falls back to
+        apply_codex_patch when nothing was streamed or the parses disagree.
+        """
+        self.finish()
+        sections = parse_codex_patch(patch_text)
+        if self.fed and sections and sections == self.sections:
+            return self.document.text, self.failed_sections, self.warnings
+        return apply_codex_patch(self.original, patch_text)
 
 
 def format_failed_sections(failed: list[tuple[int, str, str]]) -> str:
@@ -207,11 +300,17 @@ class CodexPatchAlgorithm(Algorithm):
         system_prompt = pm.get("system.jinja2")
         user_prompt = pm.get("user.jinja2", initial=initial, changes=changes)
 
-        # Pass 1: Initial LLM call
-        patch_text, usage = await call_llm(model, user_prompt, system_prompt)
+        # Pass 1: Initial LLM call (hunks are applied as they stream in, if streaming)
+        stream = CodexPatchStream(initial)
+        try:
+            patch_text, usage = await call_llm(
+                model, user_prompt, system_prompt, stream_handler=stream
+            )
+        except StreamAborted as e:
+            return AlgorithmResult(output=None, success=False, error=str(e), usage=e.usage)
 
         try:
-            result, failed_sections, warnings = apply_codex_patch(initial, patch_text)
+            result, failed_sections, warnings = stream.resolve(patch_text)
         except PatchError as e:
             return AlgorithmResult(
                 output=None,
@@ -229,12 +328,14 @@ class CodexPatchAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed sections with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=result,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, patch_text),
+            result,
+            [(f"Section {num}", before) for num, before, _after in failed_sections],
             failed_sections=format_failed_sections(failed_sections),
         )
-        retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         try:
@@ -0,0 +1,120 @@
+"""Retry requests that continue the original conversation.
+
+When some edits from the first response fail to apply, the retry request keeps that
+exchange (the user prompt with the document, and the model's response) as message
+history and appends a short failure report: which blocks failed and, for each, the
+closest text in the current document. The model already has the document and its
+own edits in context, so the report only has to point out what to fix. The history
+is also the exact prefix of the first request, which providers serve from their
+prompt cache (see `md_edit_bench.llm.with_cache_control`).
+
+`MD_EDIT_BENCH_RETRY_MODE=fresh` restores the standalone retry prompts (each
+algorithm's `retry.jinja2`, which embeds the whole current document), e.g. to
+compare with runs made before conversation retries.
+"""
+
+from __future__ import annotations
+
+import difflib
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from md_edit_bench import config
+from md_edit_bench.config import RetryMode
+
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
+
+    from md_edit_bench.utils import PromptManager
+
+
+def retry_request(
+    pm: PromptManager,
+    first_turn: tuple[str, str],
+    current: str,
+    failures: Sequence[tuple[str, str | None]],
+    mode: RetryMode | None = None,
+    **kwargs: str,
+) -> str | list[ChatCompletionMessageParam]:
+    """Build the retry request for edits that failed to apply.
+
+    Args:
+        pm: The algorithm's prompts
+        first_turn: The first user prompt and the model's response to it
+        current: The document after the edits that did apply
+        failures: (label, text the edit tried to match) per failed edit; the text may
+            be None when an excerpt would not help (e.g. an ambiguous match)
+        mode: "conversation" or "fresh" (default: MD_EDIT_BENCH_RETRY_MODE)
+        **kwargs: Further template variables, passed to both templates
+
+    Returns:
+        Messages continuing the first exchange with `followup.jinja2` (rendered with
+        the failure report as `failures`), or in fresh mode the standalone
+        `retry.jinja2` prompt (rendered with `current`).
+    """
+    if (mode or config.get_settings().md_edit_bench_retry_mode) == "fresh":
+        return pm.get("retry.jinja2", current=current, **kwargs)
+
+    user_prompt, response = first_turn
+    followup = pm.get("followup.jinja2", failures=failure_report(current, failures), **kwargs)
+    return [
+        {"role": "user", "content": user_prompt},
+        {"role": "assistant", "content": response},
+        {"role": "user", "content": followup},
+    ]
+
+
+def failure_report(document: str, failures: Sequence[tuple[str, str | None]]) -> str:
+    """List failed edits with the closest excerpt of the document for each."""
+    parts: list[str] = []
+    for label, search in failures:
+        excerpt = nearest_excerpt(document, search) if search is not None else None
+        if excerpt is None:
+            parts.append(f"{label}: no similar text in the document")
+        else:
+            parts.append(
+                f"{label}: closest text in the document is\n<excerpt>\n{excerpt}\n</excerpt>"
+            )
+    return "\n\n".join(parts)
+
+
+def nearest_excerpt(
+    document: str, search: str, context: int = 2, cutoff: float = 0.6
+) -> str | None:
+    """The lines of `document` closest to `search`, with `context` lines around them.
+
+    Every window of as many lines as `search` is compared with it line by line
+    (ignoring indentation and blank lines). When no window is at least `cutoff`
+    similar (e.g. it only shares a `---` line with `search`), the window starts at the
+    line most similar to the longest line of `search` instead.
+
+    Returns:
+        The excerpt, or None if neither a window nor a line of the document is at least
+        `cutoff` similar
+    """
+    doc_lines = document.splitlines()
+    part = [line.strip() for line in search.strip("\n").splitlines()]
+    if not doc_lines or not any(part):
+        return None
+    stripped = [line.strip() for line in doc_lines]
+    size = min(len(part), len(doc_lines))
+
+    # Matching lines of each window against the (fixed) search lines
+    matcher = difflib.SequenceMatcher[str](lambda line: not line)
+    matcher.set_seq2(part)
+    best_start, best_ratio = 0, 0.0
+    for start in range(len(doc_lines) - size + 1):
+        matcher.set_seq1(stripped[start : start + size])
+        if matcher.quick_ratio() > best_ratio and (ratio := matcher.ratio()) > best_ratio:
+            best_start, best_ratio = start, ratio
+            if ratio == 1.0:
+                break
+
+    if best_ratio < cutoff:
+        close = difflib.get_close_matches(max(part, key=len), stripped, n=1, cutoff=cutoff)
+        if not close:
+            return None
+        best_start = min(stripped.index(close[0]), len(doc_lines) - size)
+
+    start = max(0, best_start - context)
+    return "\n".join(doc_lines[start : best_start + size + context])
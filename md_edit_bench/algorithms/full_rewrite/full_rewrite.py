@@ -5,11 +5,32 @@ from __future__ import annotations
 from md_edit_bench.algorithms.base import Algorithm
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
 
 
+@span("parse")
+def clean_rewrite_output(result: str) -> str:
+    """Extract the document from the LLM output (strip <document> tags and code fences)."""
+    result_clean = result.strip()
+
+    # Remove XML tags
+    if result_clean.startswith("<document>"):
+        result_clean = result_clean.split("<document>", 1)[1]
+    result_clean = result_clean.split("</document>", 1)[0]
+
+    if result_clean.startswith("```"):
+        first_newline = result_clean.find("\n")
+        if first_newline != -1:
+            result_clean = result_clean[first_newline + 1 :]
+        if result_clean.endswith("```"):
+            result_clean = result_clean[:-3].rstrip()
+
+    return result_clean
+
+
 class FullRewriteAlgorithm(Algorithm):
     """LLM outputs the entire edited document (simple but potentially expensive)."""
 
@@ -22,23 +43,9 @@ class FullRewriteAlgorithm(Algorithm):
 
         result, usage = await call_llm(model, user_prompt, system_prompt)
 
-        # Clean up result if wrapped in code blocks
-        result_clean = result.strip()
-
-        # Remove XML tags
-        if result_clean.startswith("<document>"):
-            result_clean = result_clean.split("<document>", 1)[1]
-        result_clean = result_clean.split("</document>", 1)[0]
-
-        if result_clean.startswith("```"):
-            first_newline = result_clean.find("\n")
-            if first_newline != -1:
-                result_clean = result_clean[first_newline + 1 :]
-            if result_clean.endswith("```"):
-                result_clean = result_clean[:-3].rstrip()
-
+        # Clean up result if wrapped in tags or code blocks
         return AlgorithmResult(
-            output=result_clean,
+            output=clean_rewrite_output(result),
             success=True,
             error=None,
             usage=usage,
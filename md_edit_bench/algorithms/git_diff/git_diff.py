@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
-from md_edit_bench.algorithms.aider_utils import (
-    clean_search_replace_block,
-    replace_most_similar_chunk,
-)
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, clean_search_replace_block
 from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -47,6 +46,7 @@ def hunk_to_before_after(hunk_lines: list[tuple[str, str]]) -> tuple[str, str]:
     return clean_search_replace_block("\n".join(before_lines), "\n".join(after_lines))
 
 
+@span("parse")
 def parse_hunks(diff_text: str) -> list[list[tuple[str, str]]]:
     """Parse unified diff into hunks."""
     # Clean up diff text - remove markdown code blocks if present
@@ -102,6 +102,7 @@ def parse_hunks(diff_text: str) -> list[list[tuple[str, str]]]:
     return hunks
 
 
+@span("apply")
 def parse_and_apply_diff(
     original: str, diff_text: str
 ) -> tuple[str, list[str], list[tuple[int, str, str]]]:
@@ -117,7 +118,7 @@ def parse_and_apply_diff(
     hunks = parse_hunks(diff_text)
 
     # Apply hunks using fuzzy matching on evolving document
-    result = original
+    document = IndexedDocument(original)
     warnings: list[str] = []
     failed_hunks: list[tuple[int, str, str]] = []
     for idx, hunk in enumerate(hunks, 1):
@@ -125,17 +126,14 @@ def parse_and_apply_diff(
 
         if not before_text.strip():
             # Pure addition at end - append
-            result = result.rstrip("\n") + "\n" + after_text
+            document.append(after_text, strip_newlines=True)
             continue
 
-        new_result = replace_most_similar_chunk(result, before_text, after_text)
-        if new_result is None:
+        if not document.replace(before_text, after_text):
             warnings.append(f"Hunk {idx}: could not locate context in document")
             failed_hunks.append((idx, before_text, after_text))
-        else:
-            result = new_result
 
-    return result, warnings, failed_hunks
+    return document.text, warnings, failed_hunks
 
 
 class GitDiffAlgorithm(Algorithm):
@@ -173,12 +171,14 @@ class GitDiffAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed hunks with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=result,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, diff_content),
+            result,
+            [(f"Hunk {hunk_num}", before) for hunk_num, before, _after in failed_hunks],
             failed_hunks=format_failed_hunks(failed_hunks),
         )
-        retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         # Apply retry hunks
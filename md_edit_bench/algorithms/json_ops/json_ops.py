@@ -7,10 +7,12 @@ from typing import Literal
 
 from pydantic import BaseModel
 
-from md_edit_bench.algorithms.aider_utils import replace_most_similar_chunk
-from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, replace_most_similar_chunk
+from md_edit_bench.algorithms.base import Algorithm, AlgorithmCapabilities
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -55,14 +57,19 @@ class JsonOpsError(Exception):
     """Raised when JSON operations cannot be parsed or applied."""
 
 
-def split_sections(text: str) -> list[tuple[str, int, int, int]]:
-    """Split markdown into sections based on headings.
+@span("parse")
+def parse_operations(raw_json: str) -> list[Operation]:
+    """Validate the LLM's structured output into operations."""
+    return OperationsList.model_validate_json(raw_json).operations
+
+
+def split_sections(lines: list[str]) -> list[tuple[str, int, int, int]]:
+    """Split markdown lines (with line endings) into sections based on headings.
 
     Returns:
         List of (heading_text, level, start_line, end_line) tuples
     """
     section_re = re.compile(r"^(#+)\s+(.+)$")
-    lines = text.splitlines(keepends=True)
     sections: list[tuple[str, int, int, int]] = []
 
     for i, line in enumerate(lines):
@@ -91,28 +98,26 @@ def split_sections(text: str) -> list[tuple[str, int, int, int]]:
     return sections
 
 
-def get_section_text(doc: str, section_name: str) -> tuple[str, int, int] | None:
-    """Get text of a section by heading name.
+def find_section(lines: list[str], section_name: str) -> tuple[int, int] | None:
+    """Find a section by heading name.
 
     Returns:
-        Tuple of (section_text, start_char_pos, end_char_pos) or None if not found.
+        Tuple of (start_line, end_line) or None if not found.
     """
-    sections = split_sections(doc)
-    lines = doc.splitlines(keepends=True)
-
-    for heading_text, _level, start_line, end_line in sections:
+    for heading_text, _level, start_line, end_line in split_sections(lines):
         if heading_text == section_name:
-            section_text = "".join(lines[start_line:end_line])
-            start_pos = sum(len(lines[i]) for i in range(start_line))
-            end_pos = sum(len(lines[i]) for i in range(end_line))
-            return section_text, start_pos, end_pos
+            return start_line, end_line
 
     return None
 
 
+@span("apply")
 def apply_ops(initial: str, ops: list[Operation]) -> tuple[str, list[str], list[Operation]]:
     """Apply JSON operations to document.
 
+    Each operation rewrites only its section's lines of a shared IndexedDocument,
+    so the full document string is built once at the end.
+
     Returns (result, warnings, failed_operations) tuple.
     Skipped operations are reported as warnings and returned in failed_operations.
     Raises JsonOpsError only for unrecoverable errors (no ops, empty section/match).
@@ -120,7 +125,7 @@ def apply_ops(initial: str, ops: list[Operation]) -> tuple[str, list[str], list[
     if not ops:
         raise JsonOpsError("No operations to apply")
 
-    doc = initial
+    document = IndexedDocument(initial)
     warnings: list[str] = []
     failed_ops: list[Operation] = []
 
@@ -133,68 +138,48 @@ def apply_ops(initial: str, ops: list[Operation]) -> tuple[str, list[str], list[
         if not match_text:
             raise JsonOpsError(f"Operation {i}: target.match is required")
 
-        section_result = get_section_text(doc, section_name)
-        if section_result is None:
+        bounds = find_section(document.lines, section_name)
+        if bounds is None:
             warnings.append(f"Operation {i}: section '{section_name}' not found")
             failed_ops.append(op)
             continue
 
-        section_text, start_pos, end_pos = section_result
+        start_line, end_line = bounds
+        new_section = _apply_op(op, document.line_text(start_line, end_line))
+        if new_section is None:
+            warnings.append(f"Operation {i}: could not find match in section '{section_name}'")
+            failed_ops.append(op)
+            continue
+        document.replace_lines(start_line, end_line, new_section)
 
-        if isinstance(op, ReplaceOperation):
-            new_section = replace_most_similar_chunk(section_text, match_text, op.replacement)
-            if new_section is None:
-                warnings.append(f"Operation {i}: could not find match in section '{section_name}'")
-                failed_ops.append(op)
-                continue
-            doc = doc[:start_pos] + new_section + doc[end_pos:]
-
-        elif isinstance(op, DeleteOperation):
-            new_section = replace_most_similar_chunk(section_text, match_text, "")
-            if new_section is None:
-                warnings.append(f"Operation {i}: could not find match in section '{section_name}'")
-                failed_ops.append(op)
-                continue
-            doc = doc[:start_pos] + new_section + doc[end_pos:]
-
-        elif isinstance(op, InsertAfterOperation):
-            index = section_text.find(match_text)
-            if index != -1:
-                anchor_end = index + len(match_text)
-                new_section = (
-                    section_text[:anchor_end] + "\n" + op.content + section_text[anchor_end:]
-                )
-                doc = doc[:start_pos] + new_section + doc[end_pos:]
-            else:
-                new_section = replace_most_similar_chunk(
-                    section_text, match_text, match_text + "\n" + op.content
-                )
-                if new_section is None:
-                    warnings.append(
-                        f"Operation {i}: could not find match in section '{section_name}'"
-                    )
-                    failed_ops.append(op)
-                    continue
-                doc = doc[:start_pos] + new_section + doc[end_pos:]
-
-        elif isinstance(op, InsertBeforeOperation):  # pyright: ignore[reportUnnecessaryIsInstance]
-            index = section_text.find(match_text)
-            if index != -1:
-                new_section = section_text[:index] + op.content + "\n" + section_text[index:]
-                doc = doc[:start_pos] + new_section + doc[end_pos:]
-            else:
-                new_section = replace_most_similar_chunk(
-                    section_text, match_text, op.content + "\n" + match_text
-                )
-                if new_section is None:
-                    warnings.append(
-                        f"Operation {i}: could not find match in section '{section_name}'"
-                    )
-                    failed_ops.append(op)
-                    continue
-                doc = doc[:start_pos] + new_section + doc[end_pos:]
+    return document.text, warnings, failed_ops
+
+
+def _apply_op(op: Operation, section_text: str) -> str | None:
+    """Apply one operation to its section's text.
+
+    Returns:
+        The new section text, or None if the target match couldn't be found.
+    """
+    match_text = op.target.match
 
-    return doc, warnings, failed_ops
+    if isinstance(op, ReplaceOperation):
+        return replace_most_similar_chunk(section_text, match_text, op.replacement)
+
+    if isinstance(op, DeleteOperation):
+        return replace_most_similar_chunk(section_text, match_text, "")
+
+    if isinstance(op, InsertAfterOperation):
+        index = section_text.find(match_text)
+        if index != -1:
+            anchor_end = index + len(match_text)
+            return section_text[:anchor_end] + "\n" + op.content + section_text[anchor_end:]
+        return replace_most_similar_chunk(section_text, match_text, match_text + "\n" + op.content)
+
+    index = section_text.find(match_text)
+    if index != -1:
+        return section_text[:index] + op.content + "\n" + section_text[index:]
+    return replace_most_similar_chunk(section_text, match_text, op.content + "\n" + match_text)
 
 
 def format_failed_operations(failed: list[Operation]) -> str:
@@ -218,6 +203,7 @@ class JsonOpsAlgorithm(Algorithm):
 
     name = "json_ops"
     description = "Structured JSON operations (replace/insert/delete by section + snippet)"
+    capabilities = AlgorithmCapabilities(structured_output=True, supports_streaming=False)
 
     async def apply(self, initial: str, changes: str, model: str) -> AlgorithmResult:
         system_prompt = pm.get("system.jinja2")
@@ -229,8 +215,8 @@ class JsonOpsAlgorithm(Algorithm):
         )
 
         try:
-            ops_list = OperationsList.model_validate_json(raw_json)
-            result, warnings, failed_ops = apply_ops(initial, ops_list.operations)
+            ops = parse_operations(raw_json)
+            result, warnings, failed_ops = apply_ops(initial, ops)
 
             # If no failures, return immediately
             if not failed_ops:
@@ -239,36 +225,35 @@ class JsonOpsAlgorithm(Algorithm):
                 )
 
             # Pass 2: Retry failed operations with LLM
-            retry_prompt = pm.get(
-                "retry.jinja2",
-                current=result,
+            op_numbers = {id(op): i for i, op in enumerate(ops, start=1)}
+            retry_messages = retry_request(
+                pm,
+                (user_prompt, raw_json),
+                result,
+                [(f"Operation {op_numbers[id(op)]}", op.target.match) for op in failed_ops],
                 failed_operations=format_failed_operations(failed_ops),
             )
             retry_json, retry_usage = await call_llm(
-                model, retry_prompt, system_prompt, response_format=OperationsList
+                model, retry_messages, system_prompt, response_format=OperationsList
             )
             usage = usage + retry_usage
 
-            retry_ops_list = OperationsList.model_validate_json(retry_json)
+            retry_ops = parse_operations(retry_json)
 
             # Track which operations remain unrecovered
             retry_warnings: list[str] = []
 
-            if not retry_ops_list.operations:
+            if not retry_ops:
                 # Retry produced no operations - all original failures become warnings
                 retry_warnings.append(
                     f"{len(failed_ops)} operation(s) failed and retry produced no fix"
                 )
             else:
                 # Apply retry operations, track failures
-                result, _retry_apply_warnings, retry_failed_ops = apply_ops(
-                    result, retry_ops_list.operations
-                )
+                result, _retry_apply_warnings, retry_failed_ops = apply_ops(result, retry_ops)
 
                 # If retry operations failed, report the unrecovered count
-                unrecovered = len(failed_ops) - (
-                    len(retry_ops_list.operations) - len(retry_failed_ops)
-                )
+                unrecovered = len(failed_ops) - (len(retry_ops) - len(retry_failed_ops))
                 if unrecovered > 0:
                     retry_warnings.append(f"{unrecovered} operation(s) unrecovered after retry")
 
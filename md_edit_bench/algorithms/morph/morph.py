@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from md_edit_bench import config
-from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.base import Algorithm, AlgorithmCapabilities
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
 from md_edit_bench.utils import PromptManager
@@ -28,6 +28,7 @@ class MorphAlgorithm(Algorithm):
 
     name = "morph"
     description = "Generator LLM + Morph merger pipeline"
+    capabilities = AlgorithmCapabilities(llm_passes=2)  # Generator, then the Morph merger
 
     async def apply(self, initial: str, changes: str, model: str) -> AlgorithmResult:
         # Step 1: Generator - LLM creates edit instructions (not full document)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from md_edit_bench.algorithms.base import Algorithm
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -19,6 +20,7 @@ UNICODE_REPLACEMENTS = {
 }
 
 
+@span("parse")
 def normalize_unicode(text: str) -> str:
     """Replace common Unicode characters with ASCII equivalents."""
     for unicode_char, ascii_char in UNICODE_REPLACEMENTS.items():
@@ -34,6 +36,7 @@ def find_first(lines: list[str], target: str, start: int = 0) -> int | None:
     return None
 
 
+@span("apply")
 def expand_document(original: str, output: str) -> tuple[str, str | None]:
     """Expand ... markers in output using content from original.
 
@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import re
 
-from md_edit_bench.algorithms.aider_utils import (
-    clean_search_replace_block,
-    replace_most_similar_chunk,
-)
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, clean_search_replace_block
 from md_edit_bench.algorithms.base import Algorithm
-from md_edit_bench.llm import call_llm
+from md_edit_bench.algorithms.followup import retry_request
+from md_edit_bench.algorithms.stream_parser import IncrementalParser
+from md_edit_bench.llm import StreamAborted, call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -20,6 +20,7 @@ class SearchReplaceError(Exception):
     """Raised when a search/replace block cannot be applied safely."""
 
 
+@span("parse")
 def parse_blocks(blocks_text: str) -> list[tuple[str, str]]:
     """Parse search/replace blocks from LLM output."""
     pattern = r"<{5,9} SEARCH\n(.*?)\n={5,9}\n(.*?)\n>{5,9} REPLACE"
@@ -33,10 +34,12 @@ def parse_blocks(blocks_text: str) -> list[tuple[str, str]]:
     return [clean_search_replace_block(search, replace) for search, replace in blocks]
 
 
+@span("apply")
 def apply_search_replace(original: str, blocks_text: str) -> tuple[str, list[tuple[int, str, str]]]:
     """Parse and apply search/replace blocks using fuzzy matching on evolving document.
 
-    Uses replace_most_similar_chunk for robust matching that handles:
+    Uses the replace_most_similar_chunk strategies (via IndexedDocument, which keeps
+    a line index across blocks) for robust matching that handles:
     - Exact matches (preferred)
     - Whitespace differences
     - Minor text variations (80% similarity threshold)
@@ -53,19 +56,91 @@ def apply_search_replace(original: str, blocks_text: str) -> tuple[str, list[tup
     if not blocks:
         raise SearchReplaceError("No valid search/replace blocks found")
 
-    result = original
+    document = IndexedDocument(original)
     failed_blocks: list[tuple[int, str, str]] = []
     for i, (search, replace) in enumerate(blocks, 1):
-        if not search.strip():
-            raise SearchReplaceError(f"Block {i}: empty search text")
+        _apply_block(document, i, search, replace, failed_blocks)
 
-        new_result = replace_most_similar_chunk(result, search, replace)
-        if new_result is None:
-            failed_blocks.append((i, search, replace))
-        else:
-            result = new_result
+    return document.text, failed_blocks
 
-    return result, failed_blocks
+
+@span("apply")
+def _apply_block(
+    document: IndexedDocument,
+    i: int,
+    search: str,
+    replace: str,
+    failed_blocks: list[tuple[int, str, str]],
+) -> None:
+    """Apply one block to the document, recording it in failed_blocks if it doesn't match."""
+    if not search.strip():
+        raise SearchReplaceError(f"Block {i}: empty search text")
+
+    if not document.replace(search, replace):
+        failed_blocks.append((i, search, replace))
+
+
+HEAD_RE = re.compile(r"<{5,9}( SEARCH)?$")
+DIVIDER_RE = re.compile(r"={5,9}")
+TAIL_RE = re.compile(r">{5,9}( REPLACE)?")
+
+
+class SearchReplaceStream(IncrementalParser):
+    """Applies search/replace blocks while the response streams in.
+
+    An empty SEARCH section can never apply, so it aborts the stream immediately.
+    """
+
+    marker = "<<<<<<< SEARCH"
+
+    def __init__(self, original: str):
+        super().__init__()
+        self.original = original
+        self._reset()
+
+    def _reset(self) -> None:
+        self.document = IndexedDocument(self.original)
+        self.blocks: list[tuple[str, str]] = []
+        self.failed_blocks: list[tuple[int, str, str]] = []
+        self._search: list[str] | None = None
+        self._replace: list[str] | None = None
+
+    def _feed_line(self, line: str) -> None:
+        if self._replace is not None:
+            if TAIL_RE.match(line):
+                self._close_block()
+            else:
+                self._replace.append(line)
+        elif self._search is not None:
+            if DIVIDER_RE.fullmatch(line):
+                self._replace = []
+            else:
+                self._search.append(line)
+        elif HEAD_RE.search(line):
+            self.mark_started()
+            self._search = []
+
+    def _close_block(self) -> None:
+        search, replace = clean_search_replace_block(
+            "\n".join(self._search or []), "\n".join(self._replace or [])
+        )
+        self._search = self._replace = None
+        self.blocks.append((search, replace))
+        try:
+            _apply_block(self.document, len(self.blocks), search, replace, self.failed_blocks)
+        except SearchReplaceError as e:
+            raise StreamAborted(f"Stream aborted: {e}") from None
+
+    def resolve(self, blocks_text: str) -> tuple[str, list[tuple[int, str, str]]]:
+        """Return the streamed result if it matches a full parse of the final text.
+
+        Falls back to apply_search_replace on the full text when nothing was
+        streamed (e.g. cached or non-streaming calls) or the parses disagree.
+        """
+        self.finish()
+        if self.fed and self.blocks and self.blocks == parse_blocks(blocks_text):
+            return self.document.text, self.failed_blocks
+        return apply_search_replace(self.original, blocks_text)
 
 
 def format_failed_blocks(failed: list[tuple[int, str, str]]) -> str:
@@ -89,11 +164,17 @@ class SearchReplaceAlgorithm(Algorithm):
         system_prompt = pm.get("system.jinja2")
         user_prompt = pm.get("user.jinja2", initial=initial, changes=changes)
 
-        # Pass 1: Initial LLM call
-        blocks_text, usage = await call_llm(model, user_prompt, system_prompt)
+        # Pass 1: Initial LLM call (blocks are applied as they stream in, if streaming)
+        stream = SearchReplaceStream(initial)
+        try:
+            blocks_text, usage = await call_llm(
+                model, user_prompt, system_prompt, stream_handler=stream
+            )
+        except StreamAborted as e:
+            return AlgorithmResult(output=None, success=False, error=str(e), usage=e.usage)
 
         try:
-            result, failed_blocks = apply_search_replace(initial, blocks_text)
+            result, failed_blocks = stream.resolve(blocks_text)
         except SearchReplaceError as e:
             return AlgorithmResult(
                 output=None,
@@ -111,12 +192,14 @@ class SearchReplaceAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed blocks with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=result,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, blocks_text),
+            result,
+            [(f"Block {block_num}", search) for block_num, search, _replace in failed_blocks],
             failed_blocks=format_failed_blocks(failed_blocks),
         )
-        retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         try:
@@ -5,8 +5,10 @@ from __future__ import annotations
 import re
 
 from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -46,6 +48,7 @@ def split_sections(text: str) -> list[tuple[str, int, int, int]]:
     return sections
 
 
+@span("parse")
 def parse_section_blocks(output: str) -> list[tuple[str, str]]:
     """Parse LLM output into (section_name, replacement_text) pairs.
 
@@ -195,6 +198,7 @@ def apply_single_replacement(doc: str, section_name: str, replacement_text: str)
     return "\n".join(lines)
 
 
+@span("apply")
 def apply_section_replacements(initial: str, replacements: list[tuple[str, str]]) -> str:
     """Apply section replacements sequentially, re-parsing after each operation."""
     result = initial
@@ -220,13 +224,10 @@ class SectionRewriteAlgorithm(Algorithm):
             section_replacements = parse_section_blocks(output)
         except SectionRewriteError as e:
             # Pass 2: Retry with parse error context
-            retry_prompt = pm.get(
-                "retry.jinja2",
-                current=initial,
-                changes=changes,
-                parse_error=str(e),
+            retry_messages = retry_request(
+                pm, (user_prompt, output), initial, [], changes=changes, parse_error=str(e)
             )
-            retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+            retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
             usage = usage + retry_usage
 
             try:
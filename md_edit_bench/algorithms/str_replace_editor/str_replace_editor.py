@@ -6,9 +6,11 @@ from typing import Literal
 
 from pydantic import BaseModel
 
-from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.base import Algorithm, AlgorithmCapabilities
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -28,6 +30,13 @@ class StrReplaceError(Exception):
     """Raised when a str_replace command cannot be applied."""
 
 
+@span("parse")
+def parse_commands(raw_json: str) -> list[StrReplaceCommand]:
+    """Validate the LLM's structured output into commands."""
+    return CommandsList.model_validate_json(raw_json).commands
+
+
+@span("apply")
 def apply_str_replace(
     initial: str, commands: list[StrReplaceCommand]
 ) -> tuple[str, list[tuple[int, StrReplaceCommand, str]]]:
@@ -72,6 +81,7 @@ class StrReplaceEditorAlgorithm(Algorithm):
 
     name = "str_replace_editor"
     description = "Exact-match string replace commands in JSON (OpenHands-style)"
+    capabilities = AlgorithmCapabilities(structured_output=True, supports_streaming=False)
 
     async def apply(self, initial: str, changes: str, model: str) -> AlgorithmResult:
         system_prompt = pm.get("system.jinja2")
@@ -83,7 +93,7 @@ class StrReplaceEditorAlgorithm(Algorithm):
         )
 
         try:
-            commands_list = CommandsList.model_validate_json(raw_json)
+            commands = parse_commands(raw_json)
         except StrReplaceError as e:
             return AlgorithmResult(output=None, success=False, error=str(e), usage=usage)
         except Exception as e:
@@ -92,7 +102,7 @@ class StrReplaceEditorAlgorithm(Algorithm):
             )
 
         # Apply commands, collect failures
-        result, failed_commands = apply_str_replace(initial, commands_list.commands)
+        result, failed_commands = apply_str_replace(initial, commands)
 
         if not failed_commands:
             return AlgorithmResult(
@@ -100,18 +110,24 @@ class StrReplaceEditorAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed commands with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=result,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, raw_json),
+            result,
+            [
+                # An ambiguous old_str is in the document as is, so an excerpt wouldn't help
+                (f"Command {num} ({reason})", None if cmd.old_str in result else cmd.old_str)
+                for num, cmd, reason in failed_commands
+            ],
             failed_commands=format_failed_commands(failed_commands),
         )
         retry_json, retry_usage = await call_llm(
-            model, retry_prompt, system_prompt, response_format=CommandsList
+            model, retry_messages, system_prompt, response_format=CommandsList
         )
         usage = usage + retry_usage
 
         try:
-            retry_commands_list = CommandsList.model_validate_json(retry_json)
+            retry_commands = parse_commands(retry_json)
         except Exception:
             # Retry parsing failed - convert all original failures to warnings
             warnings = [f"Command {num}: {reason}" for num, _cmd, reason in failed_commands]
@@ -120,7 +136,7 @@ class StrReplaceEditorAlgorithm(Algorithm):
             )
 
         # Apply retry commands
-        retry_result, retry_failed = apply_str_replace(result, retry_commands_list.commands)
+        retry_result, retry_failed = apply_str_replace(result, retry_commands)
         result = retry_result
 
         # Generate warnings for unrecovered failures
@@ -131,9 +147,9 @@ class StrReplaceEditorAlgorithm(Algorithm):
                 f"{len(retry_failed)} command(s) failed on retry "
                 f"(original failures: {[num for num, _cmd, _reason in failed_commands]})"
             )
-        elif len(retry_commands_list.commands) < len(failed_commands):
+        elif len(retry_commands) < len(failed_commands):
             # Retry provided fewer commands than failures
-            unrecovered = len(failed_commands) - len(retry_commands_list.commands)
+            unrecovered = len(failed_commands) - len(retry_commands)
             warnings.append(
                 f"{unrecovered} command(s) not addressed in retry "
                 f"(original failures: {[num for num, _cmd, _reason in failed_commands]})"
@@ -0,0 +1,75 @@
+"""Incremental parsing of streamed LLM output for block-based edit formats."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+from md_edit_bench.llm import StreamAborted
+
+# Abort if the opening marker of the format hasn't appeared after this much output.
+# Generous enough for a short preamble, small enough to stop a full-document ramble.
+MARKER_DEADLINE_CHARS = 4000
+
+
+class IncrementalParser(ABC):
+    """Splits streamed deltas into complete lines and feeds them to a format parser.
+
+    Subclasses apply each edit block to their evolving document as soon as the block
+    closes, and call `mark_started()` once the format's opening marker is seen.
+    If that doesn't happen within `deadline_chars` characters, the stream is
+    aborted with StreamAborted.
+    """
+
+    marker: str  # Opening marker named in the abort message
+
+    def __init__(self, deadline_chars: int = MARKER_DEADLINE_CHARS):
+        self.deadline_chars = deadline_chars
+        self._buffer = ""
+        self._chars = 0
+        self._started = False
+        self.fed = False
+
+    def reset(self) -> None:
+        """Start over (called before every streamed attempt)."""
+        self._buffer = ""
+        self._chars = 0
+        self._started = False
+        self.fed = False
+        self._reset()
+
+    def feed(self, delta: str) -> None:
+        """Consume a content delta, handling every line it completes."""
+        self.fed = True
+        self._chars += len(delta)
+        self._buffer += delta
+        if "\n" in delta:
+            *lines, self._buffer = self._buffer.split("\n")
+            for line in lines:
+                self._feed_line(line)
+        if not self._started and self._chars > self.deadline_chars:
+            raise StreamAborted(
+                f"Stream aborted: no '{self.marker}' marker in the first "
+                f"{self.deadline_chars} characters"
+            )
+
+    def finish(self) -> None:
+        """Flush the last (unterminated) line once the stream has ended."""
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            self._feed_line(line)
+        self._finish()
+
+    def mark_started(self) -> None:
+        """Record that the format's opening marker has been seen."""
+        self._started = True
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Reset format-specific state and the evolving document."""
+
+    @abstractmethod
+    def _feed_line(self, line: str) -> None:
+        """Handle one complete line (without its trailing newline)."""
+
+    def _finish(self) -> None:  # noqa: B027 - optional hook
+        """Close any block still open at the end of the stream."""
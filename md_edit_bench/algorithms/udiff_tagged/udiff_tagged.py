@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from md_edit_bench.algorithms.aider_utils import replace_most_similar_chunk
+from md_edit_bench.algorithms.aider_utils import IndexedDocument
 from md_edit_bench.algorithms.base import Algorithm
+from md_edit_bench.algorithms.followup import retry_request
 from md_edit_bench.llm import call_llm
 from md_edit_bench.models import AlgorithmResult
+from md_edit_bench.timing import span
 from md_edit_bench.utils import PromptManager
 
 pm = PromptManager(__file__)
@@ -15,6 +17,7 @@ class TaggedUdiffError(Exception):
     """Error parsing or applying tagged unified diff."""
 
 
+@span("parse")
 def parse_tagged_udiff(diff_text: str) -> list[list[tuple[str, str]]]:
     """Parse tagged unified diff into hunks.
 
@@ -173,6 +176,7 @@ def format_failed_hunks(failed: list[tuple[int, str, str]]) -> str:
     return "\n".join(parts)
 
 
+@span("apply")
 def apply_tagged_udiff(
     initial: str, hunks: list[list[tuple[str, str]]]
 ) -> tuple[str, list[tuple[int, str, str]]]:
@@ -181,7 +185,7 @@ def apply_tagged_udiff(
     Returns (result, failed_hunks) tuple where failed_hunks contains
     (hunk_num, before_text, after_text) for hunks that couldn't be applied.
     """
-    content = initial
+    document = IndexedDocument(initial)
     failed_hunks: list[tuple[int, str, str]] = []
 
     for i, hunk in enumerate(hunks, 1):
@@ -193,17 +197,14 @@ def apply_tagged_udiff(
 
         if not before_text.strip():
             # Appending to file (no before text)
-            content = content + after_text
+            document.append(after_text)
             continue
 
         # Try fuzzy matching from aider_utils
-        result = replace_most_similar_chunk(content, before_text, after_text)
-        if result is None:
+        if not document.replace(before_text, after_text):
             failed_hunks.append((i, before_text, after_text))
-        else:
-            content = result
 
-    return content, failed_hunks
+    return document.text, failed_hunks
 
 
 class UdiffTaggedAlgorithm(Algorithm):
@@ -242,12 +243,14 @@ class UdiffTaggedAlgorithm(Algorithm):
             )
 
         # Pass 2: Retry failed hunks with LLM
-        retry_prompt = pm.get(
-            "retry.jinja2",
-            current=content,
+        retry_messages = retry_request(
+            pm,
+            (user_prompt, diff_content),
+            content,
+            [(f"Hunk {hunk_num}", before) for hunk_num, before, _after in failed_hunks],
             failed_hunks=format_failed_hunks(failed_hunks),
         )
-        retry_output, retry_usage = await call_llm(model, retry_prompt, system_prompt)
+        retry_output, retry_usage = await call_llm(model, retry_messages, system_prompt)
         usage = usage + retry_usage
 
         retry_hunks = parse_tagged_udiff(retry_output)
@@ -261,14 +264,13 @@ class UdiffTaggedAlgorithm(Algorithm):
                 warnings.append(f"Hunk {hunk_num}: failed and retry produced no fix")
         else:
             # Apply retry hunks, track failures
+            document = IndexedDocument(content)
             retry_failed_count = 0
             for hunk in retry_hunks:
                 before_text, after_text = hunk_to_before_after(hunk)
-                new_result = replace_most_similar_chunk(content, before_text, after_text)
-                if new_result is None:
+                if not document.replace(before_text, after_text):
                     retry_failed_count += 1
-                else:
-                    content = new_result
+            content = document.text
 
             # If retry returned fewer hunks than failures, or some retry hunks failed,
             # report the unrecovered count as warnings
@@ -0,0 +1,828 @@
+"""Offline microbenchmarks for the parse+apply step of each algorithm.
+
+`run_single` times the LLM round-trip and the edit application together. This
+module times only the pure-Python part: each algorithm's parser and applier run in
+a tight loop on a captured response, with no network access.
+
+Responses come from two sources:
+- recorded: `llm_response.txt` / `llm_1_response.txt` files that `save_results`
+  wrote under `results/`, paired with their fixture's initial document
+- synthesized: a response in each algorithm's edit format, derived from the
+  fixture's initial/final pair with difflib (deterministic, so it's the source
+  to use for regression gating)
+
+Timings are taken with the garbage collector disabled after a warmup, and are
+compared against a saved baseline after scaling by a calibration workload, so a
+baseline recorded on one machine can gate runs on another.
+"""
+
+from __future__ import annotations
+
+import difflib
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, ValidationError
+from rich.console import Console
+from rich.table import Table
+
+from md_edit_bench import config
+from md_edit_bench.algorithms.aider_diff_fenced.aider_diff_fenced import (
+    apply_diff_fenced_blocks,
+    parse_diff_fenced_blocks,
+)
+from md_edit_bench.algorithms.aider_editblock.aider_editblock import apply_editblocks
+from md_edit_bench.algorithms.aider_patch.aider_patch import apply_patch
+from md_edit_bench.algorithms.aider_udiff.aider_udiff import apply_edits, find_diffs
+from md_edit_bench.algorithms.codex_patch.codex_patch import apply_codex_patch
+from md_edit_bench.algorithms.full_rewrite.full_rewrite import clean_rewrite_output
+from md_edit_bench.algorithms.git_diff.git_diff import parse_and_apply_diff
+from md_edit_bench.algorithms.json_ops.json_ops import (
+    OperationsList,
+    OperationTarget,
+    ReplaceOperation,
+    apply_ops,
+    parse_operations,
+)
+from md_edit_bench.algorithms.json_ops.json_ops import split_sections as split_op_sections
+from md_edit_bench.algorithms.partial_rewrite.partial_rewrite import (
+    ELLIPSIS,
+    expand_document,
+    find_first,
+    normalize_unicode,
+)
+from md_edit_bench.algorithms.search_replace.search_replace import apply_search_replace
+from md_edit_bench.algorithms.section_rewrite.section_rewrite import (
+    apply_section_replacements,
+    parse_section_blocks,
+)
+from md_edit_bench.algorithms.section_rewrite.section_rewrite import (
+    split_sections as split_rewrite_sections,
+)
+from md_edit_bench.algorithms.str_replace_editor.str_replace_editor import (
+    CommandsList,
+    StrReplaceCommand,
+    apply_str_replace,
+    parse_commands,
+)
+from md_edit_bench.algorithms.udiff_tagged.udiff_tagged import (
+    apply_tagged_udiff,
+    parse_tagged_udiff,
+)
+from md_edit_bench.fixtures import discover_fixtures
+from md_edit_bench.scoring import DiffScorer
+
+Source = Literal["recorded", "synthesized"]
+
+# Fixture size buckets (upper bound in lines, exclusive)
+SIZE_BUCKETS = [(150, "small"), (1000, "medium")]
+LARGEST_BUCKET = "large"
+
+FILENAME = "document.md"
+
+console = Console()
+
+
+def _apply_aider_diff_fenced(initial: str, response: str) -> str:
+    return apply_diff_fenced_blocks(initial, parse_diff_fenced_blocks(response))[0]
+
+
+def _apply_aider_editblock(initial: str, response: str) -> str:
+    return apply_editblocks(initial, response)[0]
+
+
+def _apply_aider_patch(initial: str, response: str) -> str:
+    return apply_patch(initial, response)[0]
+
+
+def _apply_aider_udiff(initial: str, response: str) -> str:
+    return apply_edits(initial, find_diffs(response))[0]
+
+
+def _apply_codex_patch(initial: str, response: str) -> str:
+    return apply_codex_patch(initial, response)[0]
+
+
+def _apply_full_rewrite(_initial: str, response: str) -> str:
+    return clean_rewrite_output(response)
+
+
+def _apply_git_diff(initial: str, response: str) -> str:
+    return parse_and_apply_diff(initial, response)[0]
+
+
+def _apply_json_ops(initial: str, response: str) -> str:
+    return apply_ops(initial, parse_operations(response))[0]
+
+
+def _apply_partial_rewrite(initial: str, response: str) -> str:
+    return expand_document(initial, normalize_unicode(response))[0]
+
+
+def _apply_search_replace(initial: str, response: str) -> str:
+    return apply_search_replace(initial, response)[0]
+
+
+def _apply_section_rewrite(initial: str, response: str) -> str:
+    return apply_section_replacements(initial, parse_section_blocks(response))
+
+
+def _apply_str_replace_editor(initial: str, response: str) -> str:
+    return apply_str_replace(initial, parse_commands(response))[0]
+
+
+def _apply_udiff_tagged(initial: str, response: str) -> str:
+    return apply_tagged_udiff(initial, parse_tagged_udiff(response))[0]
+
+
+# Mirrors the first pass of each algorithm's apply(); morph is left out (its merge is an API call)
+APPLIERS: dict[str, Callable[[str, str], str]] = {
+    "aider_diff_fenced": _apply_aider_diff_fenced,
+    "aider_editblock": _apply_aider_editblock,
+    "aider_patch": _apply_aider_patch,
+    "aider_udiff": _apply_aider_udiff,
+    "codex_patch": _apply_codex_patch,
+    "full_rewrite": _apply_full_rewrite,
+    "git_diff": _apply_git_diff,
+    "json_ops": _apply_json_ops,
+    "partial_rewrite": _apply_partial_rewrite,
+    "search_replace": _apply_search_replace,
+    "section_rewrite": _apply_section_rewrite,
+    "str_replace_editor": _apply_str_replace_editor,
+    "udiff_tagged": _apply_udiff_tagged,
+}
+
+
+@dataclass
+class Hunk:
+    """A changed region between two documents, as diff lines with their line endings."""
+
+    start: int  # First line of the hunk in the initial document
+    new_start: int  # First line of the hunk in the final document
+    lines: list[tuple[str, str]]  # (op, line) with op " " (context), "-" or "+"
+
+    @property
+    def before(self) -> list[str]:
+        """Lines of the initial document covered by the hunk."""
+        return [line for op, line in self.lines if op != "+"]
+
+    @property
+    def after(self) -> list[str]:
+        """Lines of the final document covered by the hunk."""
+        return [line for op, line in self.lines if op != "-"]
+
+
+def diff_hunks(initial: str, final: str, context: int = 3) -> list[Hunk]:
+    """Diff two documents line by line into hunks with `context` lines around each change."""
+    a = initial.splitlines(keepends=True)
+    b = final.splitlines(keepends=True)
+    hunks: list[Hunk] = []
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    for group in matcher.get_grouped_opcodes(context):
+        lines: list[tuple[str, str]] = []
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines += [(" ", line) for line in a[i1:i2]]
+                continue
+            lines += [("-", line) for line in a[i1:i2]]
+            lines += [("+", line) for line in b[j1:j2]]
+        hunks.append(Hunk(start=group[0][1], new_start=group[0][3], lines=lines))
+    return hunks
+
+
+def _text(lines: list[str]) -> str:
+    """Join lines, terminating the last one so format markers start on their own line."""
+    text = "".join(lines)
+    return text if text.endswith("\n") or not text else text + "\n"
+
+
+def _line(line: str) -> str:
+    return line if line.endswith("\n") else line + "\n"
+
+
+def _widen_until_unique(initial: str, hunk: Hunk) -> Hunk:
+    """Add context lines around a hunk until its before text occurs once in `initial`."""
+    a = initial.splitlines(keepends=True)
+    start, end = hunk.start, hunk.start + len(hunk.before)
+    lines = hunk.lines
+    while initial.count("".join(line for op, line in lines if op != "+")) > 1:
+        if start == 0 and end == len(a):
+            break
+        if start > 0:
+            start -= 1
+            lines = [(" ", a[start]), *lines]
+        if end < len(a):
+            lines = [*lines, (" ", a[end])]
+            end += 1
+    return Hunk(start=start, new_start=hunk.new_start, lines=lines)
+
+
+def _search_replace_blocks(hunks: list[Hunk]) -> str:
+    return "\n".join(
+        f"<<<<<<< SEARCH\n{_text(h.before)}=======\n{_text(h.after)}>>>>>>> REPLACE\n"
+        for h in hunks
+    )
+
+
+def _unified(hunks: list[Hunk]) -> str:
+    out = [f"--- a/{FILENAME}\n", f"+++ b/{FILENAME}\n"]
+    for h in hunks:
+        out.append(f"@@ -{h.start + 1},{len(h.before)} +{h.new_start + 1},{len(h.after)} @@\n")
+        out += [op + _line(line) for op, line in h.lines]
+    return "".join(out)
+
+
+def synthesize_blocks(initial: str, final: str) -> str:
+    """SEARCH/REPLACE blocks (search_replace, aider_editblock)."""
+    return _search_replace_blocks(diff_hunks(initial, final))
+
+
+def synthesize_diff_fenced(initial: str, final: str) -> str:
+    """SEARCH/REPLACE blocks, each in a fence that starts with the filename."""
+    return "\n".join(
+        f"```markdown\n{FILENAME}\n{_search_replace_blocks([h])}```\n"
+        for h in diff_hunks(initial, final)
+    )
+
+
+def synthesize_unified(initial: str, final: str) -> str:
+    """A plain unified diff (git_diff)."""
+    return _unified(diff_hunks(initial, final))
+
+
+def synthesize_fenced_unified(initial: str, final: str) -> str:
+    """A unified diff in a ```diff fence (aider_udiff)."""
+    return f"```diff\n{_unified(diff_hunks(initial, final))}```\n"
+
+
+def synthesize_tagged(initial: str, final: str) -> str:
+    """[CTX]/[DEL]/[ADD] tagged hunks separated by bare @@ lines (udiff_tagged)."""
+    tags = {" ": "[CTX]", "-": "[DEL]", "+": "[ADD]"}
+    out = ["```diff\n"]
+    for h in diff_hunks(initial, final):
+        out.append("@@\n")
+        out += [f"{tags[op]} {_line(line)}" for op, line in h.lines]
+    out.append("@@\n```\n")
+    return "".join(out)
+
+
+def synthesize_v4a(initial: str, final: str) -> str:
+    """A V4A patch with bare @@ sections (aider_patch)."""
+    out = ["*** Begin Patch\n", f"*** Update File: {FILENAME}\n"]
+    for h in diff_hunks(initial, final):
+        out.append("@@\n")
+        out += [op + _line(line) for op, line in h.lines]
+    out.append("*** End Patch\n")
+    return "".join(out)
+
+
+def synthesize_codex(initial: str, final: str) -> str:
+    """A Codex patch; context is repeated as -/+ lines since the parser groups lines by type."""
+    out = ["*** Begin Patch\n", f"*** Update File: {FILENAME}\n"]
+    for h in diff_hunks(initial, final):
+        out.append(f"@@ -{h.start + 1},{len(h.before)} +{h.new_start + 1},{len(h.after)} @@\n")
+        out += ["-" + _line(line) for line in h.before]
+        out += ["+" + _line(line) for line in h.after]
+    out.append("*** End Patch\n")
+    return "".join(out)
+
+
+def synthesize_str_replace(initial: str, final: str) -> str:
+    """str_replace commands whose old_str is unique in the initial document."""
+    hunks = [_widen_until_unique(initial, h) for h in diff_hunks(initial, final)]
+    commands = [
+        StrReplaceCommand(
+            command="str_replace", old_str="".join(h.before), new_str="".join(h.after)
+        )
+        for h in hunks
+    ]
+    return CommandsList(commands=commands).model_dump_json()
+
+
+def synthesize_json_ops(initial: str, final: str) -> str:
+    """Replace operations targeting the innermost section that contains each hunk."""
+    sections = split_op_sections(initial.splitlines(keepends=True))
+    operations: list[ReplaceOperation] = []
+    for h in diff_hunks(initial, final, context=1):
+        end = h.start + len(h.before)
+        containing = [s for s in sections if s[2] <= h.start and end <= s[3]]
+        if not containing:
+            continue
+        heading = max(containing, key=lambda s: s[2])[0]
+        operations.append(
+            ReplaceOperation(
+                op="replace",
+                target=OperationTarget(section=heading, match="".join(h.before)),
+                replacement="".join(h.after),
+            )
+        )
+    return OperationsList(operations=list(operations)).model_dump_json()
+
+
+def synthesize_sections(initial: str, final: str) -> str:
+    """SECTION blocks rewriting the outermost sections that contain changes."""
+    a = initial.split("\n")
+    b = final.split("\n")
+    opcodes = difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+
+    def to_final(i: int) -> int:
+        for tag, i1, i2, j1, _j2 in opcodes:
+            if i1 <= i < i2:
+                return j1 + (i - i1) if tag == "equal" else j1
+        return len(b)
+
+    sections = split_rewrite_sections(initial)
+    changed: list[tuple[str, int, int, int]] = []
+    for tag, i1, i2, _j1, _j2 in opcodes:
+        if tag == "equal":
+            continue
+        containing = [
+            s for s in sections if s[2] <= i1 and i2 <= s[3] and (i1 < s[3] or s[3] == len(a))
+        ]
+        if containing:
+            outermost = min(containing, key=lambda s: s[1])
+            if outermost not in changed:
+                changed.append(outermost)
+
+    blocks: list[str] = []
+    for heading, _level, start, end in changed:
+        replacement = "\n".join(b[to_final(start) : to_final(end)])
+        blocks.append(f"### SECTION: {heading}\n{replacement}\n### END SECTION\n")
+    return "\n".join(blocks)
+
+
+def synthesize_partial_rewrite(initial: str, final: str, min_elided: int = 3) -> str:
+    """The final document with long unchanged runs elided between unique anchor lines."""
+    a = initial.split("\n")
+    b = final.split("\n")
+    out: list[str] = []
+    search_start = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag != "equal":
+            out += b[j1:j2]
+            continue
+        # expand_document resolves anchors by first occurrence, so only use lines that resolve
+        # to this run: `first` from where the last elision ended, `last` from just after `first`
+        first = next(
+            (p for p in range(i1, i2) if a[p].strip() and find_first(a, a[p], search_start) == p),
+            None,
+        )
+        last = None
+        if first is not None:
+            last = next(
+                (
+                    q
+                    for q in range(i2 - 1, first, -1)
+                    if a[q].strip() and find_first(a, a[q], first + 1) == q
+                ),
+                None,
+            )
+        if first is None or last is None or last - first - 1 < min_elided:
+            out += a[i1:i2]
+            continue
+        out += [*a[i1 : first + 1], ELLIPSIS, *a[last:i2]]
+        search_start = last + 1
+    return "\n".join(out)
+
+
+def synthesize_full_rewrite(_initial: str, final: str) -> str:
+    """The final document wrapped in <document> tags."""
+    return f"<document>\n{final}\n</document>"
+
+
+# Responses in each algorithm's edit format that reproduce a fixture's final document
+SYNTHESIZERS: dict[str, Callable[[str, str], str]] = {
+    "aider_diff_fenced": synthesize_diff_fenced,
+    "aider_editblock": synthesize_blocks,
+    "aider_patch": synthesize_v4a,
+    "aider_udiff": synthesize_fenced_unified,
+    "codex_patch": synthesize_codex,
+    "full_rewrite": synthesize_full_rewrite,
+    "git_diff": synthesize_unified,
+    "json_ops": synthesize_json_ops,
+    "partial_rewrite": synthesize_partial_rewrite,
+    "search_replace": synthesize_blocks,
+    "section_rewrite": synthesize_sections,
+    "str_replace_editor": synthesize_str_replace,
+    "udiff_tagged": synthesize_tagged,
+}
+
+
+@dataclass
+class BenchCase:
+    """One applier run on one response."""
+
+    algorithm: str
+    fixture: str  # e.g. "simple/basic_report"
+    source: Source
+    label: str  # Model name for recorded responses, "synthesized" otherwise
+    initial: str
+    response: str
+    expected: str
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to match results against a baseline."""
+        return f"{self.algorithm}:{self.fixture}:{self.label}"
+
+    @property
+    def lines(self) -> int:
+        """Length of the initial document in lines."""
+        return len(self.initial.splitlines())
+
+    @property
+    def size(self) -> str:
+        """Fixture size bucket."""
+        return size_bucket(self.lines)
+
+
+def size_bucket(lines: int) -> str:
+    """Name the size bucket a document of `lines` lines falls in."""
+    for limit, name in SIZE_BUCKETS:
+        if lines < limit:
+            return name
+    return LARGEST_BUCKET
+
+
+def _recorded_response(model_dir: Path) -> str | None:
+    """First-pass response saved for a result (single- or multi-call naming)."""
+    for name in ("llm_response.txt", "llm_1_response.txt"):
+        path = model_dir / name
+        if path.exists():
+            return path.read_text(encoding="utf-8")
+    return None
+
+
+def collect_cases(
+    algorithms: list[str],
+    sources: list[Source],
+    category: str | None,
+    results_dir: Path,
+) -> list[BenchCase]:
+    """Build bench cases for the selected algorithms from fixtures and saved results."""
+    fixtures = discover_fixtures(config.FIXTURES_DIR, category)
+
+    cases: list[BenchCase] = []
+    for fixture in fixtures:
+        for algorithm in algorithms:
+            if "synthesized" in sources:
+                response = SYNTHESIZERS[algorithm](fixture.initial, fixture.expected)
+                cases.append(
+                    BenchCase(
+                        algorithm=algorithm,
+                        fixture=fixture.name,
+                        source="synthesized",
+                        label="synthesized",
+                        initial=fixture.initial,
+                        response=response,
+                        expected=fixture.expected,
+                    )
+                )
+            if "recorded" not in sources:
+                continue
+            algorithm_dir = results_dir / fixture.name / algorithm
+            if not algorithm_dir.is_dir():
+                continue
+            for model_dir in sorted(p for p in algorithm_dir.iterdir() if p.is_dir()):
+                response = _recorded_response(model_dir)
+                if response is None:
+                    continue
+                cases.append(
+                    BenchCase(
+                        algorithm=algorithm,
+                        fixture=fixture.name,
+                        source="recorded",
+                        label=model_dir.name,
+                        initial=fixture.initial,
+                        response=response,
+                        expected=fixture.expected,
+                    )
+                )
+    return cases
+
+
+@dataclass
+class BenchResult:
+    """Timing, allocation and correctness of one bench case."""
+
+    key: str
+    algorithm: str
+    fixture: str
+    label: str
+    lines: int
+    runs: int = 0
+    p50_ns: int = 0
+    p99_ns: int = 0
+    peak_bytes: int = 0
+    matched: bool = False
+    error: str | None = None
+
+    @property
+    def ops_per_sec(self) -> float:
+        """Applications per second at the median latency."""
+        return 1e9 / self.p50_ns if self.p50_ns else 0.0
+
+    @property
+    def size(self) -> str:
+        """Fixture size bucket."""
+        return size_bucket(self.lines)
+
+
+def percentile(samples: list[int], pct: float) -> int:
+    """Nearest-rank percentile of `samples`."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_calls(
+    fn: Callable[[], object], *, min_time: float, min_runs: int, warmup: int
+) -> list[int]:
+    """Time repeated calls of `fn` in nanoseconds.
+
+    Runs `warmup` untimed calls first, then times calls with the garbage collector
+    disabled (so collections triggered by earlier cases don't land in the samples)
+    until both `min_runs` calls and `min_time` seconds have elapsed.
+    """
+    for _ in range(warmup):
+        fn()
+
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        samples: list[int] = []
+        deadline = time.perf_counter_ns() + int(min_time * 1e9)
+        while len(samples) < min_runs or time.perf_counter_ns() < deadline:
+            start = time.perf_counter_ns()
+            fn()
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples
+
+
+def peak_allocation(fn: Callable[[], object]) -> int:
+    """Peak bytes allocated (tracemalloc) during one call of `fn`."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+CALIBRATION_TEXT = "".join(f"Line {i}: some *markdown* text with `code`\n" for i in range(2000))
+
+
+def calibration_workload() -> None:
+    """Fixed string-processing work whose timing tracks how fast this machine is right now."""
+    lines = CALIBRATION_TEXT.splitlines(keepends=True)
+    index: dict[str, int] = {}
+    for i, line in enumerate(lines):
+        index.setdefault(line.strip(), i)
+    _ = "".join(reversed(lines)).replace("markdown", "md")
+
+
+def run_case(case: BenchCase, *, min_time: float, min_runs: int, warmup: int) -> BenchResult:
+    """Measure one case; applier exceptions are recorded instead of raised."""
+    apply = APPLIERS[case.algorithm]
+    result = BenchResult(
+        key=case.key,
+        algorithm=case.algorithm,
+        fixture=case.fixture,
+        label=case.label,
+        lines=case.lines,
+    )
+
+    def call() -> str:
+        return apply(case.initial, case.response)
+
+    try:
+        output = call()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    scorer = DiffScorer()
+    result.matched = scorer.normalize(output) == scorer.normalize(case.expected)
+    samples = time_calls(call, min_time=min_time, min_runs=min_runs, warmup=warmup)
+    result.runs = len(samples)
+    result.p50_ns = percentile(samples, 50)
+    result.p99_ns = percentile(samples, 99)
+    result.peak_bytes = peak_allocation(call)
+    return result
+
+
+@dataclass
+class Regression:
+    """An algorithm whose cases got slower than the baseline beyond the allowed threshold."""
+
+    algorithm: str
+    cases: int  # Cases compared with the baseline
+    ratio: float  # Geometric mean of current over (scaled) baseline p50
+    worst_case: str
+    worst_ratio: float
+
+
+class Baseline(BaseModel):
+    """Saved bench results (JSON) that later runs are compared against."""
+
+    calibration_ns: int
+    cases: dict[str, BenchResult]
+
+    @classmethod
+    def from_results(cls, results: list[BenchResult], calibration_ns: int) -> Baseline:
+        """Build a baseline from the cases that ran without errors."""
+        return cls(
+            calibration_ns=calibration_ns,
+            cases={r.key: r for r in results if r.error is None},
+        )
+
+
+def find_regressions(
+    baseline: Baseline,
+    results: list[BenchResult],
+    calibration_ns: int,
+    max_regression: float,
+) -> list[Regression]:
+    """Compare p50 latencies with a baseline, per algorithm.
+
+    Baseline latencies are scaled by the ratio of calibration times. Single cases
+    are too noisy to gate on, so an algorithm regresses when the geometric mean of
+    its current/baseline ratios exceeds 1 + `max_regression`. Cases missing from
+    either side are ignored.
+    """
+    scale = calibration_ns / baseline.calibration_ns if baseline.calibration_ns > 0 else 1.0
+
+    ratios: dict[str, dict[str, float]] = {}
+    for result in results:
+        previous = baseline.cases.get(result.key)
+        if result.error is not None or previous is None or previous.p50_ns <= 0:
+            continue
+        ratios.setdefault(result.algorithm, {})[result.key] = result.p50_ns / (
+            previous.p50_ns * scale
+        )
+
+    regressions: list[Regression] = []
+    for algorithm, by_case in sorted(ratios.items()):
+        ratio = statistics.geometric_mean(by_case.values())
+        if ratio > 1 + max_regression:
+            worst_case = max(by_case, key=lambda key: by_case[key])
+            regressions.append(
+                Regression(algorithm, len(by_case), ratio, worst_case, by_case[worst_case])
+            )
+    return regressions
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f}ms"
+    return f"{ns / 1e3:.1f}µs"
+
+
+def print_results(results: list[BenchResult]) -> None:
+    """Print per-case and per-algorithm/size tables."""
+    table = Table(title="Applier Benchmark")
+    table.add_column("Algorithm", style="cyan")
+    table.add_column("Fixture")
+    table.add_column("Source", style="dim")
+    table.add_column("Lines", justify="right")
+    table.add_column("Runs", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("ops/s", justify="right")
+    table.add_column("Peak", justify="right")
+    table.add_column("Match", justify="center")
+
+    for r in sorted(results, key=lambda x: (x.algorithm, x.lines, x.fixture, x.label)):
+        if r.error is not None:
+            dashes = ["-"] * 5
+            table.add_row(
+                r.algorithm, r.fixture, r.label, str(r.lines), *dashes, f"[red]{r.error[:40]}[/red]"
+            )
+            continue
+        table.add_row(
+            r.algorithm,
+            r.fixture,
+            r.label,
+            str(r.lines),
+            str(r.runs),
+            _format_ns(r.p50_ns),
+            _format_ns(r.p99_ns),
+            f"{r.ops_per_sec:,.0f}",
+            f"{r.peak_bytes / 1024:.0f}KB",
+            "[green]✓[/green]" if r.matched else "[yellow]✗[/yellow]",
+        )
+    console.print(table)
+
+    summary = Table(title="By Algorithm and Fixture Size")
+    summary.add_column("Algorithm", style="cyan")
+    summary.add_column("Size")
+    summary.add_column("Cases", justify="right")
+    summary.add_column("Median p50", justify="right")
+    summary.add_column("Worst p99", justify="right")
+    summary.add_column("Max Peak", justify="right")
+    summary.add_column("Matched", justify="right")
+
+    sizes = [name for _, name in SIZE_BUCKETS] + [LARGEST_BUCKET]
+    groups: dict[tuple[str, str], list[BenchResult]] = {}
+    for r in results:
+        if r.error is None:
+            groups.setdefault((r.algorithm, r.size), []).append(r)
+    for (algorithm, size), group in sorted(
+        groups.items(), key=lambda g: (g[0][0], sizes.index(g[0][1]))
+    ):
+        summary.add_row(
+            algorithm,
+            size,
+            str(len(group)),
+            _format_ns(statistics.median(r.p50_ns for r in group)),
+            _format_ns(max(r.p99_ns for r in group)),
+            f"{max(r.peak_bytes for r in group) / 1024:.0f}KB",
+            f"{sum(r.matched for r in group)}/{len(group)}",
+        )
+    console.print(summary)
+
+
+def run_bench_appliers(
+    *,
+    algorithms: list[str] | None,
+    category: str | None,
+    source: Source | Literal["all"],
+    results_dir: Path,
+    min_time: float,
+    min_runs: int,
+    warmup: int,
+    save: Path | None,
+    baseline: Path | None,
+    max_regression: float,
+) -> int:
+    """Run the applier benchmark and return the process exit code.
+
+    Returns 1 if any algorithm regressed against `baseline` by more than `max_regression`.
+    """
+    selected = algorithms or list(APPLIERS)
+    sources: list[Source] = ["recorded", "synthesized"] if source == "all" else [source]
+    cases = collect_cases(selected, sources, category, results_dir)
+    if not cases:
+        console.print("[yellow]No bench cases found[/yellow]")
+        return 0
+
+    console.print(f"[bold]Applier benchmark[/bold]: {len(cases)} cases ({', '.join(sources)})")
+    # Calibration runs are interleaved with the cases so they see the same machine load
+    calibration: list[int] = []
+    results: list[BenchResult] = []
+    for case in cases:
+        calibration += time_calls(calibration_workload, min_time=0, min_runs=3, warmup=1)
+        results.append(run_case(case, min_time=min_time, min_runs=min_runs, warmup=warmup))
+    calibration_ns = int(statistics.median(calibration))
+
+    print_results(results)
+    console.print(f"[dim]Calibration workload: {_format_ns(calibration_ns)}[/dim]")
+
+    if save:
+        save.parent.mkdir(parents=True, exist_ok=True)
+        data = Baseline.from_results(results, calibration_ns).model_dump_json(indent=2)
+        save.write_text(data, encoding="utf-8")
+        console.print(f"\n[dim]Saved results to {save}[/dim]")
+
+    if baseline is None:
+        return 0
+    try:
+        previous = Baseline.model_validate_json(baseline.read_text(encoding="utf-8"))
+    except (OSError, ValidationError) as e:
+        console.print(f"[red]Invalid baseline {baseline}: {e}[/red]")
+        return 1
+    regressions = find_regressions(previous, results, calibration_ns, max_regression)
+    if not regressions:
+        console.print(
+            f"\n[green]No regressions beyond {max_regression:.0%} against {baseline}[/green]"
+        )
+        return 0
+
+    table = Table(title=f"Regressions (> {max_regression:.0%} slower than {baseline})")
+    table.add_column("Algorithm", style="cyan")
+    table.add_column("Cases", justify="right")
+    table.add_column("Change", justify="right", style="red")
+    table.add_column("Worst Case")
+    table.add_column("Worst Change", justify="right")
+    for regression in sorted(regressions, key=lambda r: -r.ratio):
+        table.add_row(
+            regression.algorithm,
+            str(regression.cases),
+            f"+{regression.ratio - 1:.0%}",
+            regression.worst_case,
+            f"{regression.worst_ratio - 1:+.0%}",
+        )
+    console.print(table)
+    return 1
@@ -0,0 +1,186 @@
+"""Content-addressed on-disk cache for LLM responses (record/replay)."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, ValidationError
+
+from md_edit_bench import config
+from md_edit_bench.models import LLMCall, LLMUsage
+
+# off:     never read or write the cache
+# record:  always call the provider and (re)write every response
+# replay:  serve hits from the cache, call the provider and record on miss
+# offline: serve hits from the cache, fail on miss (no network)
+CacheMode = Literal["off", "record", "replay", "offline"]
+CACHE_MODES: list[CacheMode] = ["off", "record", "replay", "offline"]
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a request has no cached response."""
+
+
+@dataclass
+class CacheStats:
+    """Counters for cache activity during a run."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class CachedResponse(BaseModel):
+    """Everything needed to rebuild the (content, LLMUsage) pair returned by call_llm."""
+
+    model: str
+    request: str
+    content: str
+    tokens_in: int = 0
+    tokens_out: int = 0
+    tokens_cached: int = 0
+    cost_usd: float = 0.0
+
+    def to_usage(self) -> LLMUsage:
+        """Reconstruct the usage record exactly as the original call produced it."""
+        return LLMUsage(
+            tokens_in=self.tokens_in,
+            tokens_out=self.tokens_out,
+            tokens_cached=self.tokens_cached,
+            cost_usd=self.cost_usd,
+            calls=[LLMCall(model=self.model, request=self.request, response=self.content)],
+        )
+
+
+def make_cache_key(
+    model: str,
+    messages: list[dict[str, object]],
+    response_schema: dict[str, object] | None,
+    max_tokens: int,
+) -> str:
+    """Hash every input that can change the completion into a stable hex key."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "response_format": response_schema,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Content-addressed response store with size-based LRU eviction.
+
+    Entries live at ``{directory}/{key[:2]}/{key}.json``. A hit refreshes the
+    entry's mtime, so eviction (oldest mtime first) approximates LRU.
+    """
+
+    def __init__(self, directory: Path, mode: CacheMode = "off", max_bytes: int = 0):
+        """Initialize the cache.
+
+        Args:
+            directory: Root directory of the on-disk store.
+            mode: One of CACHE_MODES.
+            max_bytes: Evict least recently used entries above this size (0 = unbounded).
+        """
+        self.directory = directory
+        self.mode: CacheMode = mode
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._total_bytes: int | None = None
+
+    @property
+    def reads(self) -> bool:
+        """Whether lookups are served from the cache."""
+        return self.mode in ("replay", "offline")
+
+    @property
+    def writes(self) -> bool:
+        """Whether fresh responses are written to the cache."""
+        return self.mode in ("record", "replay")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Look up a response, counting the hit or miss."""
+        path = self._path(key)
+        try:
+            entry = CachedResponse.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValidationError):
+            self.stats.misses += 1
+            return None
+
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        self.stats.hits += 1
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Store a response atomically, then evict if the store is over budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        old_size = path.stat().st_size if path.exists() else 0
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(entry.model_dump_json(), encoding="utf-8")
+        tmp_path.replace(path)
+        self.stats.writes += 1
+
+        if self._total_bytes is not None:
+            self._total_bytes += path.stat().st_size - old_size
+        self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries: list[tuple[float, int, Path]] = []
+        if not self.directory.exists():
+            return entries
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the store fits in max_bytes."""
+        if not self.max_bytes:
+            return
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _mtime, size, _path in self._entries())
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        for _mtime, size, path in sorted(self._entries()):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.stats.evictions += 1
+
+
+@lru_cache
+def get_cache() -> LLMCache:
+    """Get the process-wide cache (disabled until configured from the CLI)."""
+    settings = config.get_settings()
+    return LLMCache(
+        settings.cache_dir,
+        mode="off",
+        max_bytes=settings.md_edit_bench_cache_max_mb * 1024 * 1024,
+    )
@@ -0,0 +1,131 @@
+"""Process-wide pooled AsyncOpenAI clients (one connection pool per base URL)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from md_edit_bench import config
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+
+@dataclass
+class PoolStats:
+    """Connection reuse counters for one base URL."""
+
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+
+    @property
+    def handshakes_avoided(self) -> int:
+        """Requests that reused an already-open connection instead of connecting."""
+        return max(0, self.requests - self.connections_opened)
+
+
+class _PooledClient:
+    """An AsyncOpenAI client bound to its own httpx transport, with reuse tracking."""
+
+    def __init__(self, base_url: str, api_key: str, limits: httpx.Limits, http2: bool):
+        # Deferred until the first request: the client libraries are slow to import
+        import httpx
+        from openai import AsyncOpenAI
+
+        self.stats = PoolStats()
+        self.transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        self.http_client = httpx.AsyncClient(
+            transport=self.transport,
+            event_hooks={"request": [self._on_request]},
+        )
+        # Newer openai releases annotate http_client as httpx2.AsyncClient but accept httpx.
+        # Retries are handled by md_edit_bench.retry, so the SDK's own are disabled.
+        self.openai = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            http_client=self.http_client,  # pyright: ignore[reportArgumentType]
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.stats.requests += 1
+        request.extensions["trace"] = self._on_trace
+
+    async def _on_trace(self, event_name: str, _info: dict[str, object]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.stats.tls_handshakes += 1
+
+
+class ClientPool:
+    """Shares one AsyncOpenAI client (and connection pool) per base URL.
+
+    Every call_llm request - including the Morph merger call, which goes to the
+    same OpenRouter base URL - reuses pooled keep-alive connections instead of
+    paying a fresh TCP/TLS handshake per request.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_connections: Maximum concurrent connections per base URL.
+            max_keepalive_connections: Idle connections kept open per base URL.
+            keepalive_expiry: Seconds an idle connection is kept before closing.
+            http2: Negotiate HTTP/2 (requires the `h2` package).
+        """
+        import httpx
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._clients: dict[str, _PooledClient] = {}
+
+    def get(self, base_url: str, api_key: str) -> AsyncOpenAI:
+        """Get the shared client for a base URL, creating it on first use."""
+        pooled = self._clients.get(base_url)
+        if pooled is None:
+            pooled = _PooledClient(base_url, api_key, self.limits, self.http2)
+            self._clients[base_url] = pooled
+        return pooled.openai
+
+    def stats(self) -> dict[str, PoolStats]:
+        """Get connection stats keyed by host of each base URL."""
+        return {
+            urlsplit(base_url).netloc or base_url: pooled.stats
+            for base_url, pooled in self._clients.items()
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled client and its connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for pooled in clients:
+            await pooled.openai.close()
+            await pooled.http_client.aclose()
+
+
+@lru_cache
+def get_client_pool() -> ClientPool:
+    """Get the process-wide client pool configured from settings."""
+    settings = config.get_settings()
+    return ClientPool(
+        max_connections=settings.md_edit_bench_max_connections,
+        max_keepalive_connections=settings.md_edit_bench_max_keepalive_connections,
+        keepalive_expiry=settings.md_edit_bench_keepalive_expiry,
+        http2=settings.md_edit_bench_http2,
+    )
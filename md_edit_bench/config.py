@@ -4,11 +4,16 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
-from lmnr import Instruments, Laminar
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from md_edit_bench.similarity import SimilarityName
+
+# How algorithms ask the model to fix edits that failed to apply
+RetryMode = Literal["conversation", "fresh"]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -25,6 +30,40 @@ class Settings(BaseSettings):
     # Laminar tracing
     lmnr_project_api_key: str | None = Field(default=None)
 
+    # LLM response cache (record/replay)
+    md_edit_bench_cache_dir: Path | None = Field(default=None)
+    md_edit_bench_cache_max_mb: int = Field(default=1024)
+
+    # Shared HTTP connection pool (per base URL)
+    md_edit_bench_max_connections: int = Field(default=100)
+    md_edit_bench_max_keepalive_connections: int = Field(default=20)
+    md_edit_bench_keepalive_expiry: float = Field(default=30.0)
+    md_edit_bench_http2: bool = Field(default=False)
+
+    # Request scheduler (0 = unlimited)
+    md_edit_bench_max_concurrency: int = Field(default=64)
+
+    # Retries for transient LLM failures (per request, and shared across the run)
+    md_edit_bench_max_retries: int = Field(default=4)
+    md_edit_bench_retry_budget: int = Field(default=200)
+
+    # Stream completions to record time-to-first-token and tokens/sec
+    md_edit_bench_stream: bool = Field(default=False)
+
+    # Mark the system prompt and document as a cacheable prompt prefix for providers
+    # that need explicit cache-control hints (see md_edit_bench.llm)
+    md_edit_bench_prompt_cache: bool = Field(default=True)
+
+    # Retry failed edits by continuing the conversation, or with a standalone prompt
+    # (see md_edit_bench.algorithms.followup)
+    md_edit_bench_retry_mode: RetryMode = Field(default="conversation")
+
+    # Character similarity backend for scoring (see md_edit_bench.similarity)
+    md_edit_bench_similarity: SimilarityName = Field(default="fast")
+
+    # Processes used to score results (unset = one per CPU core, 0 = score inline)
+    md_edit_bench_score_workers: int | None = Field(default=None)
+
     @property
     def fixtures_dir(self) -> Path:
         """Get fixtures directory, defaulting to repo root fixtures/."""
@@ -32,6 +71,13 @@ class Settings(BaseSettings):
             return self.md_edit_bench_fixtures
         return Path(__file__).parent.parent / "fixtures"
 
+    @property
+    def cache_dir(self) -> Path:
+        """Get LLM response cache directory, defaulting to repo root .llm_cache/."""
+        if self.md_edit_bench_cache_dir:
+            return self.md_edit_bench_cache_dir
+        return Path(__file__).parent.parent / ".llm_cache"
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -57,18 +103,3 @@ MORPH_MODEL = "morph/morph-v3-large"
 
 # Categories
 CATEGORIES = ["simple", "medium", "complex", "hard"]
-
-
-def _init_laminar() -> bool:
-    """Initialize Laminar tracing if API key is available."""
-    if not _settings.lmnr_project_api_key:
-        return False
-
-    Laminar.initialize(
-        project_api_key=_settings.lmnr_project_api_key,
-        instruments={Instruments.OPENAI},
-    )
-    return True
-
-
-LAMINAR_ENABLED = _init_laminar()
@@ -0,0 +1,235 @@
+"""Fixture discovery: find fixtures cheaply, read only the ones a run selects.
+
+A fixture is three files in a category directory: {name}.initial.md,
+{name}.changes.md and {name}.final.md, plus an optional {name}.meta.toml:
+
+    tags = ["tables", "long"]
+
+`FixtureIndex` lists fixtures from directory entries alone (no stat or read per
+file) and filters them by category, then by a `FixtureFilter` (name patterns, line
+counts, tags), before reading the remaining fixtures' files when they are loaded.
+Files of 1 MiB or more are decoded straight from a memory map rather than read into
+an intermediate bytes copy. Line endings are normalized to "\n" (as `Path.read_text`
+does), so a fixture saved with CRLF line endings reads, and hashes, like the same
+fixture saved with LF.
+
+Each fixture has a content hash over its three documents (`Fixture.content_hash`,
+or `FixtureFiles.content_hash()` straight from the files, without loading them), a
+stable identity for a fixture version to key caches and results on.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tomllib
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from md_edit_bench.models import Fixture, hash_documents
+
+INITIAL_SUFFIX = ".initial.md"
+CHANGES_SUFFIX = ".changes.md"
+FINAL_SUFFIX = ".final.md"
+META_SUFFIX = ".meta.toml"
+
+# Files at least this large are decoded from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def read_text(path: Path) -> str:
+    """Read a UTF-8 file with "\n" line endings, through a memory map if it is large."""
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            text = f.read().decode("utf-8")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _normalize_newlines(data: bytes | mmap.mmap) -> bytes | mmap.mmap:
+    """Raw file contents with the line endings `read_text` gives (copied only if needed)."""
+    if data.find(b"\r") == -1:
+        return data
+    return bytes(data).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+
+class FixtureMeta(BaseModel):
+    """Optional metadata from a fixture's {name}.meta.toml."""
+
+    tags: list[str] = []
+
+
+@dataclass(frozen=True)
+class FixtureFilter:
+    """Which fixtures to run, besides the category (empty fields match everything)."""
+
+    patterns: tuple[str, ...] = ()  # Globs on "category/name" or "name"
+    min_lines: int | None = None  # Lines in the initial document
+    max_lines: int | None = None
+    tags: tuple[str, ...] = ()  # A fixture needs all of them
+
+    def __bool__(self) -> bool:
+        """Whether the filter excludes anything."""
+        return bool(
+            self.patterns or self.min_lines is not None or self.max_lines is not None or self.tags
+        )
+
+    def matches(self, files: FixtureFiles) -> bool:
+        """Whether a fixture passes the filter (cheapest checks first)."""
+        if self.patterns and not any(
+            fnmatchcase(files.name, pattern) or fnmatchcase(files.stem, pattern)
+            for pattern in self.patterns
+        ):
+            return False
+        if self.tags and not set(self.tags) <= set(files.meta().tags):
+            return False
+        if self.min_lines is None and self.max_lines is None:
+            return True
+        lines = files.line_count()
+        return (self.min_lines is None or lines >= self.min_lines) and (
+            self.max_lines is None or lines <= self.max_lines
+        )
+
+
+@dataclass(frozen=True)
+class FixtureFiles:
+    """A discovered fixture's files (nothing is read until `load`)."""
+
+    name: str  # e.g., "simple/add_paragraph"
+    directory: Path
+    stem: str  # e.g., "add_paragraph"
+    has_meta: bool = False  # Whether {stem}.meta.toml exists
+
+    @property
+    def category(self) -> str:
+        """Category directory name."""
+        return self.name.split("/", 1)[0]
+
+    @property
+    def paths(self) -> tuple[Path, Path, Path]:
+        """Initial, changes and final document paths."""
+        return (
+            self.directory / f"{self.stem}{INITIAL_SUFFIX}",
+            self.directory / f"{self.stem}{CHANGES_SUFFIX}",
+            self.directory / f"{self.stem}{FINAL_SUFFIX}",
+        )
+
+    def load(self) -> Fixture:
+        """Read the fixture's documents."""
+        initial, changes, final = self.paths
+        return Fixture(
+            name=self.name,
+            initial=read_text(initial),
+            changes=read_text(changes),
+            expected=read_text(final),
+        )
+
+    def meta(self) -> FixtureMeta:
+        """The fixture's metadata (defaults if it has no metadata file).
+
+        Raises:
+            ValueError: The metadata file is not valid TOML or has invalid fields
+        """
+        if not self.has_meta:
+            return FixtureMeta()
+        path = self.directory / f"{self.stem}{META_SUFFIX}"
+        try:
+            return FixtureMeta.model_validate(tomllib.loads(path.read_text(encoding="utf-8")))
+        except (tomllib.TOMLDecodeError, ValidationError) as e:
+            raise ValueError(f"Invalid fixture metadata {path}: {e}") from e
+
+    def line_count(self) -> int:
+        """Lines in the initial document (counted without decoding it)."""
+        data = self.paths[0].read_bytes().replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return data.count(b"\n") + (bool(data) and not data.endswith(b"\n"))
+
+    def content_hash(self) -> str:
+        """Content hash of the files, equal to the loaded fixture's `content_hash`."""
+        documents: list[bytes | mmap.mmap] = []
+        try:
+            for path in self.paths:
+                with path.open("rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size < MMAP_THRESHOLD:
+                        documents.append(f.read())
+                    else:
+                        documents.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            return hash_documents(_normalize_newlines(document) for document in documents)
+        finally:
+            for document in documents:
+                if isinstance(document, mmap.mmap):
+                    document.close()
+
+
+class FixtureIndex:
+    """Fixtures found under a directory, filtered before any file is read."""
+
+    def __init__(self, base_dir: Path):
+        """Index a fixtures directory (scanned on first use).
+
+        Args:
+            base_dir: Directory holding one subdirectory per category
+        """
+        self.base_dir: Path = base_dir
+        self._entries: list[FixtureFiles] | None = None
+
+    @property
+    def entries(self) -> list[FixtureFiles]:
+        """Every complete fixture (all three files present), sorted by path."""
+        if self._entries is None:
+            self._entries = self._scan()
+        return self._entries
+
+    @property
+    def categories(self) -> list[str]:
+        """Categories with at least one fixture, sorted."""
+        return sorted({files.category for files in self.entries})
+
+    def _scan(self) -> list[FixtureFiles]:
+        found: list[tuple[Path, FixtureFiles]] = []
+        for directory, _dirnames, filenames in os.walk(self.base_dir):
+            names = set(filenames)
+            for filename in filenames:
+                if not filename.endswith(INITIAL_SUFFIX):
+                    continue
+                stem = filename.removesuffix(INITIAL_SUFFIX)
+                if f"{stem}{CHANGES_SUFFIX}" in names and f"{stem}{FINAL_SUFFIX}" in names:
+                    path = Path(directory)
+                    files = FixtureFiles(
+                        name=f"{path.name}/{stem}",
+                        directory=path,
+                        stem=stem,
+                        has_meta=f"{stem}{META_SUFFIX}" in names,
+                    )
+                    found.append((path / filename, files))
+        return [files for _path, files in sorted(found, key=lambda item: item[0])]
+
+    def select(
+        self, category: str | None = None, fixture_filter: FixtureFilter | None = None
+    ) -> list[FixtureFiles]:
+        """Fixtures in a category (default: all) that pass a filter."""
+        return [
+            files
+            for files in self.entries
+            if (category is None or files.category == category)
+            and (fixture_filter is None or fixture_filter.matches(files))
+        ]
+
+    def load(
+        self, category: str | None = None, fixture_filter: FixtureFilter | None = None
+    ) -> list[Fixture]:
+        """Read the selected fixtures (see `select`)."""
+        return [files.load() for files in self.select(category, fixture_filter)]
+
+
+def discover_fixtures(base_dir: Path, category: str | None = None) -> list[Fixture]:
+    """Load all fixtures under a directory, or only those in one category."""
+    return FixtureIndex(base_dir).load(category)
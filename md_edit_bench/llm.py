@@ -2,15 +2,271 @@
 
 from __future__ import annotations
 
+import itertools
+import time
 from collections.abc import Iterable
-from typing import overload
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Protocol, cast, overload
 
-from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
 from md_edit_bench import config
+from md_edit_bench.cache import CachedResponse, CacheMissError, get_cache, make_cache_key
+from md_edit_bench.clients import get_client_pool
 from md_edit_bench.models import LLMCall, LLMUsage
+from md_edit_bench.retry import CallStats, get_retrier
+from md_edit_bench.scheduler import estimate_tokens, get_scheduler
+from md_edit_bench.timing import span
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types import CompletionUsage
+    from openai.types.chat import (
+        ChatCompletion,
+        ChatCompletionChunk,
+        ChatCompletionMessageParam,
+        ChatCompletionUserMessageParam,
+    )
+
+MAX_TOKENS = 30000
+REQUEST_TIMEOUT = 60 * 10
+
+# Model ID prefixes whose providers cache prompts only at explicit cache_control breakpoints
+CACHE_CONTROL_PREFIXES = ("anthropic/", "google/")
+
+
+class StreamAborted(Exception):
+    """Raised by a StreamHandler to cancel a streamed request mid-generation.
+
+    call_llm re-raises it with the partial response and the usage incurred so
+    far: token counts are estimates (prompt size, one token per streamed
+    chunk) and cost is unknown because providers report it only at the end.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.content = ""
+        self.usage = LLMUsage()
+
+
+class StreamHandler(Protocol):
+    """Consumes a streamed completion as it arrives."""
+
+    def reset(self) -> None:
+        """Forget everything seen so far (called before every attempt, including retries)."""
+        ...
+
+    def feed(self, delta: str) -> None:
+        """Consume the next content delta; raise StreamAborted to cancel the request."""
+        ...
+
+
+@dataclass
+class CallOptions:
+    """Process-wide call_llm defaults (set from the CLI)."""
+
+    stream: bool = False  # Stream plain-text completions to measure TTFT and tokens/sec
+    prompt_cache: bool = True  # Send cache-control hints (see with_cache_control)
+
+
+@lru_cache
+def get_call_options() -> CallOptions:
+    """Get the process-wide call_llm defaults."""
+    settings = config.get_settings()
+    return CallOptions(
+        stream=settings.md_edit_bench_stream,
+        prompt_cache=settings.md_edit_bench_prompt_cache,
+    )
+
+
+def with_cache_control(
+    model: str, messages: list[ChatCompletionMessageParam]
+) -> list[ChatCompletionMessageParam]:
+    """Mark the prompt prefix up to the first user message as cacheable.
+
+    Prompts put the stable part first: the algorithm's system prompt, then the
+    document, then the change request and output instructions. Every request in a
+    cell starts with that exchange, so a retry that continues the conversation (or
+    the same test in a later run) reads it from the provider's prompt cache.
+    OpenAI-compatible providers cache long prefixes automatically; models in
+    CACHE_CONTROL_PREFIXES only cache up to a content part with a `cache_control`
+    breakpoint (OpenRouter passes it through), so one is added to the first user
+    message. Other models' messages are returned unchanged.
+    """
+    if not model.startswith(CACHE_CONTROL_PREFIXES):
+        return messages
+    marked = list(messages)
+    for i, message in enumerate(marked):
+        if message["role"] != "user":
+            continue
+        content = message["content"]
+        parts: list[dict[str, object]] = (
+            [{"type": "text", "text": content}]
+            if isinstance(content, str)
+            else [dict(part) for part in content]
+        )
+        parts[-1]["cache_control"] = {"type": "ephemeral"}
+        marked[i] = cast("ChatCompletionUserMessageParam", {"role": "user", "content": parts})
+        break
+    return marked
+
+
+@dataclass
+class _Completion:
+    """A finished completion plus the metrics recorded while receiving it."""
+
+    content: str
+    latency_seconds: float = 0.0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    tokens_cached: int = 0
+    cost_usd: float = 0.0
+    ttft_seconds: float | None = None
+    inter_token_p50_seconds: float | None = None
+    inter_token_p90_seconds: float | None = None
+    tokens_per_second: float | None = None
+
+
+def _cost_usd(response: ChatCompletion | ChatCompletionChunk, usage: CompletionUsage) -> float:
+    """Extract the OpenRouter cost extension from a response (0.0 if absent)."""
+    # OpenRouter-specific cost extraction from model_extra (untyped extension)
+    if hasattr(response, "model_extra") and response.model_extra:
+        extra: object = response.model_extra  # pyright: ignore[reportUnknownMemberType]
+        if isinstance(extra, dict) and "usage" in extra:  # pyright: ignore[reportUnnecessaryIsInstance]
+            usage_data: object = extra["usage"]  # pyright: ignore[reportAny]
+            if isinstance(usage_data, dict) and "total_cost" in usage_data:
+                cost_val: object = usage_data["total_cost"]  # pyright: ignore[reportUnknownVariableType]
+                if isinstance(cost_val, int | float):
+                    return float(cost_val)
+
+    # Fallback to usage.cost if available (OpenRouter extension)
+    cost_attr = getattr(usage, "cost", None)  # pyright: ignore[reportAny]
+    if isinstance(cost_attr, int | float):
+        return float(cost_attr)
+    return 0.0
+
+
+def _cached_tokens(usage: CompletionUsage) -> int:
+    """Prompt tokens the provider read from its prompt cache (0 if not reported)."""
+    details = usage.prompt_tokens_details
+    return (details.cached_tokens or 0) if details else 0
+
+
+def _reasoning_tokens(usage: CompletionUsage) -> int:
+    """Hidden reasoning tokens included in completion_tokens (0 if not reported)."""
+    details = usage.completion_tokens_details
+    return (details.reasoning_tokens or 0) if details else 0
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile (q in [0, 1]) of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+async def _complete(
+    client: AsyncOpenAI,
+    model: str,
+    messages: list[ChatCompletionMessageParam],
+    response_format: type[BaseModel] | None,
+) -> _Completion:
+    """Request a completion in one response."""
+    if response_format is not None:
+        response = await client.beta.chat.completions.parse(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            extra_body={"usage": {"include": True}},
+            max_completion_tokens=MAX_TOKENS,
+            max_tokens=MAX_TOKENS,
+            timeout=REQUEST_TIMEOUT,
+        )
+    else:
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            extra_body={"usage": {"include": True}},
+            max_completion_tokens=MAX_TOKENS,
+            max_tokens=MAX_TOKENS,
+            timeout=REQUEST_TIMEOUT,
+        )
+
+    completion = _Completion(content=response.choices[0].message.content or "")
+    if response.usage:
+        completion.tokens_in = response.usage.prompt_tokens or 0
+        completion.tokens_out = response.usage.completion_tokens or 0
+        completion.tokens_cached = _cached_tokens(response.usage)
+        completion.cost_usd = _cost_usd(response, response.usage)
+    return completion
+
+
+async def _stream(
+    client: AsyncOpenAI,
+    model: str,
+    messages: list[ChatCompletionMessageParam],
+    handler: StreamHandler | None = None,
+) -> _Completion:
+    """Stream a completion, timing the first token and the gaps between content chunks.
+
+    All timings are of visible content: time to first token includes any reasoning the
+    model does before answering, and tokens/sec excludes reasoning tokens.
+    """
+    if handler is not None:
+        handler.reset()
+    start = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
+        extra_body={"usage": {"include": True}},
+        max_completion_tokens=MAX_TOKENS,
+        max_tokens=MAX_TOKENS,
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    parts: list[str] = []
+    chunk_times: list[float] = []
+    reasoning_tokens = 0
+    completion = _Completion(content="")
+    async for chunk in stream:
+        if chunk.usage:
+            completion.tokens_in = chunk.usage.prompt_tokens or 0
+            completion.tokens_out = chunk.usage.completion_tokens or 0
+            completion.tokens_cached = _cached_tokens(chunk.usage)
+            reasoning_tokens = _reasoning_tokens(chunk.usage)
+            completion.cost_usd = _cost_usd(chunk, chunk.usage)
+        for choice in chunk.choices:
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                chunk_times.append(time.perf_counter())
+                if handler is None:
+                    continue
+                try:
+                    handler.feed(choice.delta.content)
+                except StreamAborted as e:
+                    await stream.close()
+                    e.content = "".join(parts)
+                    e.usage.tokens_out = len(chunk_times)
+                    raise
+
+    completion.content = "".join(parts)
+    if chunk_times:
+        completion.ttft_seconds = chunk_times[0] - start
+        gaps = [b - a for a, b in itertools.pairwise(chunk_times)]
+        completion.inter_token_p50_seconds = _percentile(gaps, 0.5)
+        completion.inter_token_p90_seconds = _percentile(gaps, 0.9)
+        generation_seconds = chunk_times[-1] - chunk_times[0]
+        # Only content tokens stream between the first and last content chunk: reasoning
+        # tokens (counted in completion_tokens) arrive outside delta.content, before them.
+        # Providers usually send one token per chunk; fall back to chunk count without usage
+        tokens = (completion.tokens_out - reasoning_tokens) or len(chunk_times)
+        if generation_seconds > 0:
+            completion.tokens_per_second = (tokens - 1) / generation_seconds
+    return completion
 
 
 @overload
@@ -19,6 +275,9 @@ async def call_llm(
     messages: str,
     system: str | None = None,
     response_format: type[BaseModel] | None = None,
+    *,
+    stream: bool | None = None,
+    stream_handler: StreamHandler | None = None,
 ) -> tuple[str, LLMUsage]: ...
 
 
@@ -28,6 +287,9 @@ async def call_llm(
     messages: Iterable[ChatCompletionMessageParam],
     system: str | None = None,
     response_format: type[BaseModel] | None = None,
+    *,
+    stream: bool | None = None,
+    stream_handler: StreamHandler | None = None,
 ) -> tuple[str, LLMUsage]: ...
 
 
@@ -36,15 +298,45 @@ async def call_llm(
     messages: Iterable[ChatCompletionMessageParam] | str,
     system: str | None = None,
     response_format: type[BaseModel] | None = None,
+    *,
+    stream: bool | None = None,
+    stream_handler: StreamHandler | None = None,
 ) -> tuple[str, LLMUsage]:
     """Make an async LLM completion request and return content + usage.
 
+    The whole call (cache lookup, queueing, retries and the request itself) is
+    timed as the "llm" phase of the current cell.
+
     Args:
         model: Model ID (e.g., "openai/gpt-4o")
         messages: User message string or list of chat messages
         system: Optional system prompt (prepended to messages)
         response_format: Optional Pydantic model class for structured output (JSON mode)
+        stream: Stream the completion and record latency metrics on the LLMCall
+            (defaults to the --stream setting; structured output is never streamed)
+        stream_handler: Receives content deltas while streaming and may abort the
+            request by raising StreamAborted. Not called for non-streamed or cached calls.
     """
+    with span("llm"):
+        return await _call_llm(
+            model,
+            messages,
+            system=system,
+            response_format=response_format,
+            stream=stream,
+            stream_handler=stream_handler,
+        )
+
+
+async def _call_llm(
+    model: str,
+    messages: Iterable[ChatCompletionMessageParam] | str,
+    *,
+    system: str | None,
+    response_format: type[BaseModel] | None,
+    stream: bool | None,
+    stream_handler: StreamHandler | None,
+) -> tuple[str, LLMUsage]:
     full_messages: list[ChatCompletionMessageParam] = []
     if system:
         full_messages.append({"role": "system", "content": system})
@@ -54,34 +346,6 @@ async def call_llm(
     else:
         full_messages.extend(messages)
 
-    if not config.API_KEY:
-        raise ValueError(
-            "OPENROUTER_API_KEY environment variable not set. Please set it to run benchmarks."
-        )
-
-    client = AsyncOpenAI(api_key=config.API_KEY, base_url=config.BASE_URL)
-
-    if response_format is not None:
-        response = await client.beta.chat.completions.parse(
-            model=model,
-            messages=full_messages,
-            response_format=response_format,
-            extra_body={"usage": {"include": True}},
-            max_completion_tokens=30000,
-            max_tokens=30000,
-            timeout=60 * 10,
-        )
-    else:
-        response = await client.chat.completions.create(
-            model=model,
-            messages=full_messages,
-            extra_body={"usage": {"include": True}},
-            max_completion_tokens=30000,
-            max_tokens=30000,
-            timeout=60 * 10,
-        )
-    content = response.choices[0].message.content or ""
-
     # Build request string for logging
     request_parts: list[str] = []
     for msg in full_messages:
@@ -90,25 +354,93 @@ async def call_llm(
         request_parts.append(f"[{role}]\n{msg_content}")
     request_str = "\n\n".join(request_parts)
 
-    usage = LLMUsage(calls=[LLMCall(model=model, request=request_str, response=content)])
-    if response.usage:
-        usage.tokens_in = response.usage.prompt_tokens or 0
-        usage.tokens_out = response.usage.completion_tokens or 0
-
-        # OpenRouter-specific cost extraction from model_extra (untyped extension)
-        if hasattr(response, "model_extra") and response.model_extra:
-            extra: object = response.model_extra  # pyright: ignore[reportUnknownMemberType]
-            if isinstance(extra, dict) and "usage" in extra:  # pyright: ignore[reportUnnecessaryIsInstance]
-                usage_data: object = extra["usage"]  # pyright: ignore[reportAny]
-                if isinstance(usage_data, dict) and "total_cost" in usage_data:
-                    cost_val: object = usage_data["total_cost"]  # pyright: ignore[reportUnknownVariableType]
-                    if isinstance(cost_val, int | float):
-                        usage.cost_usd = float(cost_val)
-
-        # Fallback to usage.cost if available (OpenRouter extension)
-        if usage.cost_usd == 0.0 and hasattr(response.usage, "cost"):
-            cost_attr = getattr(response.usage, "cost", None)  # pyright: ignore[reportAny]
-            if isinstance(cost_attr, int | float):
-                usage.cost_usd = float(cost_attr)
+    cache = get_cache()
+    cache_key = ""
+    if cache.mode != "off":
+        cache_key = make_cache_key(
+            model,
+            [dict(msg) for msg in full_messages],
+            response_format.model_json_schema() if response_format is not None else None,
+            MAX_TOKENS,
+        )
+    if cache.reads:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached.content, cached.to_usage()
+        if cache.mode == "offline":
+            raise CacheMissError(f"No cached response for {model} (offline mode, key {cache_key})")
+
+    if not config.API_KEY:
+        raise ValueError(
+            "OPENROUTER_API_KEY environment variable not set. Please set it to run benchmarks."
+        )
+
+    client = get_client_pool().get(config.BASE_URL, config.API_KEY)
+
+    # Hints are left out of the cache key and the logged request: they don't change the answer
+    options = get_call_options()
+    request_messages = (
+        with_cache_control(model, full_messages) if options.prompt_cache else full_messages
+    )
+
+    scheduler = get_scheduler()
+    use_stream = (stream if stream is not None else options.stream) and (response_format is None)
+
+    async def attempt() -> _Completion:
+        async with scheduler.slot(model, estimate_tokens(request_str)) as reservation:
+            start = time.perf_counter()
+            if use_stream:
+                completion = await _stream(client, model, request_messages, stream_handler)
+            else:
+                completion = await _complete(client, model, request_messages, response_format)
+            completion.latency_seconds = time.perf_counter() - start
+            reservation.record_usage(completion.tokens_in + completion.tokens_out)
+            return completion
+
+    call_stats = CallStats()
+    try:
+        completion = await get_retrier().run(model, attempt, call_stats)
+    except StreamAborted as e:
+        e.usage.tokens_in = estimate_tokens(request_str)
+        e.usage.calls = [LLMCall(model=model, request=request_str, response=e.content)]
+        e.usage.retries = call_stats.retries
+        e.usage.backoff_seconds = call_stats.backoff_seconds
+        raise
+    content = completion.content
+
+    usage = LLMUsage(
+        tokens_in=completion.tokens_in,
+        tokens_out=completion.tokens_out,
+        tokens_cached=completion.tokens_cached,
+        cost_usd=completion.cost_usd,
+        calls=[
+            LLMCall(
+                model=model,
+                request=request_str,
+                response=content,
+                latency_seconds=completion.latency_seconds,
+                ttft_seconds=completion.ttft_seconds,
+                inter_token_p50_seconds=completion.inter_token_p50_seconds,
+                inter_token_p90_seconds=completion.inter_token_p90_seconds,
+                tokens_per_second=completion.tokens_per_second,
+            )
+        ],
+        retries=call_stats.retries,
+        backoff_seconds=call_stats.backoff_seconds,
+    )
+
+    if cache.writes:
+        cache.put(
+            cache_key,
+            CachedResponse(
+                model=model,
+                request=request_str,
+                content=content,
+                tokens_in=usage.tokens_in,
+                tokens_out=usage.tokens_out,
+                tokens_cached=usage.tokens_cached,
+                cost_usd=usage.cost_usd,
+            ),
+        )
 
     return content, usage
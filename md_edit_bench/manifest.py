@@ -0,0 +1,206 @@
+"""Run manifests: the completed cells of a benchmark run, for resuming it.
+
+A manifest is an append-only JSONL file, results/runs/{run_id}.jsonl. Its first line
+describes the run (the algorithms, models and fixtures it was started with); each
+later line records one completed cell with its result's metrics. Lines are flushed as
+they are written, so an interrupted run's manifest lists every cell that finished,
+and a line cut short by a crash is ignored when the manifest is read back. Cells that
+failed on a transient provider error (e.g. an outage that outlasted the retries) are
+not recorded, so resuming runs them again.
+
+A cell is identified by its fixture, algorithm and model plus a hash of everything
+that determines its prompt and score (the fixture's documents and change request, and
+the algorithm's prompt templates), so resuming after editing a fixture or a template
+reruns the cells it affects instead of reusing stale results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import TextIO
+
+from pydantic import BaseModel, ValidationError
+
+from md_edit_bench.algorithms import Algorithm
+from md_edit_bench.fixtures import FixtureFilter
+from md_edit_bench.models import Fixture, TestResult
+from md_edit_bench.results import ResultRecord
+
+RUNS_DIRNAME = "runs"
+
+
+class ManifestHeader(BaseModel):
+    """First line of a manifest: the selections the run was started with."""
+
+    run_id: str
+    created: datetime
+    algorithms: list[str]
+    models: list[str]
+    category: str | None = None
+    fixture_filter: FixtureFilter | None = None
+
+
+class ManifestEntry(BaseModel):
+    """One completed cell."""
+
+    cell: str  # cell_key() of the fixture, algorithm and model
+    result: ResultRecord
+
+
+@lru_cache
+def template_hash(algorithm_type: type[Algorithm]) -> str:
+    """Hash of the prompt templates next to an algorithm's module."""
+    digest = hashlib.sha256()
+    directory = Path(inspect.getfile(algorithm_type)).parent
+    for path in sorted(directory.glob("*.jinja*")):
+        digest.update(path.name.encode("utf-8") + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def cell_key(fixture: Fixture, algorithm: Algorithm, model: str) -> str:
+    """Hash every input that can change a cell's result into a stable hex key."""
+    payload = json.dumps(
+        {
+            "fixture": fixture.name,
+            "content": fixture.content_hash,
+            "algorithm": algorithm.name,
+            "templates": template_hash(type(algorithm)),
+            "model": model,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RunManifest:
+    """Append-only record of a run's completed cells.
+
+    Call `plan` with the run's fixtures and algorithms before recording results, so
+    each (fixture, algorithm, model) name triple maps to its cell key. Results are
+    recorded from the results writer thread; everything else runs on the event loop.
+    """
+
+    def __init__(self, path: Path, header: ManifestHeader, entries: dict[str, ResultRecord]):
+        """Initialize from a manifest's contents (use `create` or `load`).
+
+        Args:
+            path: The manifest's JSONL file
+            header: The run's selections
+            entries: Results of completed cells by cell key
+        """
+        self.path: Path = path
+        self.header: ManifestHeader = header
+        self.entries: dict[str, ResultRecord] = entries
+        self._keys: dict[tuple[str, str, str], str] = {}
+        self._file: TextIO | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def run_id(self) -> str:
+        """ID passed to --resume to continue this run."""
+        return self.header.run_id
+
+    @classmethod
+    def create(
+        cls,
+        runs_dir: Path,
+        algorithms: list[str],
+        models: list[str],
+        category: str | None = None,
+        fixture_filter: FixtureFilter | None = None,
+    ) -> RunManifest:
+        """Start the manifest of a new run, named after the current time.
+
+        Runs started in the same second get a counter suffix ("-2", "-3", ...), so
+        every run in `runs_dir` has its own ID (which also keys its rows in the
+        results store).
+        """
+        created = datetime.now()
+        header = ManifestHeader(
+            run_id=created.strftime("%Y%m%d-%H%M%S"),
+            created=created,
+            algorithms=algorithms,
+            models=models,
+            category=category,
+            fixture_filter=fixture_filter or None,
+        )
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        base_id = header.run_id
+        attempt = 1
+        while True:
+            path = runs_dir / f"{header.run_id}.jsonl"
+            try:
+                with path.open("x", encoding="utf-8") as f:
+                    _ = f.write(header.model_dump_json() + "\n")
+            except FileExistsError:
+                attempt += 1
+                header.run_id = f"{base_id}-{attempt}"
+                continue
+            return cls(path, header, {})
+
+    @classmethod
+    def load(cls, runs_dir: Path, run_id: str) -> RunManifest:
+        """Read the manifest of an earlier run.
+
+        Raises:
+            FileNotFoundError: No manifest with this run ID
+            ValueError: The manifest's header is unreadable
+        """
+        path = runs_dir / f"{run_id}.jsonl"
+        with path.open(encoding="utf-8") as f:
+            try:
+                header = ManifestHeader.model_validate_json(f.readline())
+            except ValidationError as e:
+                raise ValueError(f"Invalid run manifest {path}: {e}") from e
+            entries: dict[str, ResultRecord] = {}
+            for line in f:
+                try:
+                    entry = ManifestEntry.model_validate_json(line)
+                except ValidationError:
+                    continue  # Truncated by an interrupted write
+                entries[entry.cell] = entry.result
+        return cls(path, header, entries)
+
+    def plan(self, fixtures: list[Fixture], algorithms: list[Algorithm], models: list[str]) -> None:
+        """Compute the cell keys of every cell the run will schedule."""
+        for fixture in fixtures:
+            for algorithm in algorithms:
+                for model in models:
+                    name = (fixture.name, algorithm.name, model)
+                    self._keys[name] = cell_key(fixture, algorithm, model)
+
+    def completed(self, fixture: str, algorithm: str, model: str) -> TestResult | None:
+        """Result of a planned cell if it already completed (metrics only)."""
+        record = self.entries.get(self._keys[(fixture, algorithm, model)])
+        return record.to_result() if record else None
+
+    def record(self, r: TestResult) -> None:
+        """Append a completed cell (its result must already be written to disk).
+
+        Results that failed on a transient provider error are skipped: the cell did not
+        really run, and resuming should run it again.
+        """
+        if r.algorithm_result.retryable:
+            return
+        key = self._keys[(r.fixture, r.algorithm, r.model)]
+        entry = ManifestEntry(cell=key, result=ResultRecord.from_result(r))
+        with self._lock:
+            if self._file is None:
+                self._file = self.path.open("a", encoding="utf-8")
+            _ = self._file.write(entry.model_dump_json() + "\n")
+            self._file.flush()
+            self.entries[key] = entry.result
+
+    def close(self) -> None:
+        """Close the manifest file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
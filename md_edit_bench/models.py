@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
+import mmap
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from md_edit_bench.timing import PhaseTimings
+
+if TYPE_CHECKING:
+    from md_edit_bench.scoring import DiffHandle
 
 
 @dataclass
@@ -15,6 +24,15 @@ class LLMCall:
     request: str
     response: str
 
+    # Request sent -> response complete for the attempt that succeeded (None if cached)
+    latency_seconds: float | None = None
+
+    # Streaming metrics (None unless the call was streamed)
+    ttft_seconds: float | None = None  # Request sent -> first content token
+    inter_token_p50_seconds: float | None = None  # Gap between content chunks
+    inter_token_p90_seconds: float | None = None
+    tokens_per_second: float | None = None  # Output tokens / generation time
+
 
 @dataclass
 class LLMUsage:
@@ -22,16 +40,22 @@ class LLMUsage:
 
     tokens_in: int = 0
     tokens_out: int = 0
+    tokens_cached: int = 0  # Part of tokens_in read from the provider's prompt cache
     cost_usd: float = 0.0
     calls: list[LLMCall] = field(default_factory=list)
+    retries: int = 0  # Transient failures retried by the transport layer
+    backoff_seconds: float = 0.0  # Time spent sleeping between retries
 
     def __add__(self, other: LLMUsage) -> LLMUsage:
         """Accumulate usage from multiple calls."""
         return LLMUsage(
             tokens_in=self.tokens_in + other.tokens_in,
             tokens_out=self.tokens_out + other.tokens_out,
+            tokens_cached=self.tokens_cached + other.tokens_cached,
             cost_usd=self.cost_usd + other.cost_usd,
             calls=self.calls + other.calls,
+            retries=self.retries + other.retries,
+            backoff_seconds=self.backoff_seconds + other.backoff_seconds,
         )
 
 
@@ -44,6 +68,7 @@ class AlgorithmResult:
     error: str | None  # Error message if failed
     usage: LLMUsage  # Accumulated usage from all LLM calls
     warnings: list[str] = field(default_factory=list)  # Skipped blocks/operations
+    retryable: bool = False  # Failed on a transient provider error (worth running again)
 
 
 @dataclass
@@ -55,6 +80,22 @@ class Fixture:
     changes: str  # Natural language change request
     expected: str  # Expected final document
 
+    @cached_property
+    def content_hash(self) -> str:
+        """Hash of the three documents: identifies this version of the fixture."""
+        return hash_documents(
+            text.encode("utf-8") for text in (self.initial, self.changes, self.expected)
+        )
+
+
+def hash_documents(documents: Iterable[bytes | mmap.mmap]) -> str:
+    """Hash a fixture's initial, changes and final documents (UTF-8 encoded)."""
+    digest = hashlib.sha256()
+    for document in documents:
+        digest.update(len(document).to_bytes(8, "little"))
+        digest.update(document)
+    return digest.hexdigest()
+
 
 @dataclass
 class TestResult:
@@ -72,10 +113,21 @@ class TestResult:
     similarity_score: float = 0.0
     lines_missing: int = 0
     lines_extra: int = 0
-    diff_from_expected: str = ""
+    diff: DiffHandle | None = None  # Rendered on demand (see diff_from_expected)
 
     # Timing
-    duration_seconds: float = 0.0
+    duration_seconds: float = 0.0  # algorithm.apply() wall time (excludes scoring)
+    phases: PhaseTimings = field(default_factory=PhaseTimings)
+
+    # Scheduler (time spent waiting for rate limits / concurrency slots)
+    queue_wait_seconds: float = 0.0
+    max_queue_depth: int = 0
+    throttle_events: int = 0
+
+    @property
+    def diff_from_expected(self) -> str:
+        """Unified diff against the expected document (computed on each access)."""
+        return self.diff.render() if self.diff else ""
 
     @property
     def passed(self) -> bool:
@@ -103,6 +155,23 @@ class TestResult:
         """Number of warnings (skipped blocks/operations)."""
         return len(self.algorithm_result.warnings)
 
+    @property
+    def streamed_calls(self) -> list[LLMCall]:
+        """LLM calls that were streamed (and so carry latency metrics)."""
+        return [c for c in self.algorithm_result.usage.calls if c.ttft_seconds is not None]
+
+    @property
+    def ttft_seconds(self) -> float | None:
+        """Time to first token of the first streamed call."""
+        streamed = self.streamed_calls
+        return streamed[0].ttft_seconds if streamed else None
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Mean output throughput across streamed calls."""
+        rates = [c.tokens_per_second for c in self.streamed_calls if c.tokens_per_second]
+        return sum(rates) / len(rates) if rates else None
+
 
 @dataclass
 class BenchmarkRun:
@@ -156,33 +225,3 @@ class BenchmarkRun:
     def total_warnings(self) -> int:
         """Total warnings across all tests."""
         return sum(r.warning_count for r in self.results)
-
-
-def discover_fixtures(base_dir: Path) -> list[Fixture]:
-    """Find all test cases by looking for .initial.md files."""
-    fixtures: list[Fixture] = []
-
-    for initial_file in sorted(base_dir.rglob("*.initial.md")):
-        # Extract name without .initial.md suffix
-        name_part = initial_file.name.replace(".initial.md", "")
-        category = initial_file.parent.name
-
-        # Find corresponding files
-        changes_file = initial_file.parent / f"{name_part}.changes.md"
-        final_file = initial_file.parent / f"{name_part}.final.md"
-
-        if not changes_file.exists():
-            continue
-        if not final_file.exists():
-            continue
-
-        fixtures.append(
-            Fixture(
-                name=f"{category}/{name_part}",
-                initial=initial_file.read_text(encoding="utf-8"),
-                changes=changes_file.read_text(encoding="utf-8"),
-                expected=final_file.read_text(encoding="utf-8"),
-            )
-        )
-
-    return fixtures
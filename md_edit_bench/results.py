@@ -0,0 +1,307 @@
+"""Writing test results to the results/ directory as they complete.
+
+Each result gets its own directory, results/{category}/{fixture}/{algorithm}/{model}/,
+holding result.json (metrics), output.md, diff.txt and the LLM request/response
+of every call. The ResultsWriter writes these on a background thread while the run
+continues, so a crash loses at most the results still queued, and then drops the
+heavy payloads (documents embedded in LLM requests and responses) from memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from md_edit_bench.models import AlgorithmResult, LLMCall, LLMUsage, TestResult
+from md_edit_bench.timing import PhaseTimings
+
+if TYPE_CHECKING:
+    from md_edit_bench.manifest import RunManifest
+    from md_edit_bench.store import ResultsStore
+
+RESULTS_DIR = Path(__file__).parent.parent / "results"
+
+
+def result_dir(results_dir: Path, r: TestResult) -> Path:
+    """Directory for one result: {category}/{fixture}/{algorithm}/{model}/."""
+    category, fixture_name = r.fixture.split("/", 1) if "/" in r.fixture else ("default", r.fixture)
+    model_part = r.model.split("/")[-1]
+    return results_dir / category / fixture_name / r.algorithm / model_part
+
+
+class CallRecord(BaseModel):
+    """Metrics of one LLM call (its request and response are stored as files)."""
+
+    model: str
+    latency_seconds: float | None = None
+    ttft_seconds: float | None = None
+    inter_token_p50_seconds: float | None = None
+    inter_token_p90_seconds: float | None = None
+    tokens_per_second: float | None = None
+
+
+class StreamedCallRecord(BaseModel):
+    """Latency metrics of one streamed LLM call."""
+
+    model: str
+    ttft_seconds: float | None
+    inter_token_p50_seconds: float | None
+    inter_token_p90_seconds: float | None
+    tokens_per_second: float | None
+
+
+class ResultRecord(BaseModel):
+    """Metrics and metadata of a result, as stored in result.json."""
+
+    fixture: str
+    algorithm: str
+    model: str
+    success: bool
+    error: str | None
+    warning_count: int
+    warnings: list[str]  # First 20
+    exact_match: bool
+    similarity_score: float
+    lines_missing: int
+    lines_extra: int
+    duration_seconds: float
+    phases: PhaseTimings
+    llm_calls: list[CallRecord]
+    queue_wait_seconds: float
+    max_queue_depth: int
+    throttle_events: int
+    tokens_in: int
+    tokens_out: int
+    tokens_cached: int = 0  # Not recorded by older runs
+    cost_usd: float
+    retries: int
+    backoff_seconds: float
+    ttft_seconds: float | None
+    tokens_per_second: float | None
+    streamed_calls: list[StreamedCallRecord]
+
+    @classmethod
+    def from_result(cls, r: TestResult) -> ResultRecord:
+        """Record the metrics of a result."""
+        usage = r.algorithm_result.usage
+        return cls(
+            fixture=r.fixture,
+            algorithm=r.algorithm,
+            model=r.model,
+            success=r.algorithm_result.success,
+            error=r.algorithm_result.error,
+            warning_count=r.warning_count,
+            warnings=r.algorithm_result.warnings[:20],
+            exact_match=r.exact_match,
+            similarity_score=r.similarity_score,
+            lines_missing=r.lines_missing,
+            lines_extra=r.lines_extra,
+            duration_seconds=r.duration_seconds,
+            phases=r.phases,
+            llm_calls=[
+                CallRecord(
+                    model=call.model,
+                    latency_seconds=call.latency_seconds,
+                    ttft_seconds=call.ttft_seconds,
+                    inter_token_p50_seconds=call.inter_token_p50_seconds,
+                    inter_token_p90_seconds=call.inter_token_p90_seconds,
+                    tokens_per_second=call.tokens_per_second,
+                )
+                for call in usage.calls
+            ],
+            queue_wait_seconds=r.queue_wait_seconds,
+            max_queue_depth=r.max_queue_depth,
+            throttle_events=r.throttle_events,
+            tokens_in=usage.tokens_in,
+            tokens_out=usage.tokens_out,
+            tokens_cached=usage.tokens_cached,
+            cost_usd=usage.cost_usd,
+            retries=usage.retries,
+            backoff_seconds=usage.backoff_seconds,
+            ttft_seconds=r.ttft_seconds,
+            tokens_per_second=r.tokens_per_second,
+            streamed_calls=[
+                StreamedCallRecord(
+                    model=call.model,
+                    ttft_seconds=call.ttft_seconds,
+                    inter_token_p50_seconds=call.inter_token_p50_seconds,
+                    inter_token_p90_seconds=call.inter_token_p90_seconds,
+                    tokens_per_second=call.tokens_per_second,
+                )
+                for call in r.streamed_calls
+            ],
+        )
+
+    def to_result(self) -> TestResult:
+        """Rebuild the result's metrics (without output, diff or LLM texts)."""
+        calls = [
+            LLMCall(
+                model=call.model,
+                request="",
+                response="",
+                latency_seconds=call.latency_seconds,
+                ttft_seconds=call.ttft_seconds,
+                inter_token_p50_seconds=call.inter_token_p50_seconds,
+                inter_token_p90_seconds=call.inter_token_p90_seconds,
+                tokens_per_second=call.tokens_per_second,
+            )
+            for call in self.llm_calls
+        ]
+        usage = LLMUsage(
+            tokens_in=self.tokens_in,
+            tokens_out=self.tokens_out,
+            tokens_cached=self.tokens_cached,
+            cost_usd=self.cost_usd,
+            calls=calls,
+            retries=self.retries,
+            backoff_seconds=self.backoff_seconds,
+        )
+        return TestResult(
+            fixture=self.fixture,
+            algorithm=self.algorithm,
+            model=self.model,
+            algorithm_result=AlgorithmResult(
+                output=None,
+                success=self.success,
+                error=self.error,
+                usage=usage,
+                warnings=self.warnings,
+            ),
+            exact_match=self.exact_match,
+            similarity_score=self.similarity_score,
+            lines_missing=self.lines_missing,
+            lines_extra=self.lines_extra,
+            duration_seconds=self.duration_seconds,
+            phases=self.phases,
+            queue_wait_seconds=self.queue_wait_seconds,
+            max_queue_depth=self.max_queue_depth,
+            throttle_events=self.throttle_events,
+        )
+
+
+def write_result(r: TestResult, results_dir: Path) -> None:
+    """Write one result's directory (result.json, output.md, diff.txt, llm_* files)."""
+    directory = result_dir(results_dir, r)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # result.json - metrics and metadata
+    record = ResultRecord.from_result(r)
+    (directory / "result.json").write_text(record.model_dump_json(indent=2), encoding="utf-8")
+
+    # output.md - algorithm's output
+    if r.algorithm_result.output:
+        (directory / "output.md").write_text(r.algorithm_result.output, encoding="utf-8")
+
+    # diff.txt - diff from expected (streamed; none for exact matches)
+    if r.diff:
+        _ = r.diff.write(directory / "diff.txt")
+
+    # LLM calls
+    calls = r.algorithm_result.usage.calls
+    for i, call in enumerate(calls, 1):
+        prefix = f"llm_{i}_" if len(calls) > 1 else "llm_"
+        (directory / f"{prefix}request.txt").write_text(
+            f"Model: {call.model}\n\n{call.request}", encoding="utf-8"
+        )
+        (directory / f"{prefix}response.txt").write_text(call.response, encoding="utf-8")
+
+
+def release_payloads(r: TestResult, keep_output: bool = False) -> None:
+    """Drop a written result's large texts, keeping its metrics.
+
+    Args:
+        r: Result whose directory has been written
+        keep_output: Keep the output document (and so the diff, which is rendered
+            from it) for printing failures at the end of the run
+    """
+    for call in r.algorithm_result.usage.calls:
+        call.request = ""
+        call.response = ""
+    if not keep_output:
+        r.algorithm_result.output = None
+        r.diff = None
+
+
+class ResultsWriter:
+    """Writes results on a background thread as soon as they are submitted.
+
+    The queue is bounded: when the disk falls behind, `submit` waits (without
+    blocking the event loop) instead of letting written-later results pile up.
+    """
+
+    def __init__(
+        self,
+        results_dir: Path = RESULTS_DIR,
+        keep_outputs: bool = False,
+        max_queued: int = 64,
+        manifest: RunManifest | None = None,
+        store: ResultsStore | None = None,
+    ):
+        """Initialize the writer (call `start` before submitting).
+
+        Args:
+            results_dir: Root directory for result directories
+            keep_outputs: Keep output documents in memory after writing (for --diff)
+            max_queued: Results waiting to be written before `submit` blocks
+            manifest: Run manifest to record each cell in once its files are written
+            store: Results store to add each result's metrics to, under the
+                manifest's run ID (requires a manifest)
+        """
+        if store and not manifest:
+            raise ValueError("A results store needs a run manifest for its run ID")
+        self.results_dir: Path = results_dir
+        self.keep_outputs: bool = keep_outputs
+        self.manifest: RunManifest | None = manifest
+        self.store: ResultsStore | None = store
+        self.written: int = 0
+        self._queue: queue.Queue[TestResult | None] = queue.Queue(maxsize=max_queued)
+        self._thread: threading.Thread | None = None
+        self._error: Exception | None = None
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+
+    async def submit(self, r: TestResult) -> None:
+        """Queue a finished (scored) result for writing."""
+        try:
+            self._queue.put_nowait(r)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, r)
+
+    def close(self) -> None:
+        """Write everything still queued and stop the thread.
+
+        Raises:
+            Exception: The first error hit while writing a result, recording it in the
+                manifest or adding it to the results store, once all others are written
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while (r := self._queue.get()) is not None:
+            try:
+                write_result(r, self.results_dir)
+                if self.manifest:
+                    self.manifest.record(r)
+                    if self.store:
+                        self.store.add(self.manifest.run_id, self.manifest.header.created, r)
+            except Exception as e:
+                # Keep draining the queue (a dead thread would block submit and close
+                # forever); close() reports the first failure
+                self._error = self._error or e
+                continue
+            release_payloads(r, keep_output=self.keep_outputs)
+            self.written += 1
@@ -0,0 +1,201 @@
+"""Retries with exponential backoff, a per-run retry budget and per-model circuit breakers.
+
+Transient provider failures (timeouts, connection errors, 408/409/429 and 5xx)
+are retried with full-jitter exponential backoff, honoring `Retry-After` when the
+provider sends one. Every retry draws from a run-wide budget so a provider outage
+cannot multiply the run's cost and duration without bound. A model whose requests
+keep failing trips its circuit breaker, which pauses dispatch to that model for a
+cooldown instead of hammering a degraded provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import TypeVar
+
+from md_edit_bench import config
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error from the OpenAI client is transient and worth retrying."""
+    import openai  # Deferred: costs a large share of CLI startup
+
+    if isinstance(error, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Extract the server-requested delay from `Retry-After` / `retry-after-ms` headers."""
+    import openai
+
+    if not isinstance(error, openai.APIStatusError):
+        return None
+    headers = error.response.headers
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+@dataclass
+class RetryStats:
+    """Run-wide retry activity."""
+
+    retries: int = 0
+    gave_up: int = 0
+    budget_exhausted: int = 0
+    breaker_trips: int = 0
+    breaker_wait_seconds: float = 0.0
+
+
+@dataclass
+class CallStats:
+    """Retry activity for a single call_llm request."""
+
+    retries: int = 0
+    backoff_seconds: float = 0.0
+
+
+@dataclass
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures and stays open for `cooldown` seconds.
+
+    After the cooldown requests are let through again (half-open); the failure
+    count is kept, so one more failure reopens the breaker immediately while one
+    success closes it.
+    """
+
+    threshold: int
+    cooldown: float
+    failures: int = 0
+    open_until: float = 0.0
+
+    def remaining(self) -> float:
+        """Seconds until the breaker lets requests through again."""
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self) -> bool:
+        """Count a transient failure; returns True if this opened the breaker."""
+        self.failures += 1
+        if self.failures < self.threshold:
+            return False
+        self.open_until = time.monotonic() + self.cooldown
+        return True
+
+
+@dataclass
+class Retrier:
+    """Runs request attempts with backoff, a shared retry budget and per-model breakers."""
+
+    max_retries: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    budget: int = 200
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
+    stats: RetryStats = field(default_factory=RetryStats)
+    _breakers: dict[str, CircuitBreaker] = field(default_factory=dict)
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        """Get the circuit breaker for a model."""
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+        return self._breakers[model]
+
+    def backoff(self, retry: int, error: BaseException) -> float:
+        """Delay before retry number `retry` (0-based): Retry-After, else full jitter."""
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after
+        cap = min(self.max_delay, self.base_delay * 2.0**retry)
+        return random.uniform(0, cap)  # noqa: S311 - jitter, not cryptography
+
+    async def run(
+        self, model: str, attempt: Callable[[], Awaitable[T]], call_stats: CallStats
+    ) -> T:
+        """Run `attempt` until it succeeds, fails permanently or retries run out.
+
+        Args:
+            model: Model ID (selects the circuit breaker).
+            attempt: Performs one request; called again for every retry.
+            call_stats: Accumulates retries and backoff time for this request.
+        """
+        breaker = self.breaker(model)
+        while True:
+            wait = breaker.remaining()
+            if wait > 0:
+                self.stats.breaker_wait_seconds += wait
+                call_stats.backoff_seconds += wait
+                await asyncio.sleep(wait)
+
+            try:
+                result = await attempt()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if breaker.record_failure():
+                    self.stats.breaker_trips += 1
+                if call_stats.retries >= self.max_retries:
+                    self.stats.gave_up += 1
+                    e.add_note(f"Gave up after {call_stats.retries} retries")
+                    raise
+                if self.budget <= 0:
+                    self.stats.budget_exhausted += 1
+                    e.add_note("Run retry budget exhausted")
+                    raise
+
+                self.budget -= 1
+                self.stats.retries += 1
+                delay = self.backoff(call_stats.retries, e)
+                call_stats.retries += 1
+                call_stats.backoff_seconds += delay
+                await asyncio.sleep(delay)
+                continue
+
+            breaker.record_success()
+            return result
+
+
+@lru_cache
+def get_retrier() -> Retrier:
+    """Get the process-wide retrier configured from settings."""
+    settings = config.get_settings()
+    return Retrier(
+        max_retries=settings.md_edit_bench_max_retries,
+        budget=settings.md_edit_bench_retry_budget,
+    )
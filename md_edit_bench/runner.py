@@ -3,12 +3,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from lmnr import observe
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 from rich.table import Table
@@ -20,17 +19,29 @@ from md_edit_bench.algorithms import (
     get_all_algorithms,
     list_algorithm_names,
 )
+from md_edit_bench.cache import CacheMode, get_cache
+from md_edit_bench.clients import get_client_pool
+from md_edit_bench.fixtures import FixtureFilter, FixtureIndex
+from md_edit_bench.llm import get_call_options
+from md_edit_bench.manifest import RUNS_DIRNAME, RunManifest
 from md_edit_bench.models import (
     AlgorithmResult,
     BenchmarkRun,
     Fixture,
     LLMUsage,
     TestResult,
-    discover_fixtures,
 )
-from md_edit_bench.scoring import score_output
-
-RESULTS_DIR = Path(__file__).parent.parent / "results"
+from md_edit_bench.results import RESULTS_DIR, ResultsWriter, write_result
+from md_edit_bench.retry import get_retrier, is_retryable
+from md_edit_bench.scheduler import get_scheduler, parse_limits, track_cell
+from md_edit_bench.scoring import get_score_pool
+from md_edit_bench.store import GROUP_BY, STORE_PATH, ResultsStore, run_report
+from md_edit_bench.timing import PHASES, track_phases
+from md_edit_bench.tracing import init_tracing, observe
+from md_edit_bench.utils import get_template_registry
+
+if TYPE_CHECKING:
+    import argparse
 
 console = Console()
 
@@ -40,34 +51,68 @@ async def run_single(
     algorithm: Algorithm,
     model: str,
 ) -> TestResult:
-    """Run a single algorithm on a single fixture."""
-    start_time = time.perf_counter()
-
-    try:
-        result = await algorithm.apply(fixture.initial, fixture.changes, model)
-    except Exception as e:
-        result = AlgorithmResult(
-            output=None,
-            success=False,
-            error=str(e),
-            usage=LLMUsage(),
-        )
+    """Run a single algorithm on a single fixture.
+
+    The result is scored before returning unless the score pool defers scoring,
+    in which case the caller scores it later with `score_result`. Fixtures larger
+    than the algorithm's `max_document_chars` fail without calling the model.
+    """
+    capabilities = algorithm.capabilities
+    with track_phases() as phases:
+        start_time = time.perf_counter()
+
+        # Cheaper cells get dispatched first when the scheduler queue is contended:
+        # shorter fixtures, and single-pass algorithms before multi-pass ones
+        priority = (len(fixture.initial) + len(fixture.changes)) * capabilities.llm_passes
+        with track_cell(priority=priority) as sched_stats:
+            try:
+                if (
+                    capabilities.max_document_chars is not None
+                    and len(fixture.initial) > capabilities.max_document_chars
+                ):
+                    raise ValueError(
+                        f"Document too large for {algorithm.name}: {len(fixture.initial)} "
+                        f"characters (max {capabilities.max_document_chars})"
+                    )
+                result = await algorithm.apply(fixture.initial, fixture.changes, model)
+            except Exception as e:
+                result = AlgorithmResult(
+                    output=None,
+                    success=False,
+                    error=str(e),
+                    usage=LLMUsage(),
+                    retryable=is_retryable(e),
+                )
 
-    duration = time.perf_counter() - start_time
-    score = score_output(result.output, fixture.expected)
+        duration = time.perf_counter() - start_time
 
-    return TestResult(
+    test_result = TestResult(
         fixture=fixture.name,
         algorithm=algorithm.name,
         model=model,
         algorithm_result=result,
-        exact_match=score.exact_match,
-        similarity_score=score.overall_score,
-        lines_missing=score.lines_missing,
-        lines_extra=score.lines_extra,
-        diff_from_expected=score.unified_diff,
         duration_seconds=duration,
+        phases=phases,
+        queue_wait_seconds=sched_stats.queue_wait_seconds,
+        max_queue_depth=sched_stats.max_queue_depth,
+        throttle_events=sched_stats.throttle_events,
     )
+    if not get_score_pool().defer:
+        await score_result(test_result, fixture)
+    return test_result
+
+
+async def score_result(result: TestResult, fixture: Fixture) -> None:
+    """Score a result against its fixture's expected document (in the score pool)."""
+    start_time = time.perf_counter()
+    score = await get_score_pool().score(fixture, result.algorithm_result.output)
+    result.phases.add("score", time.perf_counter() - start_time)
+
+    result.exact_match = score.exact_match
+    result.similarity_score = score.overall_score
+    result.lines_missing = score.lines_missing
+    result.lines_extra = score.lines_extra
+    result.diff = score.diff
 
 
 async def run_benchmark(
@@ -75,13 +120,23 @@ async def run_benchmark(
     models: list[str] | None = None,
     category: str | None = None,
     fixtures_dir: Path | None = None,
+    *,
+    writer: ResultsWriter | None = None,
+    manifest: RunManifest | None = None,
+    fixture_filter: FixtureFilter | None = None,
+    fixtures: list[Fixture] | None = None,
 ) -> BenchmarkRun:
-    """Run benchmark across algorithms, models, and fixtures."""
-    fixtures_dir = fixtures_dir or config.FIXTURES_DIR
-    fixtures = discover_fixtures(fixtures_dir)
-
-    if category:
-        fixtures = [f for f in fixtures if f.name.startswith(f"{category}/")]
+    """Run benchmark across algorithms, models, and fixtures.
+
+    Fixtures are selected by category and `fixture_filter` before any is read,
+    unless already loaded `fixtures` are passed in.
+    With a writer, each result is handed to it as soon as it is scored. With a
+    manifest, cells it records as completed are not run again; their recorded
+    results (metrics only) are included in the returned run.
+    """
+    if fixtures is None:
+        fixtures_dir = fixtures_dir or config.FIXTURES_DIR
+        fixtures = FixtureIndex(fixtures_dir).load(category, fixture_filter)
 
     if not fixtures:
         console.print("[yellow]No fixtures found![/yellow]")
@@ -98,11 +153,52 @@ async def run_benchmark(
 
     test_models = models if models else config.DEFAULT_MODELS
 
+    if manifest:
+        manifest.plan(fixtures, algo_instances, test_models)
+    completed: list[TestResult] = []
+    pending: list[tuple[Fixture, list[tuple[Algorithm, str]]]] = []
+    for fixture in fixtures:
+        cells: list[tuple[Algorithm, str]] = []
+        for algo in algo_instances:
+            for model in test_models:
+                done = manifest.completed(fixture.name, algo.name, model) if manifest else None
+                if done:
+                    completed.append(done)
+                else:
+                    cells.append((algo, model))
+        if cells:
+            pending.append((fixture, cells))
+
     total_tasks = len(fixtures) * len(algo_instances) * len(test_models)
-    console.print(f"\n[bold blue]Running {total_tasks} tests...[/bold blue]")
-    console.print(f"  Fixtures: {len(fixtures)}")
+    if completed:
+        console.print(
+            f"\n[bold blue]Resuming: {len(completed)} of {total_tasks} tests "
+            "already completed[/bold blue]"
+        )
+    console.print(f"\n[bold blue]Running {total_tasks - len(completed)} tests...[/bold blue]")
+    console.print(f"  Fixtures: {len(pending)}")
     console.print(f"  Algorithms: {[a.name for a in algo_instances]}")
 
+    score_pool = get_score_pool()
+    score_pool.start([fixture for fixture, _cells in pending])
+    try:
+        results = await _run_fixtures(pending, writer)
+    finally:
+        score_pool.shutdown()
+
+    return BenchmarkRun(timestamp=datetime.now(), results=completed + results)
+
+
+async def _run_fixtures(
+    pending: list[tuple[Fixture, list[tuple[Algorithm, str]]]],
+    writer: ResultsWriter | None,
+) -> list[TestResult]:
+    """Run each fixture's (algorithm, model) cells with a progress bar.
+
+    If scoring is deferred, results are scored once every cell has run.
+    """
+    total_tasks = sum(len(cells) for _fixture, cells in pending)
+    defer_scoring = get_score_pool().defer
     results: list[TestResult] = []
 
     with Progress(
@@ -114,33 +210,53 @@ async def run_benchmark(
     ) as progress:
         progress_task = progress.add_task("Processing...", total=total_tasks)
 
-        async def run_fixture_and_track(fixture: Fixture) -> list[TestResult]:
-            fixture_results = await _run_fixture(fixture, algo_instances, test_models)
+        async def run_fixture_and_track(
+            fixture: Fixture, cells: list[tuple[Algorithm, str]]
+        ) -> list[TestResult]:
+            fixture_results = await _run_fixture(fixture, cells, None if defer_scoring else writer)
             for result in fixture_results:
-                status = "✓" if result.passed else "✗"
+                status = "·" if defer_scoring else "✓" if result.passed else "✗"
                 desc = f"[{status}] {result.algorithm}/{result.fixture}"
                 progress.update(progress_task, advance=1, description=desc)
             return fixture_results
 
         all_fixture_results = await asyncio.gather(
-            *[run_fixture_and_track(fixture) for fixture in fixtures]
+            *[run_fixture_and_track(fixture, cells) for fixture, cells in pending]
         )
         for fixture_results in all_fixture_results:
             results.extend(fixture_results)
 
-    return BenchmarkRun(timestamp=datetime.now(), results=results)
+        if defer_scoring:
+            fixtures_by_name = {fixture.name: fixture for fixture, _cells in pending}
+            scoring_task = progress.add_task("Scoring...", total=len(results))
+
+            async def score_and_track(result: TestResult) -> None:
+                await score_result(result, fixtures_by_name[result.fixture])
+                if writer:
+                    await writer.submit(result)
+                progress.update(scoring_task, advance=1)
+
+            await asyncio.gather(*[score_and_track(result) for result in results])
+
+    return results
 
 
 async def _run_fixture(
     fixture: Fixture,
-    algorithms: list[Algorithm],
-    models: list[str],
+    cells: list[tuple[Algorithm, str]],
+    writer: ResultsWriter | None = None,
 ) -> list[TestResult]:
-    """Run all algorithms on a single fixture (traced as a span)."""
+    """Run (algorithm, model) cells on a single fixture (traced as a span)."""
+
+    async def run_and_write(algorithm: Algorithm, model: str) -> TestResult:
+        result = await _run_algorithm(fixture, algorithm, model)
+        if writer:
+            await writer.submit(result)
+        return result
 
     @observe(name=f"fixture:{fixture.name}")
     async def _traced() -> list[TestResult]:
-        coros = [_run_algorithm(fixture, algo, model) for algo in algorithms for model in models]
+        coros = [run_and_write(algo, model) for algo, model in cells]
         return list(await asyncio.gather(*coros))
 
     return await _traced()
@@ -162,6 +278,49 @@ async def _run_algorithm(
     return await _traced()
 
 
+def print_phase_summary(run: BenchmarkRun) -> None:
+    """Print average time per phase for each algorithm (model vs local work)."""
+    table = Table(title="Time by Phase (average per test)")
+    table.add_column("Algorithm", style="cyan")
+    for label in ("Prompt", "LLM", "Parse", "Apply", "Score"):
+        table.add_column(label, justify="right")
+    table.add_column("LLM p50/call", justify="right")
+    table.add_column("Local %", justify="right")
+
+    for algo_name, results in sorted(run.by_algorithm().items()):
+        total = len(results)
+        averages = [sum(r.phases.get(phase) for r in results) / total for phase in PHASES]
+        latencies = sorted(
+            call.latency_seconds
+            for r in results
+            for call in r.algorithm_result.usage.calls
+            if call.latency_seconds is not None
+        )
+        p50 = f"{latencies[len(latencies) // 2]:.2f}s" if latencies else "-"
+        # Parsing and applying edits, as a share of the algorithm's own wall time
+        local = sum(r.phases.parse_seconds + r.phases.apply_seconds for r in results)
+        duration = sum(r.duration_seconds for r in results)
+        local_pct = f"{local / duration * 100:.1f}%" if duration else "-"
+        table.add_row(
+            algo_name,
+            *(
+                f"{seconds:.2f}s" if seconds >= 1 else f"{seconds * 1000:.1f}ms"
+                for seconds in averages
+            ),
+            p50,
+            local_pct,
+        )
+
+    console.print()
+    console.print(table)
+    templates = get_template_registry().totals()
+    if templates.renders:
+        console.print(
+            f"[dim]Prompt templates: {templates.renders} renders, "
+            f"{templates.cache_hits} reused, {templates.render_seconds * 1000:.1f}ms rendering[/dim]"
+        )
+
+
 def print_summary(run: BenchmarkRun) -> None:
     """Print summary table of benchmark results."""
     if not run.results:
@@ -177,6 +336,10 @@ def print_summary(run: BenchmarkRun) -> None:
     table.add_column("Warn", justify="right")
     table.add_column("Score", justify="right")
     table.add_column("Time", justify="right")
+    streamed = any(r.streamed_calls for r in run.results)
+    if streamed:
+        table.add_column("TTFT", justify="right")
+        table.add_column("Tok/s", justify="right")
     table.add_column("Cost", justify="right")
 
     for r in sorted(run.results, key=lambda x: (x.algorithm, x.model, x.fixture)):
@@ -192,6 +355,12 @@ def print_summary(run: BenchmarkRun) -> None:
         score_str = f"{r.similarity_score:.2f}"
         time_str = f"{r.duration_seconds:.1f}s"
         cost_str = f"${r.cost_usd:.4f}"
+        stream_strs: list[str] = []
+        if streamed:
+            stream_strs = [
+                f"{r.ttft_seconds:.2f}s" if r.ttft_seconds is not None else "-",
+                f"{r.tokens_per_second:.0f}" if r.tokens_per_second is not None else "-",
+            ]
 
         table.add_row(
             r.algorithm,
@@ -201,6 +370,7 @@ def print_summary(run: BenchmarkRun) -> None:
             warn_str,
             score_str,
             time_str,
+            *stream_strs,
             cost_str,
         )
 
@@ -214,6 +384,8 @@ def print_summary(run: BenchmarkRun) -> None:
         total = len(results)
         pct = (passed / total * 100) if total else 0
         avg_time = sum(r.duration_seconds for r in results) / total if total else 0
+        avg_wait = sum(r.queue_wait_seconds for r in results) / total if total else 0
+        retries = sum(r.algorithm_result.usage.retries for r in results)
         total_cost = sum(r.cost_usd for r in results)
         avg_missing = sum(r.lines_missing for r in results) / total if total else 0
         avg_extra = sum(r.lines_extra for r in results) / total if total else 0
@@ -221,20 +393,67 @@ def print_summary(run: BenchmarkRun) -> None:
 
         style = "green" if pct >= 80 else "yellow" if pct >= 50 else "red"
         warn_part = f"  [yellow]warnings: {total_warnings}[/yellow]" if total_warnings > 0 else ""
+        if retries:
+            warn_part += f"  [yellow]retries: {retries}[/yellow]"
+        ttfts = [r.ttft_seconds for r in results if r.ttft_seconds is not None]
+        rates = [r.tokens_per_second for r in results if r.tokens_per_second is not None]
+        stream_part = ""
+        if ttfts:
+            stream_part += f"  ttft: {sum(ttfts) / len(ttfts):.2f}s"
+        if rates:
+            stream_part += f"  {sum(rates) / len(rates):.0f} tok/s"
+        tokens_in = sum(r.algorithm_result.usage.tokens_in for r in results)
+        tokens_cached = sum(r.algorithm_result.usage.tokens_cached for r in results)
+        cache_part = f"  cached: {100 * tokens_cached / tokens_in:.0f}%" if tokens_cached else ""
         console.print(
             f"  {algo_name}: [{style}]{passed}/{total} ({pct:.0f}%)[/{style}] "
-            f"avg: {avg_time:.1f}s  ${total_cost:.4f}  "
+            f"avg: {avg_time:.1f}s (wait {avg_wait:.1f}s){stream_part}  "
+            f"${total_cost:.4f}{cache_part}  "
             f"lines: [red]-{avg_missing:.1f}[/red]/[green]+{avg_extra:.1f}[/green]{warn_part}"
         )
 
+    print_phase_summary(run)
+
     # Overall summary
     console.print(
         f"\n[bold]Overall: {run.total_passed}/{run.total_tests} passed "
         f"({run.total_passed / run.total_tests * 100:.1f}%)[/bold]"
     )
     console.print(f"Total time: {run.total_duration_seconds:.1f}s")
+    total_wait = sum(r.queue_wait_seconds for r in run.results)
+    total_throttles = sum(r.throttle_events for r in run.results)
+    if total_wait or total_throttles:
+        console.print(
+            f"Scheduler wait: {total_wait:.1f}s  throttle events: {total_throttles}  "
+            f"max queue depth: {max(r.max_queue_depth for r in run.results)}"
+        )
     console.print(f"Total cost: ${run.total_cost_usd:.4f}")
 
+    retry_stats = get_retrier().stats
+    if retry_stats.retries or retry_stats.gave_up or retry_stats.budget_exhausted:
+        backoff = sum(r.algorithm_result.usage.backoff_seconds for r in run.results)
+        console.print(
+            f"Retries: {retry_stats.retries} ({backoff:.1f}s backoff), "
+            f"gave up: {retry_stats.gave_up}, budget exhausted: {retry_stats.budget_exhausted}, "
+            f"circuit breaker trips: {retry_stats.breaker_trips}"
+        )
+
+    cache = get_cache()
+    if cache.mode != "off":
+        stats = cache.stats
+        lookups = stats.hits + stats.misses
+        hit_pct = (stats.hits / lookups * 100) if lookups else 0
+        console.print(
+            f"LLM cache ({cache.mode}): {stats.hits} hits / {stats.misses} misses "
+            f"({hit_pct:.0f}% hit rate), {stats.writes} writes, {stats.evictions} evictions"
+        )
+
+    for host, pool in get_client_pool().stats().items():
+        console.print(
+            f"HTTP pool ({host}): {pool.requests} requests over {pool.connections_opened} "
+            f"connections ({pool.handshakes_avoided} handshakes avoided)"
+        )
+
 
 def print_failures(run: BenchmarkRun, show_diff: bool = False) -> None:
     """Print details about failed tests."""
@@ -266,71 +485,26 @@ def print_failures(run: BenchmarkRun, show_diff: bool = False) -> None:
                     f"    ... and {len(r.algorithm_result.warnings) - 5} more", style="dim"
                 )
 
-        if show_diff and r.diff_from_expected:
+        diff = r.diff_from_expected if show_diff else ""
+        if diff:
             console.print("  Diff from expected:")
-            for line in r.diff_from_expected.split("\n")[:20]:
+            for line in diff.split("\n")[:20]:
                 if line.startswith("+"):
                     console.print(f"    {line}", style="green")
                 elif line.startswith("-"):
                     console.print(f"    {line}", style="red")
                 else:
                     console.print(f"    {line}", style="dim")
-            if r.diff_from_expected.count("\n") > 20:
+            if diff.count("\n") > 20:
                 console.print("    ... (truncated)")
 
 
-def save_results(run: BenchmarkRun) -> None:
-    """Save benchmark results to results/ directory."""
-    # if RESULTS_DIR.exists():
-    #    shutil.rmtree(RESULTS_DIR)
-    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-
+def save_results(run: BenchmarkRun, results_dir: Path = RESULTS_DIR) -> None:
+    """Save all results of a finished run to results/ (see md_edit_bench.results)."""
     for r in run.results:
-        # Build directory path: results/{category}/{fixture}/{algorithm}/{model}/
-        category, fixture_name = (
-            r.fixture.split("/", 1) if "/" in r.fixture else ("default", r.fixture)
-        )
-        model_part = r.model.split("/")[-1]
-        result_dir = RESULTS_DIR / category / fixture_name / r.algorithm / model_part
-        result_dir.mkdir(parents=True, exist_ok=True)
-
-        # result.json - metrics and metadata
-        result_data = {
-            "fixture": r.fixture,
-            "algorithm": r.algorithm,
-            "model": r.model,
-            "success": r.algorithm_result.success,
-            "error": r.algorithm_result.error,
-            "warning_count": r.warning_count,
-            "warnings": r.algorithm_result.warnings[:20],
-            "exact_match": r.exact_match,
-            "similarity_score": r.similarity_score,
-            "lines_missing": r.lines_missing,
-            "lines_extra": r.lines_extra,
-            "duration_seconds": r.duration_seconds,
-            "tokens_in": r.algorithm_result.usage.tokens_in,
-            "tokens_out": r.algorithm_result.usage.tokens_out,
-            "cost_usd": r.algorithm_result.usage.cost_usd,
-        }
-        (result_dir / "result.json").write_text(json.dumps(result_data, indent=2), encoding="utf-8")
-
-        # output.md - algorithm's output
-        if r.algorithm_result.output:
-            (result_dir / "output.md").write_text(r.algorithm_result.output, encoding="utf-8")
-
-        # diff.txt - diff from expected
-        if r.diff_from_expected:
-            (result_dir / "diff.txt").write_text(r.diff_from_expected, encoding="utf-8")
-
-        # LLM calls
-        for i, call in enumerate(r.algorithm_result.usage.calls, 1):
-            prefix = f"llm_{i}_" if len(r.algorithm_result.usage.calls) > 1 else "llm_"
-            (result_dir / f"{prefix}request.txt").write_text(
-                f"Model: {call.model}\n\n{call.request}", encoding="utf-8"
-            )
-            (result_dir / f"{prefix}response.txt").write_text(call.response, encoding="utf-8")
+        write_result(r, results_dir)
 
-    console.print(f"\n[dim]Results saved to {RESULTS_DIR}/[/dim]")
+    console.print(f"\n[dim]Results saved to {results_dir}/[/dim]")
 
 
 @observe(name="benchmark_run")
@@ -338,15 +512,51 @@ async def _run_benchmark_traced(
     algorithms: list[str] | None,
     models: list[str] | None,
     category: str | None,
+    *,
+    writer: ResultsWriter,
+    manifest: RunManifest,
+    fixtures: list[Fixture],
 ) -> BenchmarkRun:
     """Wrapper to trace the entire benchmark run as a root span."""
     return await run_benchmark(
         algorithms=algorithms,
         models=models,
         category=category,
+        writer=writer,
+        manifest=manifest,
+        fixtures=fixtures,
     )
 
 
+def _check_category(
+    parser: argparse.ArgumentParser, index: FixtureIndex, category: str | None
+) -> None:
+    """Exit with a usage error unless the fixtures directory has this category."""
+    if category is not None and category not in index.categories:
+        parser.error(
+            f"argument --category/-c: invalid choice: '{category}' "
+            f"(choose from {', '.join(index.categories)})"
+        )
+
+
+def _load_fixtures(
+    parser: argparse.ArgumentParser,
+    index: FixtureIndex,
+    category: str | None,
+    fixture_filter: FixtureFilter,
+) -> list[Fixture]:
+    """Load the fixtures a run selects, exiting with a usage error on a bad selection.
+
+    Unknown categories and invalid fixture metadata are reported before anything is
+    written for the run.
+    """
+    _check_category(parser, index, category)
+    try:
+        return index.load(category, fixture_filter)
+    except ValueError as e:
+        parser.error(str(e))
+
+
 async def main_async() -> None:
     """Run benchmarks from command line."""
     import argparse
@@ -372,8 +582,35 @@ async def main_async() -> None:
         "--category",
         "-c",
         type=str,
-        choices=config.CATEGORIES,
-        help="Fixture category to test (default: all)",
+        help=f"Fixture category to test, e.g. {', '.join(config.CATEGORIES)} (default: all)",
+    )
+    parser.add_argument(
+        "--fixture",
+        "-f",
+        type=str,
+        action="append",
+        dest="fixture_patterns",
+        metavar="PATTERN",
+        help="Fixture(s) to test: glob on category/name or name, e.g. 'hard/*' or '*table*'",
+    )
+    parser.add_argument(
+        "--min-lines",
+        type=int,
+        default=None,
+        help="Only fixtures whose initial document has at least this many lines",
+    )
+    parser.add_argument(
+        "--max-lines",
+        type=int,
+        default=None,
+        help="Only fixtures whose initial document has at most this many lines",
+    )
+    parser.add_argument(
+        "--tag",
+        type=str,
+        action="append",
+        dest="tags",
+        help="Only fixtures with this tag in their .meta.toml (repeat to require several)",
     )
     parser.add_argument(
         "--verbose",
@@ -387,29 +624,365 @@ async def main_async() -> None:
         action="store_true",
         help="Show diffs for failures (implies --verbose)",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Maximum in-flight LLM requests overall (0 = unlimited, "
+            f"default: {config.get_settings().md_edit_bench_max_concurrency})"
+        ),
+    )
+    parser.add_argument(
+        "--rpm",
+        type=str,
+        action="append",
+        help="Requests/min limit: VALUE (per model), PROVIDER=VALUE or PROVIDER/MODEL=VALUE",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=str,
+        action="append",
+        help="Tokens/min limit: VALUE (per model), PROVIDER=VALUE or PROVIDER/MODEL=VALUE",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=None,
+        help=(
+            "Retries per LLM request on timeouts, 429 and 5xx "
+            f"(default: {config.get_settings().md_edit_bench_max_retries})"
+        ),
+    )
+    parser.add_argument(
+        "--score-workers",
+        type=int,
+        default=None,
+        help="Processes used to score results (0 = score in the event loop, default: CPU cores)",
+    )
+    parser.add_argument(
+        "--defer-scoring",
+        action="store_true",
+        help="Score all results after every LLM call has finished",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="RUN_ID",
+        help=(
+            "Continue an interrupted run, skipping completed tests "
+            "(selections not given default to the run's)"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream completions and report time-to-first-token and tokens/sec",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--record",
+        action="store_const",
+        const="record",
+        dest="cache_mode",
+        help="Call the provider for every request and record responses to the LLM cache",
+    )
+    cache_group.add_argument(
+        "--replay",
+        action="store_const",
+        const="replay",
+        dest="cache_mode",
+        help="Serve cached responses; call the provider and record on cache miss",
+    )
+    cache_group.add_argument(
+        "--offline",
+        action="store_const",
+        const="offline",
+        dest="cache_mode",
+        help="Serve cached responses only; fail requests that are not cached",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser(
+        "bench-appliers",
+        help="Benchmark each algorithm's parse+apply step offline (no LLM calls)",
+    )
+    bench_parser.add_argument(
+        "--algorithm",
+        "-a",
+        type=str,
+        action="append",
+        dest="algorithms",
+        choices=list_algorithm_names(),
+        help="Algorithm(s) to benchmark (default: all with an offline applier)",
+    )
+    bench_parser.add_argument(
+        "--category",
+        "-c",
+        type=str,
+        help="Fixture category to benchmark (default: all)",
+    )
+    bench_parser.add_argument(
+        "--source",
+        choices=["synthesized", "recorded", "all"],
+        default="synthesized",
+        help="Responses to apply: synthesized from fixtures, recorded in results/, or both",
+    )
+    bench_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum seconds to spend timing each case (default: 0.2)",
+    )
+    bench_parser.add_argument(
+        "--min-runs",
+        type=int,
+        default=20,
+        help="Minimum timed runs per case (default: 20)",
+    )
+    bench_parser.add_argument(
+        "--warmup",
+        type=int,
+        default=3,
+        help="Untimed runs before timing each case (default: 3)",
+    )
+    bench_parser.add_argument(
+        "--save",
+        type=Path,
+        help="Write results to this JSON file (usable as a --baseline)",
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Compare p50 latencies with a saved JSON file; exit 1 on regressions",
+    )
+    bench_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed p50 slowdown against the baseline (default: 0.25 = 25%%)",
+    )
+
+    report_parser = subparsers.add_parser(
+        "report",
+        help="Aggregate results across runs from the results store (no LLM calls)",
+    )
+    report_parser.add_argument(
+        "--by",
+        "-b",
+        action="append",
+        choices=GROUP_BY,
+        help="Group by (repeatable, default: algorithm and model)",
+    )
+    report_parser.add_argument(
+        "--run",
+        "-r",
+        action="append",
+        dest="run_ids",
+        metavar="RUN_ID",
+        help="Run(s) to include (default: the --last runs)",
+    )
+    report_parser.add_argument(
+        "--last",
+        type=int,
+        default=1,
+        help="Include the N most recent runs (0 = all, default: 1)",
+    )
+    report_parser.add_argument(
+        "--algorithm",
+        "-a",
+        type=str,
+        action="append",
+        dest="algorithms",
+        help="Only these algorithm(s)",
+    )
+    report_parser.add_argument(
+        "--model",
+        "-m",
+        type=str,
+        action="append",
+        dest="models",
+        help="Only these model(s)",
+    )
+    report_parser.add_argument(
+        "--category",
+        "-c",
+        type=str,
+        help="Only this fixture category",
+    )
+    report_parser.add_argument(
+        "--store",
+        type=Path,
+        default=STORE_PATH,
+        help=f"Results store (default: {STORE_PATH})",
+    )
 
     args = parser.parse_args()
 
+    command: str | None = args.command  # pyright: ignore[reportAny]
+    fixture_index = FixtureIndex(config.FIXTURES_DIR)
+    if command == "bench-appliers":
+        # Imports every applier, so only loaded for this command
+        from md_edit_bench import bench
+
+        bench_algorithms: list[str] | None = args.algorithms  # pyright: ignore[reportAny]
+        if missing := sorted(set(bench_algorithms or ()) - bench.APPLIERS.keys()):
+            bench_parser.error(f"no offline applier for: {', '.join(missing)}")
+        _check_category(bench_parser, fixture_index, args.category)  # pyright: ignore[reportAny]
+        raise SystemExit(
+            bench.run_bench_appliers(
+                algorithms=bench_algorithms,
+                category=args.category,  # pyright: ignore[reportAny]
+                source=args.source,  # pyright: ignore[reportAny]
+                results_dir=RESULTS_DIR,
+                min_time=args.min_time,  # pyright: ignore[reportAny]
+                min_runs=args.min_runs,  # pyright: ignore[reportAny]
+                warmup=args.warmup,  # pyright: ignore[reportAny]
+                save=args.save,  # pyright: ignore[reportAny]
+                baseline=args.baseline,  # pyright: ignore[reportAny]
+                max_regression=args.max_regression,  # pyright: ignore[reportAny]
+            )
+        )
+    if command == "report":
+        _check_category(report_parser, fixture_index, args.category)  # pyright: ignore[reportAny]
+        raise SystemExit(
+            run_report(
+                store_path=args.store,  # pyright: ignore[reportAny]
+                by=args.by or ["algorithm", "model"],  # pyright: ignore[reportAny]
+                run_ids=args.run_ids,  # pyright: ignore[reportAny]
+                last=args.last,  # pyright: ignore[reportAny]
+                algorithms=args.algorithms,  # pyright: ignore[reportAny]
+                models=args.models,  # pyright: ignore[reportAny]
+                category=args.category,  # pyright: ignore[reportAny]
+            )
+        )
+
     # Extract typed values from argparse
     algorithms: list[str] | None = args.algorithms  # pyright: ignore[reportAny]
     models: list[str] | None = args.models  # pyright: ignore[reportAny]
     category: str | None = args.category  # pyright: ignore[reportAny]
     verbose: bool = args.verbose  # pyright: ignore[reportAny]
     show_diff: bool = args.diff  # pyright: ignore[reportAny]
+    cache_mode: CacheMode | None = args.cache_mode  # pyright: ignore[reportAny]
+    max_concurrency: int | None = args.max_concurrency  # pyright: ignore[reportAny]
+    rpm_specs: list[str] | None = args.rpm  # pyright: ignore[reportAny]
+    tpm_specs: list[str] | None = args.tpm  # pyright: ignore[reportAny]
+    max_retries: int | None = args.max_retries  # pyright: ignore[reportAny]
+    stream: bool = args.stream  # pyright: ignore[reportAny]
+    score_workers: int | None = args.score_workers  # pyright: ignore[reportAny]
+    defer_scoring: bool = args.defer_scoring  # pyright: ignore[reportAny]
+    resume: str | None = args.resume  # pyright: ignore[reportAny]
+    fixture_patterns: list[str] | None = args.fixture_patterns  # pyright: ignore[reportAny]
+    min_lines: int | None = args.min_lines  # pyright: ignore[reportAny]
+    max_lines: int | None = args.max_lines  # pyright: ignore[reportAny]
+    tags: list[str] | None = args.tags  # pyright: ignore[reportAny]
+    fixture_filter = FixtureFilter(
+        patterns=tuple(fixture_patterns or ()),
+        min_lines=min_lines,
+        max_lines=max_lines,
+        tags=tuple(tags or ()),
+    )
+
+    try:
+        rpm = parse_limits(rpm_specs)
+        tpm = parse_limits(tpm_specs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    runs_dir = RESULTS_DIR / RUNS_DIRNAME
+    manifest: RunManifest | None = None
+    if resume:
+        try:
+            manifest = RunManifest.load(runs_dir, resume)
+        except FileNotFoundError:
+            parser.error(f"No run manifest for run {resume} in {runs_dir}/")
+        except ValueError as e:
+            parser.error(str(e))
+        algorithms = algorithms or manifest.header.algorithms
+        models = models or manifest.header.models
+        category = category or manifest.header.category
+        if not fixture_filter:
+            fixture_filter = manifest.header.fixture_filter or fixture_filter
+
+    # Select fixtures first, so a selection with nothing to run leaves no run behind
+    fixtures = _load_fixtures(parser, fixture_index, category, fixture_filter)
+    if not fixtures:
+        console.print("[yellow]No fixtures found![/yellow]")
+        return
+    if manifest is None:
+        manifest = RunManifest.create(
+            runs_dir,
+            algorithms=algorithms or list_algorithm_names(),
+            models=models or config.DEFAULT_MODELS,
+            category=category,
+            fixture_filter=fixture_filter,
+        )
 
     console.print("[bold]Markdown Edit LLM Benchmark[/bold]\n")
     console.print(f"Fixtures directory: {config.FIXTURES_DIR}")
 
-    if config.LAMINAR_ENABLED:
+    if cache_mode:
+        cache = get_cache()
+        cache.mode = cache_mode
+        console.print(f"[green]LLM cache: {cache_mode}[/green] ({cache.directory})")
+
+    scheduler = get_scheduler()
+    if max_concurrency is not None or rpm or tpm:
+        scheduler.configure(
+            max_concurrency=(
+                max_concurrency if max_concurrency is not None else scheduler.max_concurrency
+            ),
+            rpm=rpm,
+            tpm=tpm,
+        )
+    limits = [f"max concurrency: {scheduler.max_concurrency or 'unlimited'}"]
+    limits += [f"rpm {scope or '*'}={value:g}" for scope, value in rpm.items()]
+    limits += [f"tpm {scope or '*'}={value:g}" for scope, value in tpm.items()]
+    console.print(f"[dim]Scheduler: {', '.join(limits)}[/dim]")
+
+    if max_retries is not None:
+        get_retrier().max_retries = max_retries
+
+    score_pool = get_score_pool()
+    if score_workers is not None:
+        score_pool.workers = score_workers
+    score_pool.defer = defer_scoring
+    scoring = f"{score_pool.workers} worker processes" if score_pool.workers else "inline"
+    console.print(f"[dim]Scoring: {scoring}{', deferred' if defer_scoring else ''}[/dim]")
+
+    if stream:
+        get_call_options().stream = True
+    if get_call_options().stream:
+        console.print("[dim]Streaming completions (structured-output calls are not streamed)[/dim]")
+
+    if init_tracing():
         console.print("[green]Laminar tracing: enabled[/green]")
     else:
         console.print("[dim]Laminar tracing: disabled[/dim]")
 
-    run = await _run_benchmark_traced(
-        algorithms=algorithms,
-        models=models,
-        category=category,
-    )
+    console.print(f"Run ID: {manifest.run_id} (resume with --resume {manifest.run_id})")
+
+    # Results are written as they complete; outputs stay in memory only for --diff
+    store = ResultsStore(STORE_PATH)
+    writer = ResultsWriter(RESULTS_DIR, keep_outputs=show_diff, manifest=manifest, store=store)
+    writer.start()
+    try:
+        run = await _run_benchmark_traced(
+            algorithms=algorithms,
+            models=models,
+            category=category,
+            writer=writer,
+            manifest=manifest,
+            fixtures=fixtures,
+        )
+    finally:
+        await get_client_pool().aclose()
+        try:
+            writer.close()
+        finally:
+            manifest.close()
+            store.close()
+        console.print(f"\n[dim]{writer.written} results saved to {RESULTS_DIR}/[/dim]")
 
     console.print()
     print_summary(run)
@@ -417,8 +990,6 @@ async def main_async() -> None:
     if verbose or show_diff:
         print_failures(run, show_diff=show_diff)
 
-    save_results(run)
-
 
 def main() -> None:
     """Entry point."""
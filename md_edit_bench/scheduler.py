@@ -0,0 +1,275 @@
+"""Request scheduler: global concurrency gate plus per-model/provider rate limits.
+
+Every network-bound call_llm request passes through the scheduler. Requests wait
+for rate-limit budget (token buckets for requests/min and tokens/min), then for
+one of `max_concurrency` global slots, granted in priority order (lower first -
+the runner uses fixture size so short, cheap fixtures go first).
+
+Wait time, queue depth and throttle events are accumulated into the
+SchedulerStats of the test cell that issued the request (tracked via a
+context variable set by the runner), so scheduler latency can be separated
+from model latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from md_edit_bench import config
+
+
+@dataclass
+class SchedulerStats:
+    """Scheduler activity attributed to one test cell (fixture x algorithm x model)."""
+
+    requests: int = 0
+    queue_wait_seconds: float = 0.0
+    max_queue_depth: int = 0
+    throttle_events: int = 0
+
+
+@dataclass
+class _Cell:
+    priority: float
+    stats: SchedulerStats = field(default_factory=SchedulerStats)
+
+
+_current_cell: ContextVar[_Cell | None] = ContextVar("scheduler_cell", default=None)
+
+
+@contextmanager
+def track_cell(priority: float = 0.0) -> Generator[SchedulerStats]:
+    """Attribute all requests made inside this block to one test cell.
+
+    Args:
+        priority: Dispatch priority for the cell's requests (lower runs first).
+    """
+    cell = _Cell(priority=priority)
+    token = _current_cell.set(cell)
+    try:
+        yield cell.stats
+    finally:
+        _current_cell.reset(token)
+
+
+class TokenBucket:
+    """Budget of `per_minute` units that refills continuously."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> bool:
+        """Wait until `amount` units are available and take them.
+
+        Returns True if the caller had to wait (a throttle event).
+        """
+        # A single request larger than the whole budget must still be able to run
+        amount = min(amount, self.capacity)
+        throttled = False
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                throttled = True
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+        return throttled
+
+    def debit(self, amount: float) -> None:
+        """Charge units after the fact (e.g. actual tokens beyond the estimate)."""
+        self._refill()
+        self.tokens -= amount
+
+
+class PriorityGate:
+    """Semaphore that grants free slots to the lowest-priority-value waiter first."""
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.in_use = 0
+        self._waiters: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self, priority: float) -> None:
+        """Wait for a slot."""
+        if self.in_use < self.slots and not self._waiters:
+            self.in_use += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just before cancellation - pass it on
+                self.release()
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not future]
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        """Return a slot, handing it directly to the next waiter if any."""
+        while self._waiters:
+            _priority, _seq, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_use -= 1
+
+
+def parse_limits(specs: list[str] | None) -> dict[str, float]:
+    """Parse CLI rate-limit specs into a {scope: per_minute} mapping.
+
+    Each spec is either `VALUE` (default for every model), `PROVIDER=VALUE`
+    (e.g. `anthropic=30`) or `PROVIDER/MODEL=VALUE`. The empty-string key holds
+    the default.
+
+    Raises:
+        ValueError: If a spec is malformed or its value is not a finite number above 0
+    """
+    limits: dict[str, float] = {}
+    for spec in specs or []:
+        scope, sep, value = spec.rpartition("=")
+        if not sep:
+            scope, value = "", spec
+        try:
+            per_minute = float(value)
+        except ValueError:
+            raise ValueError(
+                f"Invalid rate limit '{spec}' (expected VALUE or SCOPE=VALUE)"
+            ) from None
+        # A bucket with a rate of 0 or less never refills (and `inf`/`nan` never drain)
+        if not math.isfinite(per_minute) or per_minute <= 0:
+            raise ValueError(f"Invalid rate limit '{spec}' (VALUE must be a number above 0)")
+        limits[scope.strip()] = per_minute
+    return limits
+
+
+class Scheduler:
+    """Global concurrency gate plus per-model/provider request and token buckets."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 0,
+        rpm: dict[str, float] | None = None,
+        tpm: dict[str, float] | None = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum in-flight requests overall (0 = unlimited).
+            rpm: Requests/min limits by scope (see parse_limits).
+            tpm: Tokens/min limits by scope (see parse_limits).
+        """
+        self.configure(max_concurrency, rpm, tpm)
+
+    def configure(
+        self,
+        max_concurrency: int = 0,
+        rpm: dict[str, float] | None = None,
+        tpm: dict[str, float] | None = None,
+    ) -> None:
+        """Replace limits. Must not be called while requests are in flight."""
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm or {}
+        self.tpm = tpm or {}
+        self._gate = PriorityGate(max_concurrency) if max_concurrency > 0 else None
+        self._request_buckets: dict[str, TokenBucket] = {}
+        self._token_buckets: dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def _bucket(
+        model: str, limits: dict[str, float], buckets: dict[str, TokenBucket]
+    ) -> TokenBucket | None:
+        """Resolve the most specific limit for a model: model, then provider, then default."""
+        provider = model.split("/", 1)[0]
+        for scope, key in ((model, model), (provider, provider), ("", model)):
+            if scope in limits:
+                if key not in buckets:
+                    buckets[key] = TokenBucket(limits[scope])
+                return buckets[key]
+        return None
+
+    @asynccontextmanager
+    async def slot(self, model: str, estimated_tokens: int = 0) -> AsyncGenerator[_Reservation]:
+        """Wait for rate-limit budget and a concurrency slot, then hold it.
+
+        Args:
+            model: Model ID, used to pick the per-model/provider buckets.
+            estimated_tokens: Prompt size estimate charged against tokens/min up front.
+        """
+        cell = _current_cell.get()
+        priority = cell.priority if cell else 0.0
+        stats = cell.stats if cell else SchedulerStats()
+        stats.requests += 1
+
+        request_bucket = self._bucket(model, self.rpm, self._request_buckets)
+        token_bucket = self._bucket(model, self.tpm, self._token_buckets)
+
+        start = time.perf_counter()
+        if request_bucket and await request_bucket.acquire(1):
+            stats.throttle_events += 1
+        if token_bucket and await token_bucket.acquire(estimated_tokens):
+            stats.throttle_events += 1
+
+        gate = self._gate
+        if gate is not None:
+            stats.max_queue_depth = max(stats.max_queue_depth, gate.queue_depth + 1)
+            await gate.acquire(priority)
+        stats.queue_wait_seconds += time.perf_counter() - start
+
+        reservation = _Reservation(token_bucket, estimated_tokens)
+        try:
+            yield reservation
+        finally:
+            if gate is not None:
+                gate.release()
+
+
+class _Reservation:
+    """Handle for reconciling the up-front token estimate with actual usage."""
+
+    def __init__(self, token_bucket: TokenBucket | None, estimated_tokens: int):
+        self._token_bucket = token_bucket
+        self._estimated_tokens = estimated_tokens
+
+    def record_usage(self, tokens: int) -> None:
+        """Charge the difference between actual and estimated tokens."""
+        if self._token_bucket is not None and tokens > self._estimated_tokens:
+            self._token_bucket.debit(tokens - self._estimated_tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) for up-front budgeting."""
+    return len(text) // 4 + 1
+
+
+@lru_cache
+def get_scheduler() -> Scheduler:
+    """Get the process-wide scheduler configured from settings."""
+    return Scheduler(max_concurrency=config.get_settings().md_edit_bench_max_concurrency)
@@ -2,8 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import difflib
-from dataclasses import dataclass
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+from md_edit_bench.config import get_settings
+from md_edit_bench.models import Fixture
+from md_edit_bench.similarity import SimilarityBackend, get_similarity
 
 
 @dataclass
@@ -21,14 +32,20 @@ class DiffScore:
 
     # Similarity (0.0 - 1.0)
     line_similarity: float  # Jaccard similarity on lines
-    char_similarity: float  # difflib.SequenceMatcher ratio
+    char_similarity: float  # Character match ratio (see md_edit_bench.similarity)
 
     # Structural
     headers_preserved: bool  # All headers from expected present
     header_order_correct: bool  # Headers in same order
 
-    # The diff itself (for inspection)
-    unified_diff: str  # Unified diff showing differences
+    # The diff itself (for inspection), rendered on demand. None once returned by
+    # a score worker; ScorePool attaches a new handle in the calling process.
+    diff: DiffHandle | None
+
+    @cached_property
+    def unified_diff(self) -> str:
+        """Unified diff showing differences (empty for an exact match)."""
+        return self.diff.render() if self.diff else ""
 
     @property
     def overall_score(self) -> float:
@@ -58,15 +75,93 @@ class DiffScore:
         return self.overall_score >= 0.96 and self.lines_missing <= 2
 
 
+@dataclass(frozen=True)
+class ExpectedProfile:
+    """The expected-document side of scoring, computed once per document.
+
+    Every result for a fixture is scored against the same expected document, so
+    its normalization, line set and headers are shared (see `expected_profile`).
+    """
+
+    text: str  # Normalized expected document
+    raw_line_count: int  # Lines before normalization (all missing when there is no output)
+    lines: frozenset[str]  # Distinct normalized lines
+    headers: tuple[str, ...]  # Markdown headers, in document order
+    header_set: frozenset[str]
+
+
+@dataclass(frozen=True)
+class DiffHandle:
+    """Unified diff of an output against its expected document, computed on demand.
+
+    Holds references to the output and the shared expected profile rather than the
+    diff text, so results keep no diff in memory and nothing is computed unless the
+    diff is printed or saved.
+    """
+
+    output: str | None  # Algorithm output (None if the algorithm failed)
+    expected: ExpectedProfile
+
+    def lines(self) -> Iterator[str]:
+        """Yield the diff piece by piece (nothing for an exact match)."""
+        if self.output is None:
+            yield "(no output to compare)"
+            return
+        output_norm = _scorer.normalize(self.output)
+        if output_norm != self.expected.text:
+            yield from _scorer.iter_diff(output_norm, self.expected.text)
+
+    def render(self) -> str:
+        """The whole diff as one string."""
+        return "".join(self.lines())
+
+    def write(self, path: Path) -> bool:
+        """Stream the diff to a file.
+
+        Returns:
+            False (and no file is created) if the diff is empty
+        """
+        lines = self.lines()
+        first = next(lines, None)
+        if first is None:
+            return False
+        with path.open("w", encoding="utf-8") as f:
+            _ = f.write(first)
+            f.writelines(lines)
+        return True
+
+
 class DiffScorer:
     """Calculate diff scores between output and expected."""
 
-    def score(self, output: str | None, expected: str) -> DiffScore:
+    def __init__(self, similarity: SimilarityBackend | None = None):
+        """Initialize the scorer.
+
+        Args:
+            similarity: Character similarity backend (defaults to the configured one)
+        """
+        self.similarity: SimilarityBackend = similarity or get_similarity(
+            get_settings().md_edit_bench_similarity
+        )
+
+    def profile(self, expected: str) -> ExpectedProfile:
+        """Precompute everything scoring needs from an expected document."""
+        text = self.normalize(expected)
+        headers = tuple(self._extract_headers(text))
+        return ExpectedProfile(
+            text=text,
+            raw_line_count=len(expected.splitlines()),
+            lines=frozenset(text.splitlines()),
+            headers=headers,
+            header_set=frozenset(headers),
+        )
+
+    def score(self, output: str | None, expected: ExpectedProfile) -> DiffScore:
         """Calculate comprehensive diff score.
 
         Args:
             output: Algorithm output (None if algorithm failed)
-            expected: Expected final document
+            expected: Profile of the expected final document (see `profile`)
 
         Returns:
             DiffScore with all metrics calculated
@@ -76,26 +171,26 @@ class DiffScorer:
             return DiffScore(
                 exact_match=False,
                 lines_correct=0,
-                lines_missing=len(expected.splitlines()),
+                lines_missing=expected.raw_line_count,
                 lines_extra=0,
-                lines_total_expected=len(expected.splitlines()),
+                lines_total_expected=expected.raw_line_count,
                 line_similarity=0.0,
                 char_similarity=0.0,
                 headers_preserved=False,
                 header_order_correct=False,
-                unified_diff="(no output to compare)",
+                diff=DiffHandle(None, expected),
             )
 
-        # Normalize both texts
+        # Normalize output (the expected side is already normalized)
         output_norm = self.normalize(output)
-        expected_norm = self.normalize(expected)
+        expected_norm = expected.text
 
         # Exact match check
         exact_match = output_norm == expected_norm
 
         # Line-based metrics
         output_lines = set(output_norm.splitlines())
-        expected_lines = set(expected_norm.splitlines())
+        expected_lines = expected.lines
 
         lines_correct = len(output_lines & expected_lines)
         lines_missing = len(expected_lines - output_lines)
@@ -106,18 +201,14 @@ class DiffScorer:
         union = output_lines | expected_lines
         line_similarity = len(output_lines & expected_lines) / len(union) if union else 1.0
 
-        # Character-level similarity using SequenceMatcher
-        char_similarity = difflib.SequenceMatcher(None, output_norm, expected_norm).ratio()
+        # Character-level similarity (nothing to compute for an exact match)
+        char_similarity = 1.0 if exact_match else self.similarity.ratio(output_norm, expected_norm)
 
         # Structural checks (headers)
         output_headers = self._extract_headers(output_norm)
-        expected_headers = self._extract_headers(expected_norm)
-
-        headers_preserved = set(expected_headers).issubset(set(output_headers))
-        header_order_correct = self._check_header_order(output_headers, expected_headers)
 
-        # Generate unified diff
-        unified_diff = self.generate_diff(output_norm, expected_norm)
+        headers_preserved = expected.header_set.issubset(output_headers)
+        header_order_correct = self._check_header_order(output_headers, expected.headers)
 
         return DiffScore(
             exact_match=exact_match,
@@ -129,7 +220,7 @@ class DiffScorer:
             char_similarity=char_similarity,
             headers_preserved=headers_preserved,
             header_order_correct=header_order_correct,
-            unified_diff=unified_diff,
+            diff=DiffHandle(output, expected),
         )
 
     def generate_diff(self, output: str, expected: str) -> str:
@@ -142,6 +233,10 @@ class DiffScorer:
         Returns:
             Unified diff string
         """
+        return "".join(self.iter_diff(output, expected))
+
+    def iter_diff(self, output: str, expected: str) -> Iterator[str]:
+        """Generate a unified diff piece by piece (see `generate_diff`)."""
         output_lines = output.splitlines(keepends=True)
         expected_lines = expected.splitlines(keepends=True)
 
@@ -151,7 +246,7 @@ class DiffScorer:
         if expected_lines and not expected_lines[-1].endswith("\n"):
             expected_lines[-1] += "\n"
 
-        diff = difflib.unified_diff(
+        return difflib.unified_diff(
             expected_lines,
             output_lines,
             fromfile="expected",
@@ -159,8 +254,6 @@ class DiffScorer:
             lineterm="",
         )
 
-        return "".join(diff)
-
     def normalize(self, text: str) -> str:
         """Normalize text for comparison."""
         lines = text.replace("\r\n", "\n").split("\n")
@@ -178,7 +271,9 @@ class DiffScorer:
         """
         return [line for line in text.splitlines() if line.startswith("#")]
 
-    def _check_header_order(self, output_headers: list[str], expected_headers: list[str]) -> bool:
+    def _check_header_order(
+        self, output_headers: list[str], expected_headers: tuple[str, ...]
+    ) -> bool:
         """Check if headers appear in the correct order.
 
         Returns True if all expected headers appear in output in the same order.
@@ -186,15 +281,19 @@ class DiffScorer:
         if not expected_headers:
             return True
 
+        # First position of each header in output
+        first_positions: dict[str, int] = {}
+        for pos, header in enumerate(output_headers):
+            _ = first_positions.setdefault(header, pos)
+
         # Find positions of expected headers in output
         positions: list[int] = []
         for eh in expected_headers:
-            try:
-                pos = output_headers.index(eh)
-                positions.append(pos)
-            except ValueError:
+            pos = first_positions.get(eh)
+            if pos is None:
                 # Header not found
                 return False
+            positions.append(pos)
 
         # Check if positions are monotonically increasing
         return positions == sorted(positions)
@@ -204,11 +303,23 @@ class DiffScorer:
 _scorer = DiffScorer()
 
 
-def score_output(output: str | None, expected: str) -> DiffScore:
+@lru_cache(maxsize=256)
+def expected_profile(expected: str) -> ExpectedProfile:
+    """Profile of an expected document, cached so each fixture is profiled once.
+
+    Fixtures keep their `expected` string for the whole run, so lookups hit on
+    identity without rehashing the text.
+    """
+    return _scorer.profile(expected)
+
+
+def score_output(output: str | None, expected: str | ExpectedProfile) -> DiffScore:
     """Score algorithm output against expected result.
 
-    Convenience function using global scorer.
+    Convenience function using global scorer and cached expected profiles.
     """
+    if isinstance(expected, str):
+        expected = expected_profile(expected)
     return _scorer.score(output, expected)
 
 
@@ -221,3 +332,81 @@ def generate_diff(output: str, expected: str) -> str:
         _scorer.normalize(output),
         _scorer.normalize(expected),
     )
+
+
+class ScorePool:
+    """Scores outputs in worker processes so scoring never blocks the event loop.
+
+    Similarity and diff computation are CPU-bound; done inline in `run_single`
+    they stall the handling of every other in-flight LLM response. Each worker
+    receives the expected documents once, when it starts, so a task only carries
+    the fixture name and the output.
+    """
+
+    def __init__(self, workers: int, defer: bool = False):
+        """Initialize the pool (worker processes start with `start`).
+
+        Args:
+            workers: Worker processes (0 = score inline in the calling thread)
+            defer: Score every result after all LLM calls finish instead of as
+                each one completes (read by the runner)
+        """
+        self.workers: int = workers
+        self.defer: bool = defer
+        self._expected: dict[str, str] = {}
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self, fixtures: list[Fixture]) -> None:
+        """Start the workers with the expected documents of `fixtures`."""
+        self.shutdown()
+        self._expected = {fixture.name: fixture.expected for fixture in fixtures}
+        if self.workers > 0:
+            # Spawned rather than forked: the runner has live threads (HTTP pool,
+            # tracing) by the time workers start
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._expected,),
+            )
+            # Workers are spawned on demand; submit no-op tasks so they start
+            # (and import everything) while the first LLM calls are in flight
+            for _ in range(self.workers):
+                _ = self._executor.submit(int)
+
+    async def score(self, fixture: Fixture, output: str | None) -> DiffScore:
+        """Score output for a fixture in a worker (inline without workers)."""
+        if self._executor is None or fixture.name not in self._expected:
+            return score_output(output, fixture.expected)
+        loop = asyncio.get_running_loop()
+        score = await loop.run_in_executor(self._executor, _score_in_worker, fixture.name, output)
+        # Diff against this process's output and profile instead of copies from the worker
+        return replace(score, diff=DiffHandle(output, expected_profile(fixture.expected)))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+# Expected documents by fixture name, set in each worker process by _init_worker
+_worker_expected: dict[str, str] = {}
+
+
+def _init_worker(expected: dict[str, str]) -> None:
+    _worker_expected.update(expected)
+
+
+def _score_in_worker(fixture_name: str, output: str | None) -> DiffScore:
+    # Drop the diff handle: sending it back would copy the output and the profile
+    return replace(score_output(output, _worker_expected[fixture_name]), diff=None)
+
+
+@lru_cache
+def get_score_pool() -> ScorePool:
+    """Get the process-wide score pool."""
+    workers = get_settings().md_edit_bench_score_workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return ScorePool(workers=workers)
@@ -0,0 +1,157 @@
+"""Character similarity backends used by DiffScorer.
+
+Scores were originally `difflib.SequenceMatcher(None, output, expected).ratio()` over
+whole normalized documents, which takes seconds per call on the largest fixtures.
+The backends here all return a ratio in [0, 1] (2 * matched chars / total chars):
+
+- `difflib`: the original whole-document SequenceMatcher ratio (reference).
+- `fast` (default): aligns the documents line by line first, so unchanged lines
+  match without any character work, then runs SequenceMatcher only inside the
+  changed regions. The regions reuse the "popular character" rule difflib applies
+  to the whole document (autojunk), so results stay close to the reference: equal
+  on the fixtures' initial/final pairs that are near-identical, and within 0.02 of
+  it wherever the reference ratio is >= 0.95. On very dissimilar documents it can
+  score higher than the reference, whose greedy whole-document matching
+  undercounts there. `scripts/compare_similarity.py` measures this on all fixtures.
+- `lcs`: same line alignment, but counts the longest common subsequence inside
+  changed regions with a bit-parallel algorithm (Hyyro). A true edit-distance
+  measure, not compatible with the reference on dissimilar documents.
+"""
+
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from functools import lru_cache
+from typing import Literal, Protocol, cast
+
+SimilarityName = Literal["fast", "lcs", "difflib"]
+
+
+class SimilarityBackend(Protocol):
+    """Computes a character similarity ratio between two texts."""
+
+    def ratio(self, a: str, b: str) -> float:
+        """Similarity of `a` to `b` in [0, 1] (1.0 when equal)."""
+        ...
+
+
+class DifflibSimilarity:
+    """Whole-document difflib.SequenceMatcher ratio (the reference implementation)."""
+
+    def ratio(self, a: str, b: str) -> float:
+        """Similarity of `a` to `b` in [0, 1] (1.0 when equal)."""
+        return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+class FastSimilarity:
+    """Line-aligned SequenceMatcher ratio, compatible with DifflibSimilarity."""
+
+    def ratio(self, a: str, b: str) -> float:
+        """Similarity of `a` to `b` in [0, 1] (1.0 when equal)."""
+        if a == b:
+            return 1.0
+        popular = popular_chars(b)
+        matched, regions = align_lines(a, b)
+        for a_region, b_region in regions:
+            matcher = difflib.SequenceMatcher(None, a_region, b_region, autojunk=False)
+            # Same effect as autojunk on the whole document: popular characters
+            # extend matches but never start one
+            b2j = cast(dict[str, list[int]], vars(matcher)["b2j"])
+            for char in popular:
+                _ = b2j.pop(char, None)
+            matched += sum(block.size for block in matcher.get_matching_blocks())
+        return 2 * matched / (len(a) + len(b))
+
+
+class LCSSimilarity:
+    """Line-aligned longest common subsequence ratio."""
+
+    def ratio(self, a: str, b: str) -> float:
+        """Similarity of `a` to `b` in [0, 1] (1.0 when equal)."""
+        if a == b:
+            return 1.0
+        matched, regions = align_lines(a, b)
+        matched += sum(lcs_length(a_region, b_region) for a_region, b_region in regions)
+        return 2 * matched / (len(a) + len(b))
+
+
+SIMILARITY_BACKENDS: dict[SimilarityName, SimilarityBackend] = {
+    "fast": FastSimilarity(),
+    "lcs": LCSSimilarity(),
+    "difflib": DifflibSimilarity(),
+}
+
+
+def align_lines(a: str, b: str) -> tuple[int, list[tuple[str, str]]]:
+    """Align two texts by lines.
+
+    Returns:
+        Characters in lines common to both texts, and the (a, b) text of each region
+        where they differ (regions that are pure insertions or deletions are left
+        out, since nothing in them can match).
+    """
+    a_lines = a.splitlines(keepends=True)
+    b_lines, matcher = _line_matcher(b)
+    matcher.set_seq1(a_lines)
+    matched = 0
+    regions: list[tuple[str, str]] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            matched += sum(len(line) for line in a_lines[i1:i2])
+        elif i1 < i2 and j1 < j2:
+            regions.append(("".join(a_lines[i1:i2]), "".join(b_lines[j1:j2])))
+    return matched, regions
+
+
+# `b` is the expected document when scoring, shared by every result for a fixture,
+# so the b-side work below (indexing its lines, counting its characters) is cached.
+
+
+@lru_cache(maxsize=256)
+def _line_matcher(b: str) -> tuple[list[str], difflib.SequenceMatcher[str]]:
+    """Lines of `b` and a line matcher with `b` indexed.
+
+    Callers set the matcher's first sequence in place, so it must not be shared
+    across threads (scoring runs on one thread per process).
+    """
+    b_lines = b.splitlines(keepends=True)
+    return b_lines, difflib.SequenceMatcher(None, [], b_lines, autojunk=False)
+
+
+@lru_cache(maxsize=256)
+def popular_chars(b: str) -> frozenset[str]:
+    """Characters SequenceMatcher's autojunk heuristic ignores as match seeds in `b`."""
+    if len(b) < 200:
+        return frozenset()
+    limit = len(b) // 100 + 1
+    return frozenset(char for char, count in Counter(b).items() if count > limit)
+
+
+def lcs_length(a: str, b: str) -> int:
+    """Length of the longest common subsequence of two strings.
+
+    Bit-parallel: one bit per character of the shorter string, so the cost is
+    O(len(a) * len(b) / word size) big-integer operations.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks: dict[str, int] = {}
+    for i, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(b)) - 1
+    row = full
+    for char in a:
+        mask = masks.get(char)
+        if mask is None:
+            continue
+        matches = row & mask
+        row = ((row + matches) | (row - matches)) & full
+    return len(b) - row.bit_count()
+
+
+def get_similarity(name: SimilarityName) -> SimilarityBackend:
+    """Get a similarity backend by name."""
+    return SIMILARITY_BACKENDS[name]
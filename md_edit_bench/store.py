@@ -0,0 +1,305 @@
+"""SQLite results store: one row of metrics per test across every run, for reports.
+
+The per-test directories under results/ are overwritten by each run and hold the
+LLM payloads. The store instead keeps the metrics of every run side by side in one
+indexed table, results/results.sqlite, so `md-edit-bench report` aggregates months
+of runs with a single query and never reads a payload.
+
+Rows are keyed by (run_id, fixture, algorithm, model). A resumed run adds its
+remaining tests under the same run ID.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from rich.console import Console
+from rich.table import Table
+
+from md_edit_bench.models import TestResult
+from md_edit_bench.results import RESULTS_DIR
+from md_edit_bench.timing import PHASES
+
+console = Console()
+
+STORE_PATH = RESULTS_DIR / "results.sqlite"
+
+GroupBy = Literal["run", "algorithm", "model", "category", "fixture"]
+GROUP_BY: list[GroupBy] = ["run", "algorithm", "model", "category", "fixture"]
+
+_GROUP_COLUMNS: dict[GroupBy, str] = {
+    "run": "run_id",
+    "algorithm": "algorithm",
+    "model": "model",
+    "category": "category",
+    "fixture": "fixture",
+}
+
+# Column name -> SQLite type, in table order (columns added later need a DEFAULT)
+_COLUMNS: dict[str, str] = {
+    "run_id": "TEXT NOT NULL",
+    "run_started": "TEXT NOT NULL",  # ISO timestamp of the run's start
+    "category": "TEXT NOT NULL",
+    "fixture": "TEXT NOT NULL",
+    "algorithm": "TEXT NOT NULL",
+    "model": "TEXT NOT NULL",
+    "success": "INTEGER NOT NULL",
+    "passed": "INTEGER NOT NULL",
+    "exact_match": "INTEGER NOT NULL",
+    "similarity_score": "REAL NOT NULL",
+    "lines_missing": "INTEGER NOT NULL",
+    "lines_extra": "INTEGER NOT NULL",
+    "warning_count": "INTEGER NOT NULL",
+    "error": "TEXT",
+    "duration_seconds": "REAL NOT NULL",
+    **{f"{phase}_seconds": "REAL NOT NULL" for phase in PHASES},
+    "queue_wait_seconds": "REAL NOT NULL",
+    "max_queue_depth": "INTEGER NOT NULL",
+    "throttle_events": "INTEGER NOT NULL",
+    "llm_calls": "INTEGER NOT NULL",
+    "tokens_in": "INTEGER NOT NULL",
+    "tokens_out": "INTEGER NOT NULL",
+    "tokens_cached": "INTEGER NOT NULL DEFAULT 0",
+    "cost_usd": "REAL NOT NULL",
+    "retries": "INTEGER NOT NULL",
+    "backoff_seconds": "REAL NOT NULL",
+    "ttft_seconds": "REAL",
+    "tokens_per_second": "REAL",
+}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    {", ".join(f"{name} {kind}" for name, kind in _COLUMNS.items())},
+    PRIMARY KEY (run_id, fixture, algorithm, model)
+);
+CREATE INDEX IF NOT EXISTS results_run_started ON results (run_started, run_id);
+CREATE INDEX IF NOT EXISTS results_algorithm_model ON results (algorithm, model);
+CREATE INDEX IF NOT EXISTS results_category ON results (category);
+"""
+
+# Columns come from _COLUMNS, values are parameters
+_INSERT = (
+    f"INSERT OR REPLACE INTO results ({', '.join(_COLUMNS)}) "  # noqa: S608
+    f"VALUES ({', '.join(f':{name}' for name in _COLUMNS)})"
+)
+
+
+@dataclass
+class ReportRow:
+    """Aggregated metrics of one group of results."""
+
+    groups: tuple[str, ...]  # Values of the grouped-by columns
+    runs: int
+    tests: int
+    passed: int
+    similarity: float  # Average similarity score
+    duration_seconds: float  # Average per test
+    llm_seconds: float  # Average per test
+    tokens_in: int
+    tokens_out: int
+    cost_usd: float
+    tokens_cached: int
+
+    @property
+    def pass_rate(self) -> float:
+        """Share of tests passed."""
+        return self.passed / self.tests
+
+    @property
+    def cached_rate(self) -> float:
+        """Share of input tokens read from the provider's prompt cache."""
+        return self.tokens_cached / self.tokens_in if self.tokens_in else 0.0
+
+
+def result_row(run_id: str, run_started: datetime, r: TestResult) -> dict[str, object]:
+    """Columns of one result's row."""
+    category = r.fixture.split("/", 1)[0] if "/" in r.fixture else "default"
+    usage = r.algorithm_result.usage
+    return {
+        "run_id": run_id,
+        "run_started": run_started.isoformat(timespec="seconds"),
+        "category": category,
+        "fixture": r.fixture,
+        "algorithm": r.algorithm,
+        "model": r.model,
+        "success": r.algorithm_result.success,
+        "passed": r.passed,
+        "exact_match": r.exact_match,
+        "similarity_score": r.similarity_score,
+        "lines_missing": r.lines_missing,
+        "lines_extra": r.lines_extra,
+        "warning_count": r.warning_count,
+        "error": r.algorithm_result.error,
+        "duration_seconds": r.duration_seconds,
+        **{f"{phase}_seconds": r.phases.get(phase) for phase in PHASES},
+        "queue_wait_seconds": r.queue_wait_seconds,
+        "max_queue_depth": r.max_queue_depth,
+        "throttle_events": r.throttle_events,
+        "llm_calls": len(usage.calls),
+        "tokens_in": usage.tokens_in,
+        "tokens_out": usage.tokens_out,
+        "tokens_cached": usage.tokens_cached,
+        "cost_usd": usage.cost_usd,
+        "retries": usage.retries,
+        "backoff_seconds": usage.backoff_seconds,
+        "ttft_seconds": r.ttft_seconds,
+        "tokens_per_second": r.tokens_per_second,
+    }
+
+
+class ResultsStore:
+    """Append-only SQLite table of result metrics across runs.
+
+    The connection is opened on first use; a run adds rows from the results
+    writer thread only.
+    """
+
+    def __init__(self, path: Path = STORE_PATH):
+        """Initialize the store (the database is created on first use).
+
+        Args:
+            path: SQLite database file
+        """
+        self.path: Path = path
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection to the database, creating its schema if needed."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            _ = connection.execute("PRAGMA journal_mode=WAL")
+            _ = connection.execute("PRAGMA synchronous=NORMAL")
+            _ = connection.executescript(_SCHEMA)
+            # Stores created by older versions lack the columns added since
+            existing = {str(row[1]) for row in connection.execute("PRAGMA table_info(results)")}  # pyright: ignore[reportAny]
+            for name, kind in _COLUMNS.items():
+                if name not in existing:
+                    _ = connection.execute(f"ALTER TABLE results ADD COLUMN {name} {kind}")
+            self._connection = connection
+        return self._connection
+
+    def add(self, run_id: str, run_started: datetime, r: TestResult) -> None:
+        """Add (or replace) one result's row."""
+        with self.connection:
+            _ = self.connection.execute(_INSERT, result_row(run_id, run_started, r))
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def run_ids(self, last: int = 0) -> list[str]:
+        """IDs of stored runs, newest first (the `last` newest if non-zero)."""
+        rows: list[tuple[str, str]] = self.connection.execute(
+            "SELECT DISTINCT run_started, run_id FROM results ORDER BY run_started DESC LIMIT ?",
+            (last or -1,),
+        ).fetchall()
+        return [run_id for _started, run_id in rows]
+
+    def aggregate(
+        self,
+        by: list[GroupBy],
+        run_ids: list[str] | None = None,
+        algorithms: list[str] | None = None,
+        models: list[str] | None = None,
+        category: str | None = None,
+    ) -> list[ReportRow]:
+        """Aggregate metrics per group of results, ordered by group.
+
+        Args:
+            by: Columns to group by
+            run_ids: Only these runs (default: all)
+            algorithms: Only these algorithms (default: all)
+            models: Only these models (default: all)
+            category: Only this fixture category (default: all)
+        """
+        columns = ", ".join(_GROUP_COLUMNS[name] for name in by)
+        filters: list[str] = []
+        params: list[object] = []
+        for column, allowed in (("run_id", run_ids), ("algorithm", algorithms), ("model", models)):
+            if allowed:
+                filters.append(f"{column} IN ({', '.join('?' * len(allowed))})")
+                params += allowed
+        if category:
+            filters.append("category = ?")
+            params.append(category)
+
+        query = f"""
+            SELECT {columns}, COUNT(DISTINCT run_id), COUNT(*), SUM(passed),
+                AVG(similarity_score), AVG(duration_seconds), AVG(llm_seconds),
+                SUM(tokens_in), SUM(tokens_out), SUM(cost_usd), SUM(tokens_cached)
+            FROM results
+            {"WHERE " + " AND ".join(filters) if filters else ""}
+            GROUP BY {columns}
+            ORDER BY {columns}
+        """  # noqa: S608 - columns come from _GROUP_COLUMNS, values are parameters
+        rows: list[tuple[object, ...]] = self.connection.execute(query, params).fetchall()
+        return [
+            ReportRow(tuple(str(value) for value in row[: len(by)]), *row[len(by) :])  # pyright: ignore[reportArgumentType]
+            for row in rows
+        ]
+
+
+def run_report(
+    *,
+    store_path: Path,
+    by: list[GroupBy],
+    run_ids: list[str] | None,
+    last: int,
+    algorithms: list[str] | None,
+    models: list[str] | None,
+    category: str | None,
+) -> int:
+    """Print aggregated metrics from the results store and return the exit code."""
+    if not store_path.exists():
+        console.print(f"[yellow]No results store at {store_path}[/yellow]")
+        return 1
+    store = ResultsStore(store_path)
+    try:
+        if not run_ids and last:
+            run_ids = store.run_ids(last)
+        rows = store.aggregate(by, run_ids, algorithms, models, category)
+    finally:
+        store.close()
+    if not rows:
+        console.print("[yellow]No matching results[/yellow]")
+        return 0
+
+    runs = ", ".join(run_ids) if run_ids else "all runs"
+    table = Table(title=f"Results by {', '.join(by)} ({runs})")
+    for name in by:
+        table.add_column(name.capitalize())
+    for column in (
+        "Runs",
+        "Tests",
+        "Pass %",
+        "Sim",
+        "Avg Time",
+        "Avg LLM",
+        "Tokens",
+        "Cached",
+        "Cost",
+    ):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            *row.groups,
+            str(row.runs),
+            str(row.tests),
+            f"{100 * row.pass_rate:.0f}%",
+            f"{row.similarity:.3f}",
+            f"{row.duration_seconds:.1f}s",
+            f"{row.llm_seconds:.1f}s",
+            f"{row.tokens_in}/{row.tokens_out}",
+            f"{100 * row.cached_rate:.0f}%",
+            f"${row.cost_usd:.4f}",
+        )
+    console.print(table)
+    return 0
@@ -0,0 +1,118 @@
+"""Phase timing for test cells: where the time goes between the model and local work.
+
+`run_single` opens a `track_phases()` block per cell; inside it, code marks phases
+with `span(...)`, as a context manager or a decorator:
+
+    with span("apply"):
+        result = apply_patch(initial, patch_text)
+
+    @span("parse")
+    def parse_hunks(diff_text: str) -> list[Hunk]: ...
+
+Spans nest, and time is attributed to the innermost open span only, so an "apply"
+span around a function that parses first (under its own "parse" span) reports the
+two separately instead of counting the parse twice. Outside a `track_phases()`
+block spans record nothing, so instrumented helpers cost almost nothing when
+called directly (e.g. by the applier benchmark).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Generator
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Literal
+
+Phase = Literal["prompt", "llm", "parse", "apply", "score"]
+
+PHASES: tuple[Phase, ...] = ("prompt", "llm", "parse", "apply", "score")
+
+
+@dataclass
+class PhaseTimings:
+    """Seconds spent in each phase of one test cell."""
+
+    prompt_seconds: float = 0.0  # Rendering prompt templates
+    llm_seconds: float = 0.0  # Inside call_llm (network, queueing and retry backoff)
+    parse_seconds: float = 0.0  # Parsing LLM output into edits
+    apply_seconds: float = 0.0  # Applying edits to the document
+    score_seconds: float = 0.0  # Scoring the output against the expected document
+
+    def get(self, phase: Phase) -> float:
+        """Seconds recorded for a phase."""
+        return getattr(self, f"{phase}_seconds")  # pyright: ignore[reportAny]
+
+    def add(self, phase: Phase, seconds: float) -> None:
+        """Record time spent in a phase."""
+        setattr(self, f"{phase}_seconds", self.get(phase) + seconds)
+
+    @property
+    def total_seconds(self) -> float:
+        """Time covered by any span."""
+        return sum(self.get(phase) for phase in PHASES)
+
+
+@dataclass
+class _Frame:
+    """An open span: its phase, start time and time claimed by spans nested in it."""
+
+    phase: Phase
+    start: float
+    nested: float = 0.0
+    token: Token[tuple[_Frame, ...]] | None = field(default=None, repr=False)
+
+
+_current_timings: ContextVar[PhaseTimings | None] = ContextVar("phase_timings", default=None)
+_open_spans: ContextVar[tuple[_Frame, ...]] = ContextVar("phase_spans", default=())
+
+
+@contextmanager
+def track_phases() -> Generator[PhaseTimings]:
+    """Collect the time of every span opened inside this block (including in child tasks)."""
+    timings = PhaseTimings()
+    timings_token = _current_timings.set(timings)
+    spans_token = _open_spans.set(())
+    try:
+        yield timings
+    finally:
+        _open_spans.reset(spans_token)
+        _current_timings.reset(timings_token)
+
+
+class _Span(ContextDecorator):
+    """Context manager / decorator timing one phase (see `span`)."""
+
+    def __init__(self, phase: Phase):
+        self.phase: Phase = phase
+
+    def __enter__(self) -> None:
+        if _current_timings.get() is None:
+            return
+        frames = _open_spans.get()
+        frame = _Frame(self.phase, time.perf_counter())
+        frame.token = _open_spans.set((*frames, frame))
+
+    def __exit__(self, *_exc: object) -> None:
+        timings = _current_timings.get()
+        frames = _open_spans.get()
+        if timings is None or not frames:
+            return
+        frame = frames[-1]
+        elapsed = time.perf_counter() - frame.start
+        # Concurrent child tasks can claim more than the wall time of their parent
+        timings.add(self.phase, max(0.0, elapsed - frame.nested))
+        if len(frames) > 1:
+            frames[-2].nested += elapsed
+        if frame.token is not None:
+            _open_spans.reset(frame.token)
+
+
+def span(phase: Phase) -> _Span:
+    """Time a block or function as `phase` of the current cell.
+
+    Works as a context manager (also around `await`) and as a decorator for sync
+    functions. Does nothing outside a `track_phases()` block.
+    """
+    return _Span(phase)
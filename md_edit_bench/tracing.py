@@ -0,0 +1,58 @@
+"""Laminar tracing, loaded only when it is enabled.
+
+The Laminar SDK takes a noticeable share of CLI startup to import, so nothing
+imports it at module level: `init_tracing()` imports and initializes it on first
+use, and only when a project API key is configured; otherwise `observe` spans just
+call the function.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import ParamSpec, TypeVar
+
+from md_edit_bench import config
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@lru_cache
+def init_tracing() -> bool:
+    """Initialize Laminar tracing if an API key is available (once per process)."""
+    api_key = config.get_settings().lmnr_project_api_key
+    if not api_key:
+        return False
+
+    from lmnr import Instruments, Laminar
+
+    Laminar.initialize(project_api_key=api_key, instruments={Instruments.OPENAI})
+    return True
+
+
+def observe(name: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Trace an async function as a Laminar span named `name` (if tracing is enabled).
+
+    Unlike `lmnr.observe`, this can decorate functions at import time: whether to
+    trace is decided on each call.
+    """
+
+    def decorator(fn: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        traced: Callable[P, Awaitable[T]] | None = None
+
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            nonlocal traced
+            if not init_tracing():
+                return await fn(*args, **kwargs)
+            if traced is None:
+                from lmnr import observe as lmnr_observe
+
+                traced = lmnr_observe(name=name)(fn)
+            return await traced(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
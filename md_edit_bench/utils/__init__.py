@@ -1,5 +1,9 @@
 """Utility functions for md_edit_bench."""
 
-from md_edit_bench.utils.prompt_manager import PromptManager
+from md_edit_bench.utils.prompt_manager import (
+    PromptManager,
+    TemplateRegistry,
+    get_template_registry,
+)
 
-__all__ = ["PromptManager"]
+__all__ = ["PromptManager", "TemplateRegistry", "get_template_registry"]
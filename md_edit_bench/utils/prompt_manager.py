@@ -1,10 +1,143 @@
-"""Jinja2-based prompt template management."""
+"""Jinja2-based prompt template management.
 
+Templates are compiled once per process into the shared `TemplateRegistry`: each
+template directory is listed once, so names resolve with dictionary lookups, and each
+template is compiled on its first render. Renders are memoized on (template, arguments),
+so the prompts every model gets for the same fixture (system prompt, the user prompt
+embedding the whole document) are rendered once.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import jinja2
 
+from md_edit_bench.timing import span
+
+TEMPLATE_SUFFIXES = (".jinja2", ".jinja")
+
+
+@dataclass
+class TemplateStats:
+    """Render counters for one template."""
+
+    renders: int = 0  # Calls, including memoized ones
+    cache_hits: int = 0
+    render_seconds: float = 0.0  # Time spent rendering (cache misses)
+
+
+class TemplateRegistry:
+    """Process-wide store of compiled templates and memoized renders.
+
+    Not thread-safe: prompts are rendered on the event loop thread.
+    """
+
+    def __init__(self, max_cached_renders: int = 128):
+        """Initialize an empty registry.
+
+        Args:
+            max_cached_renders: Rendered prompts kept for reuse (least recently used
+                are dropped; 0 disables memoization)
+        """
+        self.max_cached_renders: int = max_cached_renders
+        self.stats: dict[str, TemplateStats] = {}
+        self._environments: dict[Path, jinja2.Environment] = {}
+        self._names: dict[Path, frozenset[str]] = {}
+        self._templates: dict[tuple[Path, str], jinja2.Template] = {}
+        self._renders: OrderedDict[tuple[object, ...], str] = OrderedDict()
+
+    def names(self, directory: Path) -> frozenset[str]:
+        """File names of the templates in a directory (listed on first use)."""
+        names = self._names.get(directory)
+        if names is None:
+            names = frozenset(
+                path.name for path in directory.iterdir() if path.suffix in TEMPLATE_SUFFIXES
+            )
+            self._names[directory] = names
+        return names
+
+    def resolve(self, directory: Path, template_name: str) -> str:
+        """File name of a template, with the extension optional.
+
+        Raises:
+            FileNotFoundError: No such template in the directory
+        """
+        names = self.names(directory)
+        for name in (template_name, *(template_name + suffix for suffix in TEMPLATE_SUFFIXES)):
+            if name in names:
+                return name
+        raise FileNotFoundError(f"Template '{template_name}' not found")
+
+    def template(self, directory: Path, name: str) -> jinja2.Template:
+        """A compiled template (compiled on first use)."""
+        template = self._templates.get((directory, name))
+        if template is None:
+            env = self._environments.get(directory)
+            if env is None:
+                env = jinja2.Environment(
+                    loader=jinja2.FileSystemLoader(directory),
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    autoescape=False,
+                    auto_reload=False,  # Templates do not change during a run
+                )
+                self._environments[directory] = env
+            template = env.get_template(name)
+            self._templates[(directory, name)] = template
+        return template
+
+    def render(self, directory: Path, template_name: str, **kwargs: Any) -> str:  # pyright: ignore[reportAny]
+        """Render a template, reusing the result of an identical earlier render."""
+        name = self.resolve(directory, template_name)
+        stats = self.stats.setdefault(f"{directory.name}/{name}", TemplateStats())
+        stats.renders += 1
+
+        key = _render_key(directory, name, kwargs) if self.max_cached_renders else None
+        if key is not None and (cached := self._renders.get(key)) is not None:
+            self._renders.move_to_end(key)
+            stats.cache_hits += 1
+            return cached
+
+        start = time.perf_counter()
+        rendered = self.template(directory, name).render(**kwargs)
+        stats.render_seconds += time.perf_counter() - start
+
+        if key is not None:
+            self._renders[key] = rendered
+            if len(self._renders) > self.max_cached_renders:
+                _ = self._renders.popitem(last=False)
+        return rendered
+
+    def totals(self) -> TemplateStats:
+        """Counters summed over every template."""
+        return TemplateStats(
+            renders=sum(s.renders for s in self.stats.values()),
+            cache_hits=sum(s.cache_hits for s in self.stats.values()),
+            render_seconds=sum(s.render_seconds for s in self.stats.values()),
+        )
+
+
+def _render_key(directory: Path, name: str, kwargs: dict[str, Any]) -> tuple[object, ...] | None:
+    """Memoization key of a render, or None if an argument is unhashable."""
+    key = (directory, name, *sorted(kwargs.items()))
+    try:
+        _ = hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+@lru_cache
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry."""
+    return TemplateRegistry()
+
 
 class PromptManager:
     """Loads and renders Jinja2 prompt templates from the calling module's directory."""
@@ -21,15 +154,9 @@ class PromptManager:
                 f"Invalid path: {current_file}. Did you pass __name__ instead of __file__?"
             )
 
-        base_dir = current_path.parent if current_path.is_file() else current_path
-
-        self.env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(base_dir),
-            trim_blocks=True,
-            lstrip_blocks=True,
-            autoescape=False,
-        )
+        self.base_dir: Path = current_path.parent if current_path.is_file() else current_path
 
+    @span("prompt")
     def get(self, template_name: str, **kwargs: Any) -> str:  # pyright: ignore[reportAny]
         """Load and render a template.
 
@@ -40,9 +167,4 @@ class PromptManager:
         Returns:
             Rendered template string.
         """
-        for name in [template_name, f"{template_name}.jinja2", f"{template_name}.jinja"]:
-            try:
-                return self.env.get_template(name).render(**kwargs)
-            except jinja2.TemplateNotFound:
-                continue
-        raise FileNotFoundError(f"Template '{template_name}' not found")
+        return get_template_registry().render(self.base_dir, template_name, **kwargs)
@@ -0,0 +1,148 @@
+"""Microbenchmark: applying many edits to one document, string vs IndexedDocument.
+
+Compares the old way appliers worked (a new string per edit via
+replace_most_similar_chunk or slicing) with applying every edit to one shared
+IndexedDocument and building the string once at the end. Reports the median time
+and the peak allocation (tracemalloc) per workload.
+
+Usage: python scripts/bench_document.py [--fixture PATH] [--edits N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from md_edit_bench.algorithms.aider_utils import IndexedDocument, replace_most_similar_chunk
+from rich.console import Console
+from rich.table import Table
+
+DEFAULT_FIXTURE = Path(__file__).parent.parent / "fixtures" / "hard" / "very_long.initial.md"
+
+
+def make_blocks(lines: list[str], edits: int, indent: str, seed: int) -> list[tuple[str, str]]:
+    """Pick `edits` distinct 3-line blocks and rewrite each one."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible workload, not cryptography
+    starts = sorted(rng.sample(range(0, len(lines) - 3, 3), edits))
+    blocks: list[tuple[str, str]] = []
+    for start in starts:
+        part = "".join(indent + line for line in lines[start : start + 3])
+        blocks.append((part, part.upper() + "Added line\n"))
+    return blocks
+
+
+def make_rewrites(lines: list[str], edits: int, seed: int) -> list[tuple[int, int, str]]:
+    """Pick `edits` line ranges (applied bottom-up so indexes stay valid) and new text."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible workload, not cryptography
+    starts = sorted(rng.sample(range(0, len(lines) - 3, 3), edits), reverse=True)
+    return [(start, start + 3, f"Rewritten section {start}\n") for start in starts]
+
+
+def blocks_as_string(doc: str, blocks: list[tuple[str, str]]) -> str:
+    for part, replace in blocks:
+        doc = replace_most_similar_chunk(doc, part, replace) or doc
+    return doc
+
+
+def blocks_as_document(doc: str, blocks: list[tuple[str, str]]) -> str:
+    document = IndexedDocument(doc)
+    for part, replace in blocks:
+        document.replace(part, replace)
+    return document.text
+
+
+def rewrites_as_string(doc: str, rewrites: list[tuple[int, int, str]]) -> str:
+    for start, end, text in rewrites:
+        lines = doc.splitlines(keepends=True)
+        start_pos = sum(len(line) for line in lines[:start])
+        end_pos = sum(len(line) for line in lines[:end])
+        doc = doc[:start_pos] + text + doc[end_pos:]
+    return doc
+
+
+def rewrites_as_document(doc: str, rewrites: list[tuple[int, int, str]]) -> str:
+    document = IndexedDocument(doc)
+    for start, end, text in rewrites:
+        document.replace_lines(start, end, text)
+    return document.text
+
+
+def measure(fn: Callable[[], str], repeat: int) -> tuple[float, int, str]:
+    """Median seconds and peak traced bytes of `fn`, plus its result."""
+    times: list[float] = []
+    result = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--edits", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    fixture: Path = args.fixture  # pyright: ignore[reportAny]
+    edits: int = args.edits  # pyright: ignore[reportAny]
+    repeat: int = args.repeat  # pyright: ignore[reportAny]
+
+    doc = fixture.read_text(encoding="utf-8")
+    lines = doc.splitlines(keepends=True)
+    console = Console()
+    console.print(f"{fixture.name}: {len(lines)} lines, {len(doc)} chars, {edits} edits")
+
+    exact = make_blocks(lines, edits, "", seed=1)
+    indented = make_blocks(lines, edits, "  ", seed=2)
+    rewrites = make_rewrites(lines, edits, seed=3)
+    workloads: list[tuple[str, Callable[[], str], Callable[[], str]]] = [
+        (
+            "blocks (exact)",
+            lambda: blocks_as_string(doc, exact),
+            lambda: blocks_as_document(doc, exact),
+        ),
+        (
+            "blocks (re-indented)",
+            lambda: blocks_as_string(doc, indented),
+            lambda: blocks_as_document(doc, indented),
+        ),
+        (
+            "line-range rewrites",
+            lambda: rewrites_as_string(doc, rewrites),
+            lambda: rewrites_as_document(doc, rewrites),
+        ),
+    ]
+
+    table = Table()
+    table.add_column("Workload")
+    for column in ("String", "Document", "Speedup", "Peak (string)", "Peak (document)"):
+        table.add_column(column, justify="right")
+    for name, as_string, as_document in workloads:
+        string_time, string_peak, expected = measure(as_string, repeat)
+        document_time, document_peak, result = measure(as_document, repeat)
+        if result != expected:
+            raise SystemExit(f"{name}: results differ")
+        table.add_row(
+            name,
+            f"{string_time * 1000:.1f}ms",
+            f"{document_time * 1000:.1f}ms",
+            f"{string_time / document_time:.1f}x",
+            f"{string_peak / 1024:.0f}KB",
+            f"{document_peak / 1024:.0f}KB",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
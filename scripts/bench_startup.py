@@ -0,0 +1,105 @@
+"""Benchmark CLI startup: wall time of fresh interpreters importing the benchmark.
+
+Each workload runs in a new Python process (so nothing is already imported) several
+times, and the median and minimum wall times are reported. With --top, the
+packages that take longest to import for `md-edit-bench --help` are listed, from
+`python -X importtime`.
+
+Usage: python scripts/bench_startup.py [--repeat N] [--top N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from rich.console import Console
+from rich.table import Table
+
+# Workload name -> Python code run in a fresh interpreter
+WORKLOADS = {
+    "python (baseline)": "pass",
+    "md-edit-bench --help": (
+        "import sys; sys.argv = ['md-edit-bench', '--help']\n"
+        "from md_edit_bench.runner import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "list algorithms": (
+        "from md_edit_bench.algorithms import list_algorithm_names; list_algorithm_names()"
+    ),
+    "import one algorithm": (
+        "from md_edit_bench.algorithms import get_algorithm; get_algorithm('full_rewrite')"
+    ),
+    "import all algorithms": (
+        "from md_edit_bench.algorithms import get_all_algorithms; get_all_algorithms()"
+    ),
+    "import runner": "import md_edit_bench.runner",
+}
+
+
+def time_workload(code: str, repeat: int) -> list[float]:
+    """Wall times of running `code` in `repeat` fresh interpreters."""
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _ = subprocess.run(  # noqa: S603 - runs this interpreter on our own code
+            [sys.executable, "-c", code], check=True, capture_output=True
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def import_time_by_package(code: str, top: int) -> list[tuple[str, int]]:
+    """Packages whose modules take the most time (us) to import when running `code`."""
+    proc = subprocess.run(  # noqa: S603 - runs this interpreter on our own code
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    # Lines are "import time: <self us> | <cumulative us> | <module>"
+    by_package: Counter[str] = Counter()
+    for line in str(proc.stderr).splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _cumulative, module = line.removeprefix("import time:").split("|")
+        if self_us.strip().isdigit():
+            by_package[module.strip().split(".")[0]] += int(self_us)
+    return by_package.most_common(top)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per workload")
+    parser.add_argument("--top", type=int, default=0, help="List the N slowest imports")
+    args = parser.parse_args()
+    repeat: int = args.repeat  # pyright: ignore[reportAny]
+    top: int = args.top  # pyright: ignore[reportAny]
+    console = Console()
+
+    table = Table(title=f"Startup time ({repeat} runs per workload)")
+    table.add_column("Workload")
+    table.add_column("Median", justify="right")
+    table.add_column("Min", justify="right")
+    for name, code in WORKLOADS.items():
+        times = time_workload(code, repeat)
+        table.add_row(
+            name, f"{statistics.median(times) * 1000:.0f}ms", f"{min(times) * 1000:.0f}ms"
+        )
+    console.print(table)
+
+    if top:
+        table = Table(title="Import time of md-edit-bench --help by package")
+        table.add_column("Package")
+        table.add_column("Time", justify="right")
+        for package, micros in import_time_by_package(WORKLOADS["md-edit-bench --help"], top):
+            table.add_row(package, f"{micros / 1000:.1f}ms")
+        console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare scoring similarity backends against the difflib reference on every fixture.
+
+For each fixture, scores the initial document (an output that ignored every
+change) and a few copies of the final document with random line edits against the
+final document, with every backend. Reports the time per backend and the largest
+difference from the difflib ratio, bucketed by how similar the documents are.
+
+Usage: python scripts/compare_similarity.py [--edits N,...] [--samples N] [--skip-large]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from md_edit_bench.config import FIXTURES_DIR
+from md_edit_bench.scoring import DiffScorer
+from md_edit_bench.similarity import SIMILARITY_BACKENDS
+from rich.console import Console
+from rich.table import Table
+
+# Lower bounds of the reference ratio used to bucket differences
+BUCKETS = (0.99, 0.95, 0.9, 0.0)
+
+
+def perturb(text: str, edits: int, rng: random.Random) -> str:
+    """Delete, reword, duplicate or truncate `edits` random lines."""
+    lines = text.split("\n")
+    for _ in range(edits):
+        i = rng.randrange(len(lines))
+        op = rng.randrange(4)
+        if op == 0:
+            del lines[i]
+        elif op == 1:
+            words = lines[i].split(" ")
+            words[rng.randrange(len(words))] = "CHANGED"
+            lines[i] = " ".join(words)
+        elif op == 2:
+            lines.insert(i, lines[rng.randrange(len(lines))])
+        else:
+            lines[i] = lines[i][: len(lines[i]) // 2]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edits", default="1,3,10,30", help="Line edits per sample")
+    parser.add_argument("--samples", type=int, default=2, help="Samples per edit count")
+    parser.add_argument("--skip-large", action="store_true", help="Skip fixtures over 50KB")
+    args = parser.parse_args()
+    edit_counts = [int(n) for n in str(args.edits).split(",")]  # pyright: ignore[reportAny]
+    samples: int = args.samples  # pyright: ignore[reportAny]
+    skip_large: bool = args.skip_large  # pyright: ignore[reportAny]
+
+    normalize = DiffScorer().normalize
+    rng = random.Random(0)  # noqa: S311 - reproducible workload, not cryptography
+    elapsed = dict.fromkeys(SIMILARITY_BACKENDS, 0.0)
+    # (reference ratio, backend, backend ratio - reference ratio)
+    diffs: list[tuple[float, str, float]] = []
+    console = Console()
+
+    for final_path in sorted(FIXTURES_DIR.glob("*/*.final.md")):
+        expected = normalize(final_path.read_text(encoding="utf-8"))
+        if skip_large and len(expected) > 50_000:
+            continue
+        initial_path = Path(str(final_path).replace(".final.md", ".initial.md"))
+        outputs = [normalize(initial_path.read_text(encoding="utf-8"))]
+        outputs += [perturb(expected, n, rng) for n in edit_counts for _ in range(samples)]
+        console.print(f"{final_path.parent.name}/{final_path.name}: {len(outputs)} outputs")
+
+        for output in outputs:
+            ratios: dict[str, float] = {}
+            for name, backend in SIMILARITY_BACKENDS.items():
+                start = time.perf_counter()
+                ratios[name] = backend.ratio(output, expected)
+                elapsed[name] += time.perf_counter() - start
+            reference = ratios["difflib"]
+            diffs += [(reference, name, ratio - reference) for name, ratio in ratios.items()]
+
+    table = Table(title="Difference from difflib ratio (max |diff|, by difflib ratio)")
+    table.add_column("Backend")
+    table.add_column("Time", justify="right")
+    for low in BUCKETS:
+        table.add_column(f">= {low}", justify="right")
+    for name in SIMILARITY_BACKENDS:
+        cells = [f"{elapsed[name]:.2f}s"]
+        for low in BUCKETS:
+            bucket = [abs(d) for ref, backend, d in diffs if backend == name and ref >= low]
+            cells.append(f"{max(bucket):.4f}" if bucket else "-")
+        table.add_row(name, *cells)
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
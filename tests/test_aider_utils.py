@@ -0,0 +1,161 @@
+"""Tests for the indexed fuzzy matcher in aider_utils."""
+
+import random
+
+from md_edit_bench.algorithms.aider_utils import (
+    IndexedDocument,
+    LineIndex,
+    perfect_or_whitespace,
+    prep,
+    replace_most_similar_chunk,
+    try_dotdotdots,
+    try_substring_match,
+)
+
+VOCAB = [
+    "a",
+    "b",
+    "- item one",
+    "- item two",
+    "## Heading",
+    "",
+    "  indented",
+    "    deeper",
+    "...",
+    "a long sentence with enough words to match as a substring",
+]
+
+
+def _linear_scan(whole: str, part: str, replace: str) -> str | None:
+    """The original strategy chain: try every offset of every line-based strategy."""
+    whole, whole_lines = prep(whole)
+    part, part_lines = prep(part)
+    replace, replace_lines = prep(replace)
+
+    res = perfect_or_whitespace(whole_lines, part_lines, replace_lines)
+    if res:
+        return res
+    if len(part_lines) > 2 and not part_lines[0].strip():
+        res = perfect_or_whitespace(whole_lines, part_lines[1:], replace_lines)
+        if res:
+            return res
+    try:
+        res = try_dotdotdots(whole, part, replace)
+        if res:
+            return res
+    except ValueError:
+        pass
+    return try_substring_match(whole, part, replace) or None
+
+
+def _random_text(rng: random.Random, lines: list[str]) -> str:
+    text = "\n".join(lines)
+    return text + "\n" if lines and rng.random() < 0.7 else text
+
+
+def _random_part(rng: random.Random, doc_lines: list[str]) -> list[str]:
+    if doc_lines and rng.random() < 0.8:
+        start = rng.randrange(len(doc_lines))
+        part = doc_lines[start : start + rng.randint(0, 4)]
+    else:
+        part = [rng.choice(VOCAB) for _ in range(rng.randint(0, 3))]
+    mutation = rng.random()
+    if mutation < 0.2:
+        part = ["  " + line for line in part]
+    elif mutation < 0.3:
+        part = ["", *part]
+    elif mutation < 0.4:
+        part = [line.lstrip() for line in part]
+    elif mutation < 0.45 and part:
+        part = [part[0], "...", part[-1]]
+    return part
+
+
+class TestIndexedMatching:
+    def test_matches_linear_scan(self):
+        rng = random.Random(0)  # noqa: S311 - deterministic fuzzing
+        for _ in range(3000):
+            doc = _random_text(rng, [rng.choice(VOCAB) for _ in range(rng.randint(0, 12))])
+            expected = doc
+            document = IndexedDocument(doc)
+            for _block in range(rng.randint(1, 5)):
+                doc_lines = expected.split("\n")
+                part = _random_text(rng, _random_part(rng, doc_lines))
+                replace = _random_text(rng, _random_part(rng, doc_lines))
+
+                reference = _linear_scan(expected, part, replace)
+                assert replace_most_similar_chunk(expected, part, replace) == reference
+                assert document.replace(part, replace) == (reference is not None)
+                if reference is not None:
+                    expected = reference
+                assert document.text == expected
+
+    def test_unmodified_document_keeps_missing_newline(self):
+        document = IndexedDocument("no trailing newline")
+        assert not document.replace("absent", "x")
+        assert document.text == "no trailing newline"
+
+    def test_first_match_wins(self):
+        assert replace_most_similar_chunk("x\ny\nx\ny\n", "x\ny\n", "z\n") == "z\nx\ny\n"
+
+
+class TestDocumentEdits:
+    def test_edits_match_string_operations(self):
+        rng = random.Random(1)  # noqa: S311 - deterministic fuzzing
+        vocab = [*VOCAB, "carriage\r", "\r", "form\x0c"]
+        for _ in range(3000):
+            expected = _random_text(rng, [rng.choice(vocab) for _ in range(rng.randint(0, 8))])
+            document = IndexedDocument(expected)
+            for _edit in range(rng.randint(1, 6)):
+                text = _random_text(rng, [rng.choice(vocab) for _ in range(rng.randint(0, 3))])
+                edit = rng.random()
+                if edit < 0.2:
+                    document.append(text)
+                    expected += text
+                elif edit < 0.4:
+                    document.append(text, ensure_newline=True)
+                    expected += ("" if expected.endswith("\n") else "\n") + text
+                elif edit < 0.6:
+                    document.append(text, strip_newlines=True)
+                    expected = expected.rstrip("\n") + "\n" + text
+                else:
+                    lines = expected.splitlines(keepends=True)
+                    start = rng.randint(0, len(lines))
+                    end = rng.randint(start, len(lines))
+                    start_pos = len("".join(lines[:start]))
+                    end_pos = len("".join(lines[:end]))
+                    assert document.line_text(start, end) == expected[start_pos:end_pos]
+                    document.replace_lines(start, end, text)
+                    expected = expected[:start_pos] + text + expected[end_pos:]
+                assert document.text == expected
+                assert document.lines == prep(expected)[1]
+
+    def test_replace_after_unterminated_append(self):
+        document = IndexedDocument("a\nb\n")
+        document.append("c")
+        assert document.text == "a\nb\nc"
+        assert document.replace("b\nc", "d")
+        assert document.text == "a\nd\n"
+
+    def test_substring_match_can_be_disabled(self):
+        doc = "one line holding a fairly long sentence in it\n"
+        part = "a fairly long sentence"
+        assert not IndexedDocument(doc).replace(part, "x", substring_match=False)
+        assert IndexedDocument(doc).replace(part, "x")
+
+
+class TestLineIndex:
+    def test_candidates_use_rarest_line(self):
+        index = LineIndex(["a\n", "b\n", "a\n", "c\n", "a\n", "b\n"])
+        assert index.candidates(["a\n", "b\n"]) == [0, 4]
+        assert index.candidates(["a\n", "c\n"]) == [2]
+        assert index.candidates(["d\n"]) == []
+
+    def test_splice_keeps_index_in_sync(self):
+        index = LineIndex(["a\n", "  b\n", "c\n"])
+        assert index.candidates(["b\n"], stripped=True) == [1]
+        index.splice(0, 2, ["x\n", "x\n", "x\n", "    b\n"])
+        assert index.lines == ["x\n", "x\n", "x\n", "    b\n", "c\n"]
+        assert index.candidates(["b\n"], stripped=True) == [3]
+        assert index.candidates(["a\n"]) == []
+        assert index.candidates(["x\n", "x\n"]) == [0, 1, 2]  # unverified offsets
@@ -0,0 +1,103 @@
+"""Tests for the algorithm registry and plugin algorithms."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from md_edit_bench import algorithms
+
+PLUGIN_MODULE = """
+from md_edit_bench.algorithms.base import Algorithm, AlgorithmCapabilities
+from md_edit_bench.models import AlgorithmResult, LLMUsage
+
+
+class UpperAlgorithm(Algorithm):
+    name = "upper"
+    description = "Uppercases the document"
+    capabilities = AlgorithmCapabilities(llm_passes=3, max_document_chars=100)
+
+    async def apply(self, initial, changes, model):
+        return AlgorithmResult(output=initial.upper(), success=True, error=None, usage=LLMUsage())
+
+
+class NotAnAlgorithm:
+    name = "broken"
+"""
+
+PLUGIN_ENTRY_POINTS = """
+[md_edit_bench.algorithms]
+upper = upper_plugin:UpperAlgorithm
+full_rewrite = upper_plugin:UpperAlgorithm
+broken = upper_plugin:NotAnAlgorithm
+"""
+
+
+def run_python(code: str, path: str | None = None) -> str:
+    """Run code in a fresh interpreter (optionally with `path` importable) and return stdout."""
+    env = dict(os.environ)
+    if path:
+        env["PYTHONPATH"] = os.pathsep.join([path, os.getcwd()])
+    proc = subprocess.run(  # noqa: S603 - runs this interpreter on our own code
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env
+    )
+    return proc.stdout.strip()
+
+
+class TestRegistry:
+    def test_registered_names_match_classes(self):
+        for name in algorithms.list_algorithm_names():
+            assert algorithms.get_algorithm_class(name).name == name
+        assert [cls.name for cls in algorithms.ALGORITHMS] == algorithms.list_algorithm_names()
+        assert algorithms.FullRewriteAlgorithm is algorithms.get_algorithm_class("full_rewrite")
+
+        with pytest.raises(ValueError, match="Unknown algorithm"):
+            _ = algorithms.get_algorithm("missing")
+
+    def test_imports_only_selected_algorithms(self):
+        code = (
+            "import sys\n"
+            "from md_edit_bench.algorithms import get_algorithm, list_algorithm_names\n"
+            "names = list_algorithm_names()\n"
+            "get_algorithm('full_rewrite')\n"
+            "loaded = [n for n in names if f'md_edit_bench.algorithms.{n}' in sys.modules]\n"
+            "heavy = [m for m in ('lmnr', 'openai', 'httpx') if m in sys.modules]\n"
+            "print(loaded, heavy)"
+        )
+        assert run_python(code) == "['full_rewrite'] []"
+
+    def test_capabilities(self):
+        assert algorithms.get_algorithm_class("morph").capabilities.llm_passes == 2
+        json_ops = algorithms.get_algorithm_class("json_ops").capabilities
+        assert json_ops.structured_output
+        assert not json_ops.supports_streaming
+        assert algorithms.get_algorithm_class("full_rewrite").capabilities == (
+            algorithms.AlgorithmCapabilities()
+        )
+
+    def test_plugin_entry_points(self, tmp_path: Path):
+        _ = (tmp_path / "upper_plugin.py").write_text(PLUGIN_MODULE, encoding="utf-8")
+        dist_info = tmp_path / "upper_plugin-0.1.dist-info"
+        dist_info.mkdir()
+        _ = (dist_info / "METADATA").write_text(
+            "Metadata-Version: 2.1\nName: upper-plugin\nVersion: 0.1\n", encoding="utf-8"
+        )
+        _ = (dist_info / "entry_points.txt").write_text(PLUGIN_ENTRY_POINTS, encoding="utf-8")
+
+        code = (
+            "from md_edit_bench.algorithms import get_algorithm, list_algorithm_names\n"
+            "print(list_algorithm_names()[-2:])\n"
+            "print(get_algorithm('upper').capabilities.llm_passes)\n"
+            "print(type(get_algorithm('full_rewrite')).__module__)\n"
+            "try:\n"
+            "    get_algorithm('broken')\n"
+            "except TypeError as e:\n"
+            "    print(type(e).__name__)"
+        )
+        assert run_python(code, str(tmp_path)).splitlines() == [
+            "['broken', 'upper']",
+            "3",
+            "md_edit_bench.algorithms.full_rewrite.full_rewrite",  # Built-ins win
+            "TypeError",
+        ]
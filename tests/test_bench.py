@@ -0,0 +1,133 @@
+"""Tests for the offline applier benchmark."""
+
+from pathlib import Path
+
+import pytest
+from md_edit_bench.bench import (
+    APPLIERS,
+    SYNTHESIZERS,
+    Baseline,
+    BenchResult,
+    collect_cases,
+    diff_hunks,
+    find_regressions,
+    percentile,
+)
+from md_edit_bench.scoring import DiffScorer
+
+INITIAL = """# Report
+
+## Summary
+
+The project is on track.
+Budget is fine.
+
+## Details
+
+- Item one
+- Item two
+- Item three
+
+Closing remarks for the details section.
+More text that stays the same.
+Even more text that stays the same.
+Final unchanged line of details.
+
+## Next Steps
+
+Review the plan.
+"""
+
+FINAL = """# Report
+
+## Summary
+
+The project is ahead of schedule.
+Budget is fine.
+
+## Details
+
+- Item one
+- Item three
+- Item four
+
+Closing remarks for the details section.
+More text that stays the same.
+Even more text that stays the same.
+Final unchanged line of details.
+
+## Next Steps
+
+Review the plan.
+Schedule a follow-up.
+"""
+
+
+def result(key: str, p50_ns: int) -> BenchResult:
+    algorithm = key.split(":", 1)[0]
+    return BenchResult(key=key, algorithm=algorithm, fixture="f", label="l", lines=1, p50_ns=p50_ns)
+
+
+class TestSynthesizers:
+    @pytest.mark.parametrize("algorithm", sorted(SYNTHESIZERS))
+    def test_round_trip(self, algorithm: str):
+        response = SYNTHESIZERS[algorithm](INITIAL, FINAL)
+        output = APPLIERS[algorithm](INITIAL, response)
+        scorer = DiffScorer()
+        assert scorer.normalize(output) == scorer.normalize(FINAL)
+
+    def test_hunks_cover_changes(self):
+        hunks = diff_hunks(INITIAL, FINAL, context=0)
+        assert [("".join(h.before), "".join(h.after)) for h in hunks] == [
+            ("The project is on track.\n", "The project is ahead of schedule.\n"),
+            ("- Item two\n", ""),
+            ("", "- Item four\n"),
+            ("", "Schedule a follow-up.\n"),
+        ]
+
+    def test_partial_rewrite_elides_unchanged_runs(self):
+        response = SYNTHESIZERS["partial_rewrite"](INITIAL, FINAL)
+        assert "\n...\n" in response
+        assert "More text that stays the same." not in response
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        samples = list(range(1, 101))
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 99) == 99
+        assert percentile([7], 99) == 7
+
+
+class TestFindRegressions:
+    def test_scaled_by_calibration(self):
+        baseline = Baseline(calibration_ns=100, cases={"a:x": result("a:x", 1000)})
+        # Machine is twice as slow now, so 2000ns is no change
+        assert find_regressions(baseline, [result("a:x", 2000)], 200, 0.25) == []
+        regressions = find_regressions(baseline, [result("a:x", 3000)], 200, 0.25)
+        assert [(r.algorithm, round(r.ratio, 2)) for r in regressions] == [("a", 1.5)]
+
+    def test_gates_on_geometric_mean_per_algorithm(self):
+        baseline = Baseline(
+            calibration_ns=100,
+            cases={key: result(key, 1000) for key in ("a:x", "a:y", "b:x")},
+        )
+        current = [result("a:x", 1400), result("a:y", 900), result("b:x", 1300), result("c:x", 1)]
+        regressions = find_regressions(baseline, current, 100, 0.25)
+        assert [(r.algorithm, r.worst_case) for r in regressions] == [("b", "b:x")]
+
+
+class TestCollectCases:
+    def test_recorded_responses(self, tmp_path: Path):
+        model_dir = tmp_path / "simple" / "basic_report" / "full_rewrite" / "some-model"
+        model_dir.mkdir(parents=True)
+        (model_dir / "llm_1_response.txt").write_text(
+            "<document>\nHi\n</document>", encoding="utf-8"
+        )
+
+        cases = collect_cases(["full_rewrite"], ["recorded"], "simple", tmp_path)
+
+        assert [(c.fixture, c.source, c.label) for c in cases] == [
+            ("simple/basic_report", "recorded", "some-model")
+        ]
+        assert cases[0].response.startswith("<document>")
@@ -0,0 +1,91 @@
+"""Tests for the LLM response cache."""
+
+import os
+from pathlib import Path
+
+from md_edit_bench.cache import CachedResponse, LLMCache, make_cache_key
+from md_edit_bench.models import LLMCall, LLMUsage
+
+
+def _entry(content: str = "output") -> CachedResponse:
+    return CachedResponse(
+        model="openai/gpt-4o",
+        request="[user]\nhello",
+        content=content,
+        tokens_in=12,
+        tokens_out=34,
+        cost_usd=0.0123,
+    )
+
+
+class TestMakeCacheKey:
+    def test_stable_for_identical_inputs(self):
+        messages: list[dict[str, object]] = [{"role": "user", "content": "hi"}]
+        assert make_cache_key("m", messages, None, 100) == make_cache_key("m", messages, None, 100)
+
+    def test_changes_with_each_input(self):
+        messages: list[dict[str, object]] = [{"role": "user", "content": "hi"}]
+        base = make_cache_key("m", messages, None, 100)
+        assert make_cache_key("other", messages, None, 100) != base
+        assert make_cache_key("m", [{"role": "user", "content": "ho"}], None, 100) != base
+        assert make_cache_key("m", messages, {"type": "object"}, 100) != base
+        assert make_cache_key("m", messages, None, 200) != base
+
+
+class TestLLMCache:
+    def test_replay_reconstructs_usage(self, tmp_path: Path):
+        cache = LLMCache(tmp_path, mode="replay")
+        cache.put("ab" * 32, _entry())
+
+        cached = cache.get("ab" * 32)
+        assert cached is not None
+        assert cached.content == "output"
+        assert cached.to_usage() == LLMUsage(
+            tokens_in=12,
+            tokens_out=34,
+            cost_usd=0.0123,
+            calls=[LLMCall(model="openai/gpt-4o", request="[user]\nhello", response="output")],
+        )
+        assert cache.stats.hits == 1
+        assert cache.stats.writes == 1
+
+    def test_miss_is_counted(self, tmp_path: Path):
+        cache = LLMCache(tmp_path, mode="replay")
+        assert cache.get("cd" * 32) is None
+        assert cache.stats.misses == 1
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path):
+        cache = LLMCache(tmp_path, mode="replay")
+        cache.put("ef" * 32, _entry())
+        (tmp_path / "ef" / f"{'ef' * 32}.json").write_text("{not json", encoding="utf-8")
+        assert cache.get("ef" * 32) is None
+        assert cache.stats.misses == 1
+
+    def test_evicts_least_recently_used(self, tmp_path: Path):
+        size = len(_entry().model_dump_json())
+        cache = LLMCache(tmp_path, mode="record", max_bytes=size * 2)
+        keys = ["a1" * 32, "b2" * 32, "c3" * 32]
+
+        cache.put(keys[0], _entry())
+        cache.put(keys[1], _entry())
+        # Make the first entry the oldest, then touch it so the second becomes LRU
+        os.utime(tmp_path / "a1" / f"{keys[0]}.json", (1, 1))
+        os.utime(tmp_path / "b2" / f"{keys[1]}.json", (2, 2))
+        assert cache.get(keys[0]) is not None
+
+        cache.put(keys[2], _entry())
+
+        assert cache.stats.evictions == 1
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+
+    def test_modes(self, tmp_path: Path):
+        assert not LLMCache(tmp_path, mode="off").reads
+        assert not LLMCache(tmp_path, mode="off").writes
+        assert LLMCache(tmp_path, mode="record").writes
+        assert not LLMCache(tmp_path, mode="record").reads
+        assert LLMCache(tmp_path, mode="replay").reads
+        assert LLMCache(tmp_path, mode="replay").writes
+        assert LLMCache(tmp_path, mode="offline").reads
+        assert not LLMCache(tmp_path, mode="offline").writes
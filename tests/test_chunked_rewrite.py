@@ -0,0 +1,52 @@
+"""Tests for splitting and stitching documents in chunked_rewrite."""
+
+from md_edit_bench.algorithms.chunked_rewrite.chunked_rewrite import (
+    parse_part_numbers,
+    split_parts,
+    stitch,
+)
+
+DOCUMENT = """# Title
+
+Intro paragraph.
+
+## First
+
+First section text.
+
+```bash
+# not a heading
+echo hi
+```
+
+## Second
+
+Second section text.
+
+### Nested
+
+Nested text.
+"""
+
+
+class TestSplitParts:
+    def test_packs_sections_into_parts(self):
+        parts = split_parts(DOCUMENT, max_chars=60)
+        assert "\n".join(parts) == DOCUMENT
+        assert [part.split("\n")[0] for part in parts] == ["# Title", "## First", "## Second"]
+        assert "# not a heading" in parts[1]  # Never split inside a code fence
+
+        assert split_parts(DOCUMENT) == [DOCUMENT]
+        assert split_parts("No headings at all.", max_chars=5) == ["No headings at all."]
+
+    def test_stitch_keeps_blank_lines_between_parts(self):
+        assert stitch("\n## First\n\nText.\n\n", "## First\n\nNew text.") == (
+            "\n## First\n\nNew text.\n\n"
+        )
+
+
+class TestParsePartNumbers:
+    def test_parse(self):
+        assert parse_part_numbers("Thinking about 7...\n<parts>3, 1,3</parts>", 5) == [1, 3]
+        assert parse_part_numbers("Parts 2 and 9", 5) == []  # No <parts> tag
+        assert parse_part_numbers("<parts></parts>", 5) == []
@@ -0,0 +1,77 @@
+"""Tests for the pooled HTTP clients, against a local keep-alive server."""
+
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from md_edit_bench.clients import ClientPool
+
+COMPLETION = {
+    "id": "c",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "m",
+    "choices": [
+        {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}
+    ],
+}
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def do_POST(self) -> None:
+        _ = self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        _ = self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def base_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+class TestClientPool:
+    def test_one_client_per_base_url(self):
+        pool = ClientPool()
+        client = pool.get("http://a.test/v1", "k")
+        assert pool.get("http://a.test/v1", "k") is client
+        assert pool.get("http://b.test/v1", "k") is not client
+        assert list(pool.stats()) == ["a.test", "b.test"]
+
+    def test_reuses_connections_and_closes(self, base_url: str):
+        pool = ClientPool()
+        client = pool.get(base_url, "k")
+
+        async def run() -> None:
+            for _ in range(3):
+                response = await client.chat.completions.create(
+                    model="m", messages=[{"role": "user", "content": "hi"}]
+                )
+                assert response.choices[0].message.content == "ok"
+
+            [stats] = pool.stats().values()
+            assert (stats.requests, stats.connections_opened, stats.tls_handshakes) == (3, 1, 0)
+            assert stats.handshakes_avoided == 2
+
+            # Connections belong to this event loop, so close them in it too
+            await pool.aclose()
+
+        asyncio.run(run())
+        assert client.is_closed()
+        assert pool.stats() == {}
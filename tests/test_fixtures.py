@@ -0,0 +1,113 @@
+"""Tests for fixture discovery."""
+
+from pathlib import Path
+
+import pytest
+from md_edit_bench.fixtures import MMAP_THRESHOLD, FixtureFilter, FixtureIndex
+
+
+def write_fixture(directory: Path, stem: str, initial: str, final: str = "# Done\n") -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    _ = (directory / f"{stem}.initial.md").write_text(initial, encoding="utf-8")
+    _ = (directory / f"{stem}.changes.md").write_text("Finish it.", encoding="utf-8")
+    _ = (directory / f"{stem}.final.md").write_text(final, encoding="utf-8")
+
+
+class TestFixtureIndex:
+    def test_select_and_load(self, tmp_path: Path):
+        write_fixture(tmp_path / "simple", "b_table", "# Table\n")
+        write_fixture(tmp_path / "simple", "a_notes", "# Notes — café\n")
+        write_fixture(tmp_path / "hard", "big_table", "# Big\n")
+        # Incomplete fixtures are skipped
+        _ = (tmp_path / "hard" / "orphan.initial.md").write_text("# Orphan\n", encoding="utf-8")
+
+        index = FixtureIndex(tmp_path)
+        assert [f.name for f in index.entries] == [
+            "hard/big_table",
+            "simple/a_notes",
+            "simple/b_table",
+        ]
+        assert [f.name for f in index.select(category="simple")] == [
+            "simple/a_notes",
+            "simple/b_table",
+        ]
+        assert [
+            f.name for f in index.select(fixture_filter=FixtureFilter(patterns=("*table",)))
+        ] == [
+            "hard/big_table",
+            "simple/b_table",
+        ]
+
+        (fixture,) = index.load("simple", FixtureFilter(patterns=("a_*",)))
+        assert fixture.initial == "# Notes — café\n"
+        assert fixture.changes == "Finish it."
+        assert fixture.expected == "# Done\n"
+
+    def test_content_hash(self, tmp_path: Path):
+        large = "# Large\n" + "A line of the document.\n" * (MMAP_THRESHOLD // 20)
+        write_fixture(tmp_path / "hard", "large", large)
+        write_fixture(tmp_path / "hard", "small", "# Small\n")
+        write_fixture(tmp_path / "other", "small", "# Small\n")
+        large_files, small_files = FixtureIndex(tmp_path).select(category="hard")
+
+        large_fixture = large_files.load()
+        assert large_fixture.initial == large
+        assert large_files.content_hash() == large_fixture.content_hash
+        assert small_files.content_hash() == small_files.load().content_hash
+        assert small_files.content_hash() != large_fixture.content_hash
+
+        # The hash covers contents only: a copy in another category has the same one
+        other_files = FixtureIndex(tmp_path).select(category="other")[0]
+        assert other_files.content_hash() == small_files.content_hash()
+        write_fixture(tmp_path / "other", "small", "# Small\n", final="# Changed\n")
+        assert other_files.content_hash() != small_files.content_hash()
+
+    def test_crlf_line_endings(self, tmp_path: Path):
+        large = "# Large\n" + "A line of the document.\n" * (MMAP_THRESHOLD // 20)
+        for stem, initial in [("small", "# Small\nText.\n"), ("large", large)]:
+            write_fixture(tmp_path / "lf", stem, initial)
+            write_fixture(tmp_path / "crlf", stem, initial.replace("\n", "\r\n"))
+        index = FixtureIndex(tmp_path)
+
+        for lf_files, crlf_files in zip(
+            index.select(category="lf"), index.select(category="crlf"), strict=True
+        ):
+            crlf_fixture = crlf_files.load()
+            assert "\r" not in crlf_fixture.initial
+            assert crlf_fixture.initial == lf_files.load().initial
+            assert crlf_files.content_hash() == crlf_fixture.content_hash
+            assert crlf_files.content_hash() == lf_files.content_hash()
+            assert crlf_files.line_count() == lf_files.line_count()
+
+
+class TestFixtureFilter:
+    def test_patterns_lines_and_tags(self, tmp_path: Path):
+        write_fixture(tmp_path / "simple", "short", "# Short")
+        write_fixture(tmp_path / "hard", "long", "# Long\n" + "line\n" * 99)
+        write_fixture(tmp_path / "hard", "tables", "# Tables\n| a |\n")
+        _ = (tmp_path / "hard" / "tables.meta.toml").write_text(
+            'tags = ["tables", "slow"]\n', encoding="utf-8"
+        )
+        index = FixtureIndex(tmp_path)
+
+        def names(fixture_filter: FixtureFilter) -> list[str]:
+            return [files.name for files in index.select(fixture_filter=fixture_filter)]
+
+        assert not FixtureFilter()
+        assert names(FixtureFilter()) == ["hard/long", "hard/tables", "simple/short"]
+        assert names(FixtureFilter(patterns=("short", "hard/t*"))) == [
+            "hard/tables",
+            "simple/short",
+        ]
+        assert names(FixtureFilter(min_lines=2)) == ["hard/long", "hard/tables"]
+        assert names(FixtureFilter(max_lines=1)) == ["simple/short"]
+        assert names(FixtureFilter(min_lines=100, max_lines=100)) == ["hard/long"]
+        assert names(FixtureFilter(tags=("tables",))) == ["hard/tables"]
+        assert names(FixtureFilter(tags=("tables", "code"))) == []
+
+    def test_invalid_metadata(self, tmp_path: Path):
+        write_fixture(tmp_path / "simple", "broken", "# Broken\n")
+        _ = (tmp_path / "simple" / "broken.meta.toml").write_text("tags = 1\n", encoding="utf-8")
+        (files,) = FixtureIndex(tmp_path).entries
+        with pytest.raises(ValueError, match=r"broken\.meta\.toml"):
+            _ = files.meta()
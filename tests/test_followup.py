@@ -0,0 +1,48 @@
+"""Tests for conversation retries of failed edits."""
+
+from md_edit_bench.algorithms.followup import failure_report, nearest_excerpt, retry_request
+from md_edit_bench.algorithms.search_replace.search_replace import pm
+
+DOCUMENT = "\n".join(f"Line {i} of the document." for i in range(1, 21))
+
+
+class TestNearestExcerpt:
+    def test_window_with_most_matching_lines(self):
+        search = (
+            "Line 10 of the document.\nLine 11 of the document, edited.\nLine 12 of the document."
+        )
+        assert nearest_excerpt(DOCUMENT, search, context=1) == "\n".join(
+            f"Line {i} of the document." for i in range(9, 14)
+        )
+
+    def test_falls_back_to_most_similar_line(self):
+        assert nearest_excerpt(DOCUMENT, "Line 17 of teh document", context=0) == (
+            "Line 17 of the document."
+        )
+        assert nearest_excerpt(DOCUMENT, "Something else entirely") is None
+        assert nearest_excerpt(DOCUMENT, "\n\n") is None
+
+    def test_ignores_windows_sharing_only_a_trivial_line(self):
+        document = DOCUMENT.replace("Line 5 of the document.", "---")
+        search = "Unrelated heading\n---\nSome paragraph that is not in the document at all."
+        assert nearest_excerpt(document, search) is None
+
+
+class TestRetryRequest:
+    def test_conversation_keeps_first_exchange(self):
+        failures = [("Block 2", "Line 5 of the document"), ("Block 3", None)]
+        messages = retry_request(pm, ("prompt", "response"), DOCUMENT, failures, failed_blocks="")
+        assert isinstance(messages, list)
+        assert [m["role"] for m in messages] == ["user", "assistant", "user"]
+        assert messages[1].get("content") == "response"
+        followup = str(messages[2].get("content"))
+        assert failure_report(DOCUMENT, failures) in followup
+        assert "Block 3: no similar text in the document" in followup
+        assert DOCUMENT not in followup
+
+    def test_fresh_mode_sends_current_document(self):
+        prompt = retry_request(
+            pm, ("prompt", "response"), DOCUMENT, [], mode="fresh", failed_blocks="Block 2:"
+        )
+        assert isinstance(prompt, str)
+        assert DOCUMENT in prompt
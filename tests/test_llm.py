@@ -0,0 +1,131 @@
+"""Tests for LLM request construction and streamed completion metrics."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+
+import pytest
+from md_edit_bench.llm import (
+    StreamAborted,
+    _percentile,  # pyright: ignore[reportPrivateUsage]
+    _stream,  # pyright: ignore[reportPrivateUsage]
+    with_cache_control,
+)
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
+
+MESSAGES: list[ChatCompletionMessageParam] = [
+    {"role": "system", "content": "You edit documents."},
+    {"role": "user", "content": "<original_document>\n# Doc\n</original_document>\n\nEdit it."},
+    {"role": "assistant", "content": "Done."},
+    {"role": "user", "content": "Block 1 failed."},
+]
+
+
+class TestCacheControl:
+    def test_marks_first_user_message(self):
+        marked = with_cache_control("anthropic/claude-sonnet-4", MESSAGES)
+        assert marked[1] == {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "<original_document>\n# Doc\n</original_document>\n\nEdit it.",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+        assert marked[0] == MESSAGES[0]
+        assert marked[2:] == MESSAGES[2:]
+
+    def test_automatic_caching_providers_unchanged(self):
+        assert with_cache_control("openai/gpt-oss-120b", MESSAGES) is MESSAGES
+
+
+def _chunk(
+    content: str | None = None, usage: dict[str, object] | None = None
+) -> ChatCompletionChunk:
+    choices = [] if content is None else [{"index": 0, "delta": {"content": content}}]
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "c",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "m",
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+class FakeStream:
+    """Yields chunks after a delay each, like a streamed response."""
+
+    def __init__(self, chunks: list[tuple[float, ChatCompletionChunk]]):
+        self.chunks: list[tuple[float, ChatCompletionChunk]] = chunks
+        self.closed: bool = False
+
+    async def __aiter__(self) -> AsyncIterator[ChatCompletionChunk]:
+        for delay, chunk in self.chunks:
+            await asyncio.sleep(delay)
+            yield chunk
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _client(stream: FakeStream) -> SimpleNamespace:
+    async def create(**_kwargs: object) -> FakeStream:
+        return stream
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+class AbortOnSecondDelta:
+    def __init__(self):
+        self.fed: list[str] = []
+
+    def reset(self) -> None:
+        self.fed = []
+
+    def feed(self, delta: str) -> None:
+        self.fed.append(delta)
+        if len(self.fed) == 2:
+            raise StreamAborted("bad format")
+
+
+class TestStream:
+    def test_percentile(self):
+        assert _percentile([], 0.5) is None
+        assert _percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+        assert _percentile([1.0, 2.0, 3.0, 4.0], 0.9) == 4.0
+
+    def test_metrics_exclude_reasoning_tokens(self):
+        usage: dict[str, object] = {
+            "prompt_tokens": 50,
+            "completion_tokens": 105,
+            "total_tokens": 155,
+            "completion_tokens_details": {"reasoning_tokens": 100},
+        }
+        stream = FakeStream(
+            [
+                (0.05, _chunk("a")),  # Reasoning happens before the first content
+                *((0.02, _chunk(c)) for c in "bcde"),
+                (0.0, _chunk(usage=usage)),
+            ]
+        )
+        completion = asyncio.run(_stream(_client(stream), "m", []))  # pyright: ignore[reportArgumentType]
+        assert completion.content == "abcde"
+        assert (completion.tokens_in, completion.tokens_out) == (50, 105)
+        assert completion.ttft_seconds is not None
+        assert completion.ttft_seconds >= 0.05
+        assert completion.inter_token_p50_seconds == pytest.approx(0.02, abs=0.015)
+        # 4 tokens after the first over ~0.08s, not 104
+        assert completion.tokens_per_second == pytest.approx(50, rel=0.5)
+
+    def test_abort_reports_partial_usage(self):
+        stream = FakeStream([(0.0, _chunk(c)) for c in "abc"])
+        with pytest.raises(StreamAborted) as info:
+            _ = asyncio.run(_stream(_client(stream), "m", [], AbortOnSecondDelta()))  # pyright: ignore[reportArgumentType]
+        assert info.value.content == "ab"
+        assert info.value.usage.tokens_out == 2
+        assert stream.closed
@@ -0,0 +1,95 @@
+"""Tests for run manifests (resuming interrupted runs)."""
+
+from dataclasses import replace
+from pathlib import Path
+
+from md_edit_bench import models
+from md_edit_bench.algorithms import get_algorithm
+from md_edit_bench.manifest import RunManifest, cell_key
+from md_edit_bench.models import AlgorithmResult, Fixture, LLMCall, LLMUsage
+
+FIXTURE = Fixture(
+    name="simple/notes",
+    initial="# Title\nOld text.\n",
+    changes="Replace the text.",
+    expected="# Title\nNew text.\n",
+)
+
+
+def make_result(model: str) -> models.TestResult:
+    call = LLMCall(model=model, request="...", response="...", ttft_seconds=0.5)
+    return models.TestResult(
+        fixture=FIXTURE.name,
+        algorithm="full_rewrite",
+        model=model,
+        algorithm_result=AlgorithmResult(
+            output="# Title\nNew text.\n",
+            success=True,
+            error=None,
+            usage=LLMUsage(tokens_in=10, tokens_out=5, cost_usd=0.01, calls=[call]),
+        ),
+        exact_match=True,
+        similarity_score=1.0,
+        duration_seconds=1.5,
+    )
+
+
+class TestRunManifest:
+    def test_resume_skips_recorded_cells(self, tmp_path: Path):
+        algorithm = get_algorithm("full_rewrite")
+        manifest = RunManifest.create(tmp_path, ["full_rewrite"], ["prov/a", "prov/b"])
+        manifest.plan([FIXTURE], [algorithm], ["prov/a", "prov/b"])
+        manifest.record(make_result("prov/a"))
+        manifest.close()
+        # An entry cut short by a crash mid-write is ignored
+        with manifest.path.open("a", encoding="utf-8") as f:
+            _ = f.write('{"cell": "abc", "result": {"fixture"')
+
+        resumed = RunManifest.load(tmp_path, manifest.run_id)
+        resumed.plan([FIXTURE], [algorithm], ["prov/a", "prov/b"])
+        assert resumed.header.models == ["prov/a", "prov/b"]
+        assert resumed.completed(FIXTURE.name, "full_rewrite", "prov/b") is None
+
+        done = resumed.completed(FIXTURE.name, "full_rewrite", "prov/a")
+        assert done is not None
+        assert done.passed
+        assert done.cost_usd == 0.01
+        assert done.duration_seconds == 1.5
+        assert done.ttft_seconds == 0.5
+        assert done.algorithm_result.output is None
+
+    def test_resume_reruns_cells_failed_by_the_provider(self, tmp_path: Path):
+        algorithm = get_algorithm("full_rewrite")
+        manifest = RunManifest.create(tmp_path, ["full_rewrite"], ["prov/a", "prov/b"])
+        manifest.plan([FIXTURE], [algorithm], ["prov/a", "prov/b"])
+        for model, retryable in [("prov/a", True), ("prov/b", False)]:
+            errored = make_result(model)
+            errored.algorithm_result = AlgorithmResult(
+                output=None, success=False, error="Error", usage=LLMUsage(), retryable=retryable
+            )
+            manifest.record(errored)
+        manifest.close()
+
+        resumed = RunManifest.load(tmp_path, manifest.run_id)
+        resumed.plan([FIXTURE], [algorithm], ["prov/a", "prov/b"])
+        assert resumed.completed(FIXTURE.name, "full_rewrite", "prov/a") is None
+        done = resumed.completed(FIXTURE.name, "full_rewrite", "prov/b")
+        assert done is not None
+        assert not done.algorithm_result.success
+
+    def test_runs_started_in_the_same_second_get_distinct_ids(self, tmp_path: Path):
+        manifests = [RunManifest.create(tmp_path, ["full_rewrite"], ["prov/a"]) for _ in range(3)]
+        for manifest in manifests:
+            manifest.close()
+        run_ids = [manifest.run_id for manifest in manifests]
+        assert len(set(run_ids)) == 3
+        for run_id in run_ids:
+            assert RunManifest.load(tmp_path, run_id).run_id == run_id
+
+    def test_cell_key_covers_fixture_contents(self):
+        algorithm = get_algorithm("full_rewrite")
+        key = cell_key(FIXTURE, algorithm, "prov/a")
+        assert cell_key(FIXTURE, algorithm, "prov/a") == key
+        assert cell_key(FIXTURE, algorithm, "prov/b") != key
+        edited = replace(FIXTURE, changes="Replace the text with something else.")
+        assert cell_key(edited, algorithm, "prov/a") != key
@@ -0,0 +1,43 @@
+"""Tests for the prompt template registry."""
+
+from pathlib import Path
+
+import pytest
+from md_edit_bench.utils import TemplateRegistry
+
+
+def write_templates(directory: Path) -> None:
+    _ = (directory / "format.jinja2").write_text("Format: {{ style }}", encoding="utf-8")
+    _ = (directory / "user.jinja2").write_text(
+        "{% include 'format.jinja2' %}\n{{ initial }}\n{% for e in errors %}- {{ e }}\n{% endfor %}",
+        encoding="utf-8",
+    )
+
+
+class TestTemplateRegistry:
+    def test_resolves_names_and_memoizes_renders(self, tmp_path: Path):
+        write_templates(tmp_path)
+        registry = TemplateRegistry()
+
+        first = registry.render(tmp_path, "user.jinja2", style="diff", initial="# Doc", errors=())
+        assert first == "Format: diff# Doc\n"  # trim_blocks drops the newline after tags
+        assert registry.render(tmp_path, "user", style="diff", initial="# Doc", errors=()) == first
+        assert registry.render(tmp_path, "user", style="json", initial="# Doc", errors=()) != first
+        # Unhashable arguments are rendered every time
+        assert registry.render(tmp_path, "user", style="diff", initial="", errors=["a"]).endswith(
+            "- a\n"
+        )
+
+        stats = registry.stats[f"{tmp_path.name}/user.jinja2"]
+        assert (stats.renders, stats.cache_hits) == (4, 1)
+        assert registry.totals().renders == 4
+
+        with pytest.raises(FileNotFoundError):
+            _ = registry.render(tmp_path, "missing")
+
+    def test_bounded_cache(self, tmp_path: Path):
+        write_templates(tmp_path)
+        registry = TemplateRegistry(max_cached_renders=1)
+        for style in ("a", "b", "a"):
+            _ = registry.render(tmp_path, "format", style=style)
+        assert registry.totals().cache_hits == 0
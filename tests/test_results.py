@@ -0,0 +1,76 @@
+"""Tests for writing results as they complete."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from md_edit_bench import models
+from md_edit_bench.models import AlgorithmResult, LLMCall, LLMUsage
+from md_edit_bench.results import ResultsWriter
+from md_edit_bench.scoring import score_output
+
+
+def make_result(output: str) -> models.TestResult:
+    call = LLMCall(model="prov/model-a", request="<document>...</document>", response=output)
+    score = score_output(output, "# Title\nExpected text.\n")
+    return models.TestResult(
+        fixture="simple/notes",
+        algorithm="full_rewrite",
+        model="prov/model-a",
+        algorithm_result=AlgorithmResult(
+            output=output, success=True, error=None, usage=LLMUsage(calls=[call])
+        ),
+        exact_match=score.exact_match,
+        similarity_score=score.overall_score,
+        diff=score.diff,
+    )
+
+
+class TestResultsWriter:
+    def test_writes_and_releases_payloads(self, tmp_path: Path):
+        result = make_result("# Title\nOther text.\n")
+        writer = ResultsWriter(tmp_path)
+        writer.start()
+        asyncio.run(writer.submit(result))
+        writer.close()
+
+        directory = tmp_path / "simple" / "notes" / "full_rewrite" / "model-a"
+        record: dict[str, object] = json.loads(  # pyright: ignore[reportAny]
+            (directory / "result.json").read_text(encoding="utf-8")
+        )
+        assert record["similarity_score"] == result.similarity_score
+        assert (directory / "output.md").read_text(encoding="utf-8") == "# Title\nOther text.\n"
+        assert "+Other text." in (directory / "diff.txt").read_text(encoding="utf-8")
+        assert (directory / "llm_request.txt").exists()
+        assert writer.written == 1
+
+        assert result.algorithm_result.output is None
+        assert result.algorithm_result.usage.calls[0].response == ""
+        assert result.diff_from_expected == ""
+
+    def test_keep_outputs(self, tmp_path: Path):
+        result = make_result("# Title\nOther text.\n")
+        writer = ResultsWriter(tmp_path, keep_outputs=True, max_queued=1)
+        writer.start()
+        asyncio.run(writer.submit(result))
+        writer.close()
+
+        assert result.algorithm_result.output == "# Title\nOther text.\n"
+        assert "+Other text." in result.diff_from_expected
+        assert result.algorithm_result.usage.calls[0].request == ""
+
+    def test_close_reraises_write_errors_after_draining(self, tmp_path: Path):
+        # A lone surrogate can't be encoded as UTF-8, so writing output.md fails
+        results = [make_result("# Title\n\ud800\n"), *(make_result("# Title\n") for _ in range(3))]
+        writer = ResultsWriter(tmp_path, max_queued=1)
+        writer.start()
+
+        async def submit_all() -> None:
+            for result in results:
+                await writer.submit(result)
+
+        asyncio.run(asyncio.wait_for(submit_all(), timeout=10))
+        with pytest.raises(UnicodeEncodeError):
+            writer.close()
+        assert writer.written == 3
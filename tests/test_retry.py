@@ -0,0 +1,96 @@
+"""Tests for transient-failure retries."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+from md_edit_bench.retry import (
+    CallStats,
+    CircuitBreaker,
+    Retrier,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=httpx.Request("POST", "http://x"))
+    return openai.APIStatusError("error", response=response, body=None)  # pyright: ignore[reportArgumentType]
+
+
+class TestClassification:
+    def test_retryable(self):
+        assert is_retryable(openai.APITimeoutError(request=httpx.Request("POST", "http://x")))  # pyright: ignore[reportArgumentType]
+        for status in (408, 409, 429, 500, 502, 503):
+            assert is_retryable(_status_error(status))
+
+    def test_not_retryable(self):
+        for status in (400, 401, 403, 404, 422):
+            assert not is_retryable(_status_error(status))
+        assert not is_retryable(ValueError("bad output"))
+
+    def test_retry_after(self):
+        assert retry_after_seconds(_status_error(429, {"retry-after": "3"})) == 3.0
+        assert retry_after_seconds(_status_error(429, {"retry-after-ms": "1500"})) == 1.5
+        assert retry_after_seconds(_status_error(429, {"retry-after": "soon"})) is None
+        assert retry_after_seconds(_status_error(429)) is None
+        past = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert retry_after_seconds(_status_error(503, {"retry-after": past})) == 0.0
+
+
+class TestRetrier:
+    def _run(self, retrier: Retrier, outcomes: list[Exception | str]) -> tuple[str, CallStats]:
+        pending = list(outcomes)
+
+        async def attempt() -> str:
+            outcome = pending.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        stats = CallStats()
+        result = asyncio.run(retrier.run("m", attempt, stats))
+        return result, stats
+
+    def test_retries_transient_errors(self):
+        retrier = Retrier(base_delay=0.0)
+        result, stats = self._run(retrier, [_status_error(503), _status_error(429), "ok"])
+        assert result == "ok"
+        assert stats.retries == 2
+        assert retrier.stats.retries == 2
+        assert retrier.budget == 198
+
+    def test_permanent_error_is_raised_immediately(self):
+        retrier = Retrier(base_delay=0.0)
+        with pytest.raises(openai.APIStatusError):
+            _ = self._run(retrier, [_status_error(400), "ok"])
+        assert retrier.stats.retries == 0
+
+    def test_gives_up_after_max_retries(self):
+        retrier = Retrier(max_retries=1, base_delay=0.0)
+        with pytest.raises(openai.APIStatusError):
+            _ = self._run(retrier, [_status_error(500), _status_error(500), "ok"])
+        assert retrier.stats.gave_up == 1
+
+    def test_budget_is_shared(self):
+        retrier = Retrier(base_delay=0.0, budget=1)
+        _ = self._run(retrier, [_status_error(500), "ok"])
+        with pytest.raises(openai.APIStatusError):
+            _ = self._run(retrier, [_status_error(500), "ok"])
+        assert retrier.stats.budget_exhausted == 1
+
+    def test_honors_retry_after(self):
+        retrier = Retrier(base_delay=100.0)
+        assert retrier.backoff(5, _status_error(429, {"retry-after-ms": "10"})) == 0.01
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_closes_on_success(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+        assert not breaker.record_failure()
+        assert breaker.remaining() == 0
+        assert breaker.record_failure()
+        assert breaker.remaining() > 0
+        breaker.record_success()
+        assert breaker.remaining() == 0
@@ -0,0 +1,47 @@
+"""Tests for the CLI's fixture selection."""
+
+import argparse
+from pathlib import Path
+
+import pytest
+from md_edit_bench.fixtures import FixtureFilter, FixtureIndex
+from md_edit_bench.runner import _load_fixtures  # pyright: ignore[reportPrivateUsage]
+
+
+def write_fixture(directory: Path, stem: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for suffix in (".initial.md", ".changes.md", ".final.md"):
+        _ = (directory / f"{stem}{suffix}").write_text("# Notes\n", encoding="utf-8")
+
+
+class TestLoadFixtures:
+    def test_selects_fixtures(self, tmp_path: Path):
+        write_fixture(tmp_path / "simple", "notes")
+        write_fixture(tmp_path / "custom", "notes")
+        index = FixtureIndex(tmp_path)
+        fixtures = _load_fixtures(argparse.ArgumentParser(), index, "custom", FixtureFilter())
+        assert [fixture.name for fixture in fixtures] == ["custom/notes"]
+
+    def test_unknown_category_is_a_usage_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        write_fixture(tmp_path / "simple", "notes")
+        with pytest.raises(SystemExit):
+            _ = _load_fixtures(
+                argparse.ArgumentParser(), FixtureIndex(tmp_path), "smiple", FixtureFilter()
+            )
+        assert "invalid choice: 'smiple' (choose from simple)" in capsys.readouterr().err
+
+    def test_invalid_metadata_is_a_usage_error(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        write_fixture(tmp_path / "simple", "notes")
+        _ = (tmp_path / "simple" / "notes.meta.toml").write_text("tags = [", encoding="utf-8")
+        with pytest.raises(SystemExit):
+            _ = _load_fixtures(
+                argparse.ArgumentParser(),
+                FixtureIndex(tmp_path),
+                None,
+                FixtureFilter(tags=("tables",)),
+            )
+        assert "Invalid fixture metadata" in capsys.readouterr().err
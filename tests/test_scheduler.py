@@ -0,0 +1,92 @@
+"""Tests for the request scheduler."""
+
+import asyncio
+
+import pytest
+from md_edit_bench.scheduler import PriorityGate, Scheduler, parse_limits, track_cell
+
+
+class TestParseLimits:
+    def test_default_and_scoped(self):
+        assert parse_limits(["60", "anthropic=30", "openai/gpt-4.1=10"]) == {
+            "": 60.0,
+            "anthropic": 30.0,
+            "openai/gpt-4.1": 10.0,
+        }
+
+    def test_none(self):
+        assert parse_limits(None) == {}
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            _ = parse_limits(["anthropic=fast"])
+
+    @pytest.mark.parametrize("spec", ["0", "-5", "anthropic=-1", "nan", "inf"])
+    def test_rejects_rates_that_are_not_positive(self, spec: str):
+        with pytest.raises(ValueError, match="must be a number above 0"):
+            _ = parse_limits([spec])
+
+
+class TestPriorityGate:
+    def test_waiters_granted_lowest_priority_first(self):
+        async def scenario() -> list[int]:
+            gate = PriorityGate(1)
+            order: list[int] = []
+            await gate.acquire(0)
+
+            async def waiter(priority: int) -> None:
+                await gate.acquire(priority)
+                order.append(priority)
+                gate.release()
+
+            tasks = [asyncio.create_task(waiter(p)) for p in (30, 10, 20)]
+            await asyncio.sleep(0)
+            assert gate.queue_depth == 3
+            gate.release()
+            _ = await asyncio.gather(*tasks)
+            return order
+
+        assert asyncio.run(scenario()) == [10, 20, 30]
+
+    def test_cancelled_waiter_does_not_leak_slot(self):
+        async def scenario() -> int:
+            gate = PriorityGate(1)
+            await gate.acquire(0)
+            task = asyncio.create_task(gate.acquire(5))
+            await asyncio.sleep(0)
+            _ = task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            gate.release()
+            return gate.in_use
+
+        assert asyncio.run(scenario()) == 0
+
+
+class TestScheduler:
+    def test_stats_attributed_to_cell(self):
+        async def scenario() -> list[float]:
+            scheduler = Scheduler(max_concurrency=1)
+
+            async def cell() -> float:
+                with track_cell(priority=1) as stats:
+                    async with scheduler.slot("openai/gpt-4.1"):
+                        await asyncio.sleep(0.05)
+                    assert stats.requests == 1
+                    return stats.queue_wait_seconds
+
+            return list(await asyncio.gather(cell(), cell()))
+
+        waits = sorted(asyncio.run(scenario()))
+        assert waits[0] < 0.05 <= waits[1]
+
+    def test_most_specific_scope_wins(self):
+        scheduler = Scheduler(rpm={"": 100, "anthropic": 50, "anthropic/claude-sonnet-4": 5})
+        for model, expected in (
+            ("anthropic/claude-sonnet-4", 5),
+            ("anthropic/claude-opus-4", 50),
+            ("openai/gpt-4.1", 100),
+        ):
+            bucket = scheduler._bucket(model, scheduler.rpm, {})  # pyright: ignore[reportPrivateUsage]
+            assert bucket is not None
+            assert bucket.capacity == expected
@@ -0,0 +1,76 @@
+"""Tests for scoring."""
+
+import asyncio
+from pathlib import Path
+
+from md_edit_bench.models import Fixture
+from md_edit_bench.scoring import (
+    DiffScorer,
+    ScorePool,
+    expected_profile,
+    generate_diff,
+    score_output,
+)
+
+FIXTURE = Fixture(
+    name="simple/notes",
+    initial="# Notes\n\nFirst line.\n",
+    changes="Add a second line.",
+    expected="# Notes\n\nFirst line.\nSecond line.\n",
+)
+
+
+class TestExpectedProfile:
+    def test_cached_per_document(self):
+        profile = expected_profile(FIXTURE.expected)
+        assert expected_profile(FIXTURE.expected) is profile
+        assert profile.headers == ("# Notes",)
+        assert profile.raw_line_count == 4
+
+    def test_scores_like_raw_text(self):
+        scorer = DiffScorer()
+        output = "# Notes\n\nSecond line.\nFirst line.\n"
+        score = scorer.score(output, scorer.profile(FIXTURE.expected))
+        assert score == score_output(output, FIXTURE.expected)
+        assert score.lines_correct == 3
+        assert score.header_order_correct
+
+
+class TestDiffHandle:
+    def test_rendered_on_demand(self, tmp_path: Path):
+        output = "# Notes\n\nFirst line.\n"
+        score = score_output(output, FIXTURE.expected)
+        assert score.diff is not None
+        assert score.unified_diff == generate_diff(output, FIXTURE.expected)
+        assert "-Second line." in score.unified_diff
+
+        assert score.diff.write(tmp_path / "diff.txt")
+        assert (tmp_path / "diff.txt").read_text(encoding="utf-8") == score.unified_diff
+
+    def test_exact_match_writes_nothing(self, tmp_path: Path):
+        score = score_output(FIXTURE.expected, FIXTURE.expected)
+        assert score.diff is not None
+        assert not score.diff.write(tmp_path / "diff.txt")
+        assert not (tmp_path / "diff.txt").exists()
+
+    def test_no_output(self):
+        assert score_output(None, FIXTURE.expected).unified_diff == "(no output to compare)"
+
+
+class TestScorePool:
+    def test_workers_score_like_inline(self):
+        pool = ScorePool(workers=1)
+        pool.start([FIXTURE])
+        try:
+            score = asyncio.run(pool.score(FIXTURE, "# Notes\n\nFirst line.\n"))
+        finally:
+            pool.shutdown()
+        assert score == score_output("# Notes\n\nFirst line.\n", FIXTURE.expected)
+        assert not score.exact_match
+        assert "-Second line." in score.unified_diff
+
+    def test_inline_without_workers(self):
+        pool = ScorePool(workers=0)
+        pool.start([FIXTURE])
+        score = asyncio.run(pool.score(FIXTURE, FIXTURE.expected))
+        assert score.exact_match
@@ -0,0 +1,75 @@
+"""Tests for the scoring similarity backends."""
+
+import difflib
+import random
+
+import pytest
+from md_edit_bench.config import FIXTURES_DIR
+from md_edit_bench.scoring import DiffScorer
+from md_edit_bench.similarity import (
+    SIMILARITY_BACKENDS,
+    DifflibSimilarity,
+    FastSimilarity,
+    lcs_length,
+)
+
+
+def _lcs_table(a: str, b: str) -> int:
+    """Textbook dynamic-programming LCS length."""
+    previous = [0] * (len(b) + 1)
+    for char in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if char == other else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+class TestLcsLength:
+    def test_matches_dynamic_programming(self):
+        rng = random.Random(0)  # noqa: S311 - deterministic fuzzing
+        for _ in range(300):
+            a = "".join(rng.choices("abc\n ", k=rng.randrange(40)))
+            b = "".join(rng.choices("abcd\n", k=rng.randrange(70)))
+            assert lcs_length(a, b) == _lcs_table(a, b)
+
+
+class TestBackends:
+    @pytest.mark.parametrize("name", sorted(SIMILARITY_BACKENDS))
+    def test_bounds(self, name: str):
+        backend = SIMILARITY_BACKENDS[name]  # pyright: ignore[reportArgumentType]
+        assert backend.ratio("", "") == 1.0
+        assert backend.ratio("same\ntext", "same\ntext") == 1.0
+        assert backend.ratio("", "text") == 0.0
+        assert 0.0 < backend.ratio("one\ntwo\nthree", "one\n2\nthree") < 1.0
+
+    def test_fast_close_to_difflib_on_small_edits(self):
+        scorer = DiffScorer()
+        rng = random.Random(0)  # noqa: S311 - deterministic fuzzing
+        for path in sorted((FIXTURES_DIR / "simple").glob("*.final.md")):
+            expected = scorer.normalize(path.read_text(encoding="utf-8"))
+            lines = expected.split("\n")
+            for _ in range(5):
+                i = rng.randrange(len(lines))
+                edited = [*lines[:i], lines[i][: len(lines[i]) // 2], *lines[i + 1 :]]
+                output = "\n".join(edited)
+                reference = DifflibSimilarity().ratio(output, expected)
+                assert abs(FastSimilarity().ratio(output, expected) - reference) <= 0.02
+
+    def test_fast_equals_difflib_on_short_texts(self):
+        # Under 200 characters difflib has no popular characters, and a single
+        # changed line leaves one region for SequenceMatcher to compare
+        a = "# Title\nKeep this line.\nThe quick brown fox.\nAnd this one."
+        b = "# Title\nKeep this line.\nThe quick red fox jumps.\nAnd this one."
+        expected = difflib.SequenceMatcher(None, a, b).ratio()
+        assert FastSimilarity().ratio(a, b) == pytest.approx(expected)
+
+
+class TestDiffScorer:
+    def test_uses_given_backend(self):
+        scorer = DiffScorer(DifflibSimilarity())
+        output, expected = "# A\nold line", "# A\nnew line"
+        reference = difflib.SequenceMatcher(None, output, expected).ratio()
+        profile = scorer.profile(expected)
+        assert scorer.score(output, profile).char_similarity == reference
+        assert scorer.score(expected, profile).char_similarity == 1.0
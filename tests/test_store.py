@@ -0,0 +1,70 @@
+"""Tests for the SQLite results store."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from md_edit_bench import models
+from md_edit_bench.models import AlgorithmResult, LLMUsage
+from md_edit_bench.store import ResultsStore
+
+
+def make_result(fixture: str, algorithm: str, passed: bool, cost: float) -> models.TestResult:
+    return models.TestResult(
+        fixture=fixture,
+        algorithm=algorithm,
+        model="prov/model-a",
+        algorithm_result=AlgorithmResult(
+            output=None, success=True, error=None, usage=LLMUsage(tokens_in=100, cost_usd=cost)
+        ),
+        exact_match=passed,
+        similarity_score=1.0 if passed else 0.5,
+        duration_seconds=2.0,
+    )
+
+
+class TestResultsStore:
+    def test_aggregates_across_runs(self, tmp_path: Path):
+        store = ResultsStore(tmp_path / "results.sqlite")
+        first, second = datetime(2025, 1, 1, 12), datetime(2025, 1, 2, 12)
+        store.add("run-1", first, make_result("simple/a", "git_diff", True, 0.01))
+        store.add("run-1", first, make_result("medium/b", "git_diff", False, 0.03))
+        store.add("run-2", second, make_result("simple/a", "git_diff", True, 0.02))
+        store.add("run-2", second, make_result("simple/a", "json_ops", False, 0.04))
+        # Re-adding a test of a run (e.g. when resuming) replaces its row
+        store.add("run-2", second, make_result("simple/a", "json_ops", True, 0.04))
+
+        assert store.run_ids() == ["run-2", "run-1"]
+        assert store.run_ids(last=1) == ["run-2"]
+
+        by_algorithm = store.aggregate(["algorithm"])
+        assert [row.groups for row in by_algorithm] == [("git_diff",), ("json_ops",)]
+        git_diff = by_algorithm[0]
+        assert (git_diff.runs, git_diff.tests, git_diff.passed) == (2, 3, 2)
+        assert git_diff.cost_usd == pytest.approx(0.06)
+        assert git_diff.tokens_in == 300
+        assert by_algorithm[1].pass_rate == 1.0
+
+        by_run = store.aggregate(["run", "category"], category="simple")
+        assert [row.groups for row in by_run] == [("run-1", "simple"), ("run-2", "simple")]
+        only_second = store.aggregate(["model"], run_ids=["run-2"], algorithms=["git_diff"])
+        assert [(row.groups, row.tests) for row in only_second] == [(("prov/model-a",), 1)]
+        store.close()
+
+    def test_adds_new_columns_to_old_stores(self, tmp_path: Path):
+        path = tmp_path / "results.sqlite"
+        store = ResultsStore(path)
+        store.add(
+            "run-1", datetime(2025, 1, 1, 12), make_result("simple/a", "git_diff", True, 0.01)
+        )
+        _ = store.connection.execute("ALTER TABLE results DROP COLUMN tokens_cached")
+        store.close()
+
+        store = ResultsStore(path)
+        result = make_result("simple/b", "git_diff", True, 0.01)
+        result.algorithm_result.usage.tokens_cached = 50
+        store.add("run-1", datetime(2025, 1, 1, 12), result)
+        (row,) = store.aggregate(["algorithm"])
+        assert (row.tests, row.tokens_in, row.tokens_cached) == (2, 200, 50)
+        assert row.cached_rate == 0.25
+        store.close()
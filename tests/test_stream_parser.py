@@ -0,0 +1,86 @@
+"""Tests for incremental (streamed) edit-block parsers."""
+
+import pytest
+from md_edit_bench.algorithms.aider_editblock.aider_editblock import (
+    EditBlockStream,
+    apply_editblocks,
+)
+from md_edit_bench.algorithms.codex_patch.codex_patch import CodexPatchStream, apply_codex_patch
+from md_edit_bench.algorithms.search_replace.search_replace import (
+    SearchReplaceStream,
+    apply_search_replace,
+)
+from md_edit_bench.algorithms.stream_parser import IncrementalParser
+from md_edit_bench.llm import StreamAborted
+
+DOCUMENT = "# Report\n\nSales grew 12%\n\nThe team exceeded expectations.\n\n## Next\n\nbye\n"
+
+SEARCH_REPLACE = (
+    "Here are the edits:\n"
+    "<<<<<<< SEARCH\nSales grew 12%\n=======\nSales grew 15%\n>>>>>>> REPLACE\n\n"
+    "<<<<<<< SEARCH\nbye\n=======\nciao\n>>>>>>> REPLACE"
+)
+
+CODEX_PATCH = (
+    "*** Begin Patch\n*** Update File: document.md\n"
+    "@@ # Report\n \n-Sales grew 12%\n+Sales grew 15%\n"
+    "@@ ## Next\n \n-bye\n+ciao\n"
+    "*** End Patch\n"
+)
+
+
+def _feed(parser: IncrementalParser, text: str, step: int) -> None:
+    parser.reset()
+    for i in range(0, len(text), step):
+        parser.feed(text[i : i + step])
+
+
+class TestIncrementalParsers:
+    @pytest.mark.parametrize("step", [1, 4, 1000])
+    def test_search_replace_matches_full_parse(self, step: int):
+        parser = SearchReplaceStream(DOCUMENT)
+        _feed(parser, SEARCH_REPLACE, step)
+        assert parser.resolve(SEARCH_REPLACE) == apply_search_replace(DOCUMENT, SEARCH_REPLACE)
+        assert len(parser.blocks) == 2
+
+    @pytest.mark.parametrize("step", [1, 4, 1000])
+    def test_editblock_matches_full_parse(self, step: int):
+        parser = EditBlockStream(DOCUMENT)
+        _feed(parser, SEARCH_REPLACE, step)
+        assert parser.resolve(SEARCH_REPLACE) == apply_editblocks(DOCUMENT, SEARCH_REPLACE)
+        assert len(parser.blocks) == 2
+
+    @pytest.mark.parametrize("step", [1, 4, 1000])
+    def test_codex_patch_matches_full_parse(self, step: int):
+        parser = CodexPatchStream(DOCUMENT)
+        _feed(parser, CODEX_PATCH, step)
+        assert parser.resolve(CODEX_PATCH) == apply_codex_patch(DOCUMENT, CODEX_PATCH)
+        assert len(parser.sections) == 2
+
+    def test_blocks_applied_before_stream_ends(self):
+        parser = SearchReplaceStream(DOCUMENT)
+        _feed(parser, SEARCH_REPLACE.split("<<<<<<< SEARCH\nbye", maxsplit=1)[0], 10)
+        assert "Sales grew 15%" in parser.document.text
+
+    def test_unstreamed_response_falls_back_to_full_parse(self):
+        parser = SearchReplaceStream(DOCUMENT)
+        assert parser.resolve(SEARCH_REPLACE) == apply_search_replace(DOCUMENT, SEARCH_REPLACE)
+
+    def test_reset_discards_partial_attempt(self):
+        parser = SearchReplaceStream(DOCUMENT)
+        _feed(parser, SEARCH_REPLACE[:80], 5)
+        _feed(parser, SEARCH_REPLACE, 5)
+        assert parser.resolve(SEARCH_REPLACE) == apply_search_replace(DOCUMENT, SEARCH_REPLACE)
+
+
+class TestStreamAbort:
+    def test_missing_marker_aborts(self):
+        parser = SearchReplaceStream(DOCUMENT)
+        parser.deadline_chars = 50
+        with pytest.raises(StreamAborted, match="no '<<<<<<< SEARCH' marker"):
+            _feed(parser, "I will now rewrite the whole document for you.\n" * 5, 10)
+
+    def test_empty_search_aborts(self):
+        parser = SearchReplaceStream(DOCUMENT)
+        with pytest.raises(StreamAborted, match="empty search text"):
+            _feed(parser, "<<<<<<< SEARCH\n=======\nnew\n>>>>>>> REPLACE\n", 5)
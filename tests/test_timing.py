@@ -0,0 +1,51 @@
+"""Tests for phase timing spans."""
+
+import asyncio
+import time
+
+from md_edit_bench.timing import PhaseTimings, span, track_phases
+
+
+@span("parse")
+def slow_parse() -> str:
+    time.sleep(0.02)
+    return "parsed"
+
+
+class TestSpans:
+    def test_nested_span_time_goes_to_innermost(self):
+        start = time.perf_counter()
+        with track_phases() as phases, span("apply"):
+            assert slow_parse() == "parsed"
+            time.sleep(0.01)
+        wall = time.perf_counter() - start
+
+        assert phases.parse_seconds >= 0.02
+        assert phases.apply_seconds >= 0.01
+        # The parse isn't counted again as part of the enclosing apply span
+        assert phases.total_seconds <= wall
+        assert phases.llm_seconds == 0.0
+
+    def test_noop_outside_tracking(self):
+        with span("apply"):
+            assert slow_parse() == "parsed"
+        with track_phases() as phases:
+            pass
+        assert phases == PhaseTimings()
+
+    def test_cells_tracked_separately_across_tasks(self):
+        async def cell(delay: float) -> PhaseTimings:
+            with track_phases() as phases:
+                with span("llm"):
+                    await asyncio.sleep(delay)
+                with span("score"):
+                    pass
+            return phases
+
+        async def scenario() -> tuple[PhaseTimings, PhaseTimings]:
+            return await asyncio.gather(cell(0.01), cell(0.05))
+
+        fast, slow = asyncio.run(scenario())
+        assert 0.01 <= fast.llm_seconds < 0.05
+        assert slow.llm_seconds >= 0.05
+        assert fast.total_seconds >= fast.llm_seconds